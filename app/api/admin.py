@@ -0,0 +1,124 @@
+"""Admin endpoints for diagnosing the live process (not exposed to MCP)."""
+
+import asyncio
+import datetime as dt
+import threading
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from app.core.config import get_config
+from app.core.profiling import LoopMonitor, ProfileMode, SamplingProfiler
+from app.core.request_stats import RequestLog
+from app.core.setup_logging import logger
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+# Global event loop monitor, started with the app
+loop_monitor = LoopMonitor(
+  interval=get_config().loop_monitor_interval,
+  threshold=get_config().loop_stall_threshold,
+)
+
+# Recent requests, filled by RequestStatsMiddleware
+request_log = RequestLog(history=get_config().request_log_history)
+
+ProfileFormat = Literal["speedscope", "collapsed"]
+
+# Module-level singletons for Query params that use non-str types (avoids B008).
+_DURATION = Query(default=10.0, gt=0, description="Seconds to sample")
+_INTERVAL = Query(
+  default=0.01,
+  ge=0.001,
+  le=1.0,
+  description="Seconds between samples",
+)
+_MODE = Query(
+  default="wall",
+  description="wall (includes waiting) or cpu (time spent executing)",
+)
+_ALL_THREADS = Query(
+  default=False,
+  description="Sample worker threads too, not only the event loop",
+)
+_LIMIT = Query(default=20, ge=1, le=500, description="Requests to return")
+_ROUTE = Query(
+  default=None,
+  description="Only requests to this route template, e.g. /ibkr/tickers",
+)
+_PROFILE_FORMAT = Query(
+  default="speedscope",
+  alias="format",
+  description="speedscope JSON or collapsed stacks for flamegraph.pl",
+)
+
+# One profile at a time; samplers compete with the loop for the GIL
+_profile_lock = asyncio.Lock()
+
+
+@router.get("/profile", operation_id="profile_process")
+async def profile_process(
+  duration: float = _DURATION,
+  interval: float = _INTERVAL,
+  mode: ProfileMode = _MODE,
+  all_threads: bool = _ALL_THREADS,
+  fmt: ProfileFormat = _PROFILE_FORMAT,
+) -> Response:
+  """Run a sampling profile of the live server and return it.
+
+  Stacks of the event loop thread are rooted at the coroutine the loop was
+  running. Open speedscope output at https://www.speedscope.app.
+  """
+  max_duration = get_config().profile_max_duration
+  if duration > max_duration:
+    raise HTTPException(
+      status_code=422,
+      detail=f"duration must be at most {max_duration} seconds",
+    )
+  if _profile_lock.locked():
+    raise HTTPException(status_code=409, detail="A profile is already running")
+
+  async with _profile_lock:
+    logger.info("Profiling for {}s ({} mode)", duration, mode)
+    profiler = SamplingProfiler(
+      asyncio.get_running_loop(),
+      threading.get_ident(),
+      interval,
+      mode,
+      all_threads=all_threads,
+    )
+    profile = await asyncio.to_thread(profiler.run, duration)
+
+  stamp = dt.datetime.now(dt.UTC).strftime("%Y%m%dT%H%M%SZ")
+  if fmt == "collapsed":
+    return PlainTextResponse(profile.to_collapsed())
+  return JSONResponse(
+    profile.to_speedscope(),
+    headers={
+      "Content-Disposition": f'attachment; filename="profile-{stamp}.speedscope.json"',
+    },
+  )
+
+
+@router.get("/event_loop", operation_id="get_event_loop_stats")
+async def get_event_loop_stats() -> dict:
+  """Return event loop lag and the most recent stalls with their stacks."""
+  return loop_monitor.stats(stacks=True)
+
+
+@router.get("/requests", operation_id="get_request_stats")
+async def get_request_stats(
+  limit: int = _LIMIT,
+  route: str | None = _ROUTE,
+) -> dict:
+  """Return the slowest recent requests and latency figures per route.
+
+  Each request lists its total time, time spent on IB round trips and
+  waiting for pacing, IB messages sent, cache hits and bytes returned.
+  """
+  return {
+    "history": len(request_log.requests),
+    "slowest": request_log.slowest(limit, route),
+    "routes": request_log.routes(),
+  }
@@ -2,6 +2,8 @@
 
 from fastapi import APIRouter, HTTPException
 
+from app.api.admin import loop_monitor
+from app.api.ibkr import get_ib_interface
 from app.core.setup_logging import logger
 from app.gateway.gateway_manager import IBKRGatewayManager
 
@@ -13,10 +15,12 @@ gateway_manager = IBKRGatewayManager()
 
 @router.get("/status", operation_id="get_ibkr_gateway_status")
 async def get_gateway_status() -> dict:
-  """Get the current status of the IBKR Gateway.
+  """Get the current status of the IBKR Gateway and the server's event loop.
 
   Returns:
-    dict: A dictionary containing the status of the IBKR Gateway.
+    dict: A dictionary containing the status of the IBKR Gateway, plus
+    event loop lag and recent stalls (stacks are at /admin/event_loop) and
+    the progress of the symbol warmup.
 
   Example:
     >>> get_gateway_status()
@@ -29,18 +33,48 @@ async def get_gateway_status() -> dict:
       "started": "2025-06-29T02:09:51.287050095Z",
       "finished": "0001-01-01T00:00:00Z",
       "age": 82410.913484
+    },
+    "event_loop": {
+      "running": true,
+      "interval_s": 0.5,
+      "threshold_ms": 100.0,
+      "last_lag_ms": 0.4,
+      "max_lag_ms": 306.5,
+      "stalls": [
+        {
+          "at": "2025-06-30T01:03:22.125510+00:00",
+          "task": "[task] RequestResponseCycle.run_asgi",
+          "duration_ms": 306.5
+        }
+      ]
+    },
+    "warmup": {
+      "state": "done",
+      "runs": 1,
+      "started_at": "2025-06-29T02:10:03.512204+00:00",
+      "duration_s": 4.2,
+      "contracts": {"total": 4, "done": 4, "failed": 0},
+      "chains": {"total": 1, "done": 1, "failed": 0},
+      "bar_streams": {"total": 6, "done": 6, "failed": 0},
+      "errors": []
     }
   }
 
   """
   try:
-    return await gateway_manager.get_gateway_status()
+    status = await gateway_manager.get_gateway_status()
   except Exception as err:
     logger.exception("Error getting gateway status.")
     raise HTTPException(
       status_code=500,
       detail="Failed to get gateway status.",
     ) from err
+  else:
+    return {
+      **status,
+      "event_loop": loop_monitor.stats(),
+      "warmup": get_ib_interface().get_warmup_progress(),
+    }
 
 
 @router.get("/logs", operation_id="get_ibkr_gateway_logs")
@@ -1,12 +1,26 @@
 """Endpoints for the IBKR MCP server."""
 
+import functools
+
 from fastapi import APIRouter
+from app.core.config import get_config
 from app.services.interfaces import IBInterface
+from app.services.jobs import JobManager
 
 ibkr_router = APIRouter(prefix="/ibkr", tags=["ibkr"])
 
-# Initialize shared interface
-ib_interface = IBInterface()
+
+@functools.cache
+def get_ib_interface() -> IBInterface:
+  """Get the shared interface; created in the app lifespan, not at import."""
+  return IBInterface()
+
+
+# Background jobs for long-running operations
+job_manager = JobManager(
+  workers=get_config().job_workers,
+  ttl=get_config().job_ttl,
+)
 
 # Import all endpoints
 from .positions import *
@@ -14,3 +28,4 @@ from .contracts import *
 from .scanners import *
 from .market_data import *
 from .history import *
+from .jobs import *
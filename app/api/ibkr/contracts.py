@@ -1,7 +1,10 @@
 """Contract and options-related tools."""
 
+from fastapi import Request, Response
 from loguru import logger
-from app.api.ibkr import ibkr_router, ib_interface
+from app.api.ibkr import ibkr_router, get_ib_interface
+from app.api.negotiation import binary_media_type, records_response
+from app.core.setup_logging import summarize
 from app.models import ContractDetailsRequest, OptionsChainRequest
 
 
@@ -34,7 +37,7 @@ async def get_contract_details(
     options_dict = (
       request.options.model_dump(exclude_none=True) if request.options else {}
     )
-    details = await ib_interface.get_contract_details(
+    details = await get_ib_interface().get_contract_details(
       symbol=request.symbol,
       sec_type=request.sec_type,
       exchange=request.exchange,
@@ -44,17 +47,28 @@ async def get_contract_details(
     logger.error("Error in get_contract_details: {!s}", str(e))
     return "Error getting contract details"
   else:
-    logger.debug("Contract details: {details}", details=details)
+    logger.debug("Contract details: {details}", details=summarize(details))
     return f"The contract details for the symbol are: {details}"
 
 
-@ibkr_router.post("/options_chain", operation_id="get_options_chain")
-async def get_options_chain(request: OptionsChainRequest) -> str:
+@ibkr_router.post(
+  "/options_chain",
+  operation_id="get_options_chain",
+  response_model=str,
+)
+async def get_options_chain(
+  request: OptionsChainRequest,
+  http_request: Request,
+) -> str | Response:
   """Get options chain for a given underlying contract.
 
+  Send Accept: application/vnd.apache.arrow.stream, application/x-parquet or
+  application/x-msgpack for a conId/localSymbol table instead of text.
+
   Args:
     request (OptionsChainRequest): Request containing underlying contract details
       and filters to apply to the options chain.
+    http_request: Incoming request; its Accept header selects the encoding.
 
   Returns:
     str: A formatted string containing the options chain or error message
@@ -81,8 +95,8 @@ async def get_options_chain(request: OptionsChainRequest) -> str:
       "Getting options chain for symbol: {symbol}",
       symbol=request.underlying_symbol,
     )
-    filters_dict = request.filters.model_dump(exclude_none=True)
-    options_chain = await ib_interface.get_options_chain(
+    filters_dict = request.filters.model_dump(exclude_none=True, by_alias=True)
+    options_chain = await get_ib_interface().get_options_chain(
       request.underlying_symbol,
       request.underlying_sec_type,
       request.underlying_con_id,
@@ -92,5 +106,9 @@ async def get_options_chain(request: OptionsChainRequest) -> str:
     logger.error("Error in get_options_chain: {!s}", str(e))
     return "Error getting options chain"
   else:
-    logger.debug("Options chain: {options_chain}", options_chain=options_chain)
+    logger.debug(
+      "Options chain: {options_chain}", options_chain=summarize(options_chain)
+    )
+    if (media_type := binary_media_type(http_request)) is not None:
+      return await records_response(options_chain, media_type)
     return f"The available options contracts are: {options_chain}"
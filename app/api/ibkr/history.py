@@ -1,13 +1,28 @@
 """Current price and historical OHLCV bar endpoints."""
 
 import datetime as dt
+import importlib.util
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Literal
 
-from fastapi import HTTPException, Query
+from fastapi import HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
-from app.api.ibkr import ibkr_router, ib_interface
+from app.api.ibkr import ibkr_router, get_ib_interface
+from app.api.negotiation import binary_media_type, tabular_response
+from app.api.streaming import STREAM_FORMAT_QUERY, StreamFormat, stream_batches
+from app.core.config import get_config
+from app.core.executor import get_executor
 from app.core.setup_logging import logger
-from app.models.history import HistoricalBar, PriceSnapshot
-from app.services.history import FREQ_TO_BAR_SIZE
+from app.models.history import (
+  BulkHistoryRequest,
+  BulkHistoryResult,
+  HistoricalBar,
+  PriceSnapshot,
+)
+from app.services.history import FREQ_TO_BAR_SIZE, REALTIME_FREQ
+from app.services.resample import parse_freq
 
 # Module-level singletons for Query params that use non-str types (avoids B008).
 _FROM_DATE = Query(description="Start date inclusive (YYYY-MM-DD)")
@@ -16,6 +31,14 @@ _TO_DATE = Query(
   description="End date inclusive (YYYY-MM-DD). Defaults to today.",
 )
 
+BarFormat = Literal["records", "columns", "csv"]
+
+_BAR_FORMAT = Query(
+  default="records",
+  alias="format",
+  description="records (list of bars), columns (parallel arrays) or csv",
+)
+
 
 @ibkr_router.get("/price", operation_id="get_price", response_model=PriceSnapshot)
 async def get_price(
@@ -50,7 +73,9 @@ async def get_price(
   """
   try:
     logger.debug("Fetching current price: symbol={} exchange={}", symbol, exchange)
-    return await ib_interface.get_current_price(symbol, sec_type, exchange, currency)
+    return await get_ib_interface().get_current_price(
+      symbol, sec_type, exchange, currency
+    )
   except Exception as e:
     logger.error("Error fetching price for {}: {!s}", symbol, e)
     raise HTTPException(status_code=502, detail=f"IB Gateway error: {e}") from e
@@ -62,6 +87,7 @@ async def get_price(
   response_model=list[HistoricalBar],
 )
 async def get_historical_bars(
+  http_request: Request,
   symbol: str = Query(description="Ticker symbol (e.g. SPX, VIX, AAPL)"),
   sec_type: str = Query(
     default="IND",
@@ -73,31 +99,42 @@ async def get_historical_bars(
   ),
   freq: str = Query(
     default="1d",
-    description=f"Bar frequency. One of: {', '.join(sorted(FREQ_TO_BAR_SIZE))}",
+    description=f"Bar frequency. Native: {', '.join(sorted(FREQ_TO_BAR_SIZE))}; "
+    "custom sizes like 3min, 2h, 2d or session are resampled server-side",
   ),
   from_date: dt.date = _FROM_DATE,
   to_date: dt.date | None = _TO_DATE,
   use_rth: bool = Query(default=True, description="Regular trading hours only"),
   currency: str = Query(default="USD", description="Currency"),
-) -> list[HistoricalBar]:
+  fmt: BarFormat = _BAR_FORMAT,
+) -> list[HistoricalBar] | Response:
   """Fetch OHLCV bars for any IB-supported contract over a date range.
 
   IB imposes per-bar-size limits on how much history can be fetched in one
   request. For intraday frequencies the maximum span is typically 30-60 days;
   for daily bars up to several years.
 
+  For large pulls prefer format=columns ({"count", "timestamp": [...],
+  "open": [...], ...}) or format=csv, which are encoded straight from the
+  bar arrays. Sending Accept: application/vnd.apache.arrow.stream,
+  application/x-parquet or application/x-msgpack returns the same columns
+  as a binary table and takes precedence over format.
+
   Args:
     symbol: Ticker symbol.
     sec_type: Security type.
     exchange: Primary exchange.
-    freq: Bar frequency (1min, 5min, 15min, 30min, 1h, 4h, 1d, 1w, 1M).
+    freq: Bar frequency (1min, 5min, 15min, 30min, 1h, 4h, 1d, 1w, 1M) or a
+      custom size (e.g. 3min, 2h, session) resampled from finer bars.
     from_date: Start date (inclusive).
     to_date: End date (inclusive). Defaults to today.
     use_rth: If True, only include regular-hours bars.
     currency: Currency code.
+    fmt: Response layout — records, columns or csv.
+    http_request: Incoming request; its Accept header selects the encoding.
 
   Returns:
-    List of OHLCV bars ordered oldest-first.
+    OHLCV bars ordered oldest-first in the requested layout.
 
   Example:
     GET /ibkr/historical?symbol=SPX&sec_type=IND&exchange=CBOE&freq=1d
@@ -114,7 +151,7 @@ async def get_historical_bars(
       from_date,
       resolved_to,
     )
-    return await ib_interface.get_historical_bars(
+    bars = await get_ib_interface().get_historical_bars(
       symbol,
       sec_type,
       exchange,
@@ -129,3 +166,163 @@ async def get_historical_bars(
   except Exception as e:
     logger.error("Error fetching historical for {}: {!s}", symbol, e)
     raise HTTPException(status_code=502, detail=f"IB Gateway error: {e}") from e
+
+  if (media_type := binary_media_type(http_request)) is not None:
+    return await tabular_response(bars.to_frame(), media_type)
+  executor = get_executor()
+  if fmt == "csv":
+    content = await executor.run(bars.to_csv, items=len(bars), process_safe=True)
+    return Response(content=content, media_type="text/csv")
+  if fmt == "columns":
+    content = await executor.run(
+      bars.to_columns_json,
+      items=len(bars),
+      process_safe=True,
+    )
+    return Response(content=content, media_type="application/json")
+  # Small responses go through the response model; large ones are encoded
+  # directly to avoid building and re-validating one model per bar.
+  if len(bars) <= get_config().bar_model_limit:
+    return bars.to_models()
+  content = await executor.run(bars.to_records_json, items=len(bars), process_safe=True)
+  return Response(content=content, media_type="application/json")
+
+
+@ibkr_router.get(
+  "/historical/stream",
+  operation_id="stream_live_bars",
+  tags=["streaming"],
+  response_class=StreamingResponse,
+)
+async def stream_live_bars(
+  symbol: str = Query(description="Ticker symbol (e.g. SPX, VIX, AAPL)"),
+  sec_type: str = Query(
+    default="IND",
+    description="Security type: IND, STK, ETF, FUT, CASH",
+  ),
+  exchange: str = Query(
+    default="CBOE",
+    description="Primary exchange (CBOE, NASDAQ, NYSE, …)",
+  ),
+  freq: str = Query(
+    default="1min",
+    description=f"Bar frequency. {REALTIME_FREQ} uses IB real-time bars, "
+    f"otherwise one of: {', '.join(sorted(FREQ_TO_BAR_SIZE))}",
+  ),
+  use_rth: bool = Query(default=True, description="Regular trading hours only"),
+  currency: str = Query(default="USD", description="Currency"),
+  lookback_days: int = Query(
+    default=1,
+    ge=1,
+    le=30,
+    description="History loaded when the subscription starts",
+  ),
+  fmt: StreamFormat = STREAM_FORMAT_QUERY,
+) -> StreamingResponse:
+  """Stream live OHLCV bars for a contract (use format=sse for EventSource).
+
+  The first {"type": "bars"} record holds the current window of bars; each
+  later record holds the bar being formed (and the bar it just completed).
+  Listeners of the same contract/freq share one IB subscription, and while
+  it is open /ibkr/historical serves that window without an IB request.
+
+  Example:
+    GET /ibkr/historical/stream?symbol=SPX&sec_type=IND&exchange=CBOE
+    &freq=1min&format=sse
+
+  """
+  if freq != REALTIME_FREQ and freq not in FREQ_TO_BAR_SIZE:
+    raise HTTPException(status_code=422, detail=f"Unsupported frequency '{freq}'")
+  logger.debug(
+    "Streaming live bars: symbol={} exchange={} freq={}", symbol, exchange, freq
+  )
+  return stream_batches(
+    get_ib_interface().iter_live_bars(
+      symbol,
+      sec_type,
+      exchange,
+      freq,
+      use_rth,
+      currency,
+      lookback_days,
+    ),
+    "bars",
+    fmt,
+  )
+
+
+@ibkr_router.post(
+  "/historical/bulk",
+  operation_id="bulk_historical_bars",
+  tags=["streaming"],
+  response_class=StreamingResponse,
+)
+async def bulk_historical_bars(
+  request: BulkHistoryRequest,
+  fmt: StreamFormat = STREAM_FORMAT_QUERY,
+) -> StreamingResponse:
+  """Download bars for many symbols in one call, streaming per-symbol results.
+
+  Contracts are qualified in batches and fetched concurrently under the IB
+  pacing limits. Each {"type": "result"} record carries one symbol's bars
+  (or, with save=true, the path they were written to under
+  IBKR_HISTORY_OUTPUT_DIR) plus completed/total progress; a final summary
+  record follows.
+
+  Example (using curl):
+    curl -N -X 'POST'
+      'http://127.0.0.1:8000/ibkr/historical/bulk'
+      -H 'Content-Type: application/json'
+      -d '{
+        "symbols": ["AAPL", "MSFT", "NVDA"],
+        "freq": "1d",
+        "from_date": "2024-01-01",
+        "save": true
+      }'
+
+  """
+  return stream_batches(bulk_history_batches(request), "result", fmt)
+
+
+def bulk_history_batches(
+  request: BulkHistoryRequest,
+) -> AsyncIterator[list[BulkHistoryResult]]:
+  """Validate a bulk history request and return its result batches.
+
+  Raises:
+    HTTPException: 422 for an unsupported freq, or parquet without pyarrow.
+
+  """
+  try:
+    parse_freq(request.freq)
+  except ValueError as e:
+    raise HTTPException(status_code=422, detail=str(e)) from e
+  if (
+    request.save
+    and request.file_format == "parquet"
+    and importlib.util.find_spec("pyarrow") is None
+  ):
+    raise HTTPException(
+      status_code=422,
+      detail="file_format=parquet needs pyarrow (install ibkr-mcp-server[binary])",
+    )
+  to_date = request.to_date or dt.datetime.now(dt.UTC).date()
+  logger.debug(
+    "Bulk historical: {} symbols freq={} {}-{}",
+    len(request.symbols),
+    request.freq,
+    request.from_date,
+    to_date,
+  )
+  return get_ib_interface().iter_bulk_historical_bars(
+    request.symbols,
+    request.sec_type,
+    request.exchange,
+    request.freq,
+    request.from_date,
+    to_date,
+    request.use_rth,
+    request.currency,
+    Path(get_config().history_output_dir) if request.save else None,
+    request.file_format,
+  )
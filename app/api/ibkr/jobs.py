@@ -0,0 +1,218 @@
+"""Background job tools for long-running operations."""
+
+from collections.abc import AsyncIterator
+
+from fastapi import HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.api.ibkr import ibkr_router, get_ib_interface, job_manager
+from app.api.ibkr.history import bulk_history_batches
+from app.api.streaming import STREAM_FORMAT_QUERY, StreamFormat, stream_batches
+from app.core.setup_logging import logger
+from app.models import (
+  BulkHistoryRequest,
+  JobInfo,
+  JobResults,
+  JobSubmitRequest,
+  OptionsChainRequest,
+  OptionsRequest,
+  ScannerRequest,
+)
+from app.services.jobs import Job, JobFactory
+
+
+async def _snapshot_batches(request: OptionsChainRequest) -> AsyncIterator[list]:
+  """Yield the options chain snapshot as a single result."""
+  yield [
+    await get_ib_interface().get_options_chain_snapshot(
+      request.underlying_symbol,
+      request.underlying_sec_type,
+      request.underlying_con_id,
+      request.filters.model_dump(exclude_none=True, by_alias=True),
+    ),
+  ]
+
+
+async def _scanner_batches(request: ScannerRequest) -> AsyncIterator[list]:
+  """Yield scanner results as {"symbol"} items."""
+  symbols = await get_ib_interface().get_scanner_results(request)
+  yield [{"symbol": symbol} for symbol in symbols]
+
+
+def _job_factory(submit: JobSubmitRequest) -> tuple[dict, JobFactory]:
+  """Validate job params for their kind.
+
+  Returns:
+    The normalized params (used for deduplication) and the result factory.
+
+  """
+  if submit.kind == "filtered_options":
+    options = OptionsRequest.model_validate(submit.params)
+    filters = options.filters.model_dump(exclude_none=True, by_alias=True)
+    criteria = (
+      options.criteria.model_dump(exclude_none=True) if options.criteria else None
+    )
+    return options.model_dump(mode="json", by_alias=True), (
+      lambda: get_ib_interface().iter_filtered_options(
+        options.underlying_symbol,
+        options.underlying_sec_type,
+        options.underlying_con_id,
+        filters,
+        criteria,
+      )
+    )
+  if submit.kind == "options_chain_snapshot":
+    chain = OptionsChainRequest.model_validate(submit.params)
+    return chain.model_dump(mode="json", by_alias=True), (
+      lambda: _snapshot_batches(chain)
+    )
+  if submit.kind == "historical_bulk":
+    bulk = BulkHistoryRequest.model_validate(submit.params)
+    batches = bulk_history_batches(bulk)
+    return bulk.model_dump(mode="json"), lambda: batches
+  scanner = ScannerRequest.model_validate(submit.params)
+  return scanner.model_dump(mode="json"), lambda: _scanner_batches(scanner)
+
+
+def _job_info(job: Job, **extra: object) -> dict:
+  """Return the JobInfo fields of a job."""
+  return {
+    "id": job.id,
+    "kind": job.kind,
+    "status": job.status,
+    "priority": job.priority,
+    "created_at": job.created_at,
+    "started_at": job.started_at,
+    "finished_at": job.finished_at,
+    "result_count": len(job.results),
+    "batches": job.batches,
+    "error": job.error,
+    **extra,
+  }
+
+
+def _get_job(job_id: str) -> Job:
+  job = job_manager.get(job_id)
+  if job is None:
+    raise HTTPException(status_code=404, detail=f"Unknown or expired job {job_id}")
+  return job
+
+
+@ibkr_router.post(
+  "/jobs",
+  operation_id="submit_job",
+  response_model=JobInfo,
+  status_code=202,
+)
+async def submit_job(request: JobSubmitRequest) -> JobInfo:
+  """Run a long operation in the background and return its job ID at once.
+
+  Poll get_job with the ID (passing next_offset back as offset) to collect
+  partial results as they arrive. Submitting the same kind and params while
+  an identical job is still queued or running returns that job.
+
+  Args:
+    request (JobSubmitRequest): kind, params (the body of the matching
+      endpoint) and priority (higher runs first).
+      - filtered_options: OptionsRequest, see filtered_options_tickers.
+      - options_chain_snapshot: OptionsChainRequest.
+      - historical_bulk: BulkHistoryRequest.
+      - scanner: ScannerRequest (instrument_code, location_code, scan_code,
+        filters as [{"parameter", "value"}], max_results).
+
+  Returns:
+    JobInfo: The job's ID and status.
+
+  Example (using curl):
+    curl -X 'POST'
+      'http://127.0.0.1:8000/ibkr/jobs'
+      -H 'Content-Type: application/json'
+      -d '{
+        "kind": "historical_bulk",
+        "params": {"symbols": ["AAPL", "MSFT"], "freq": "1h",
+                   "from_date": "2024-01-01"},
+        "priority": 1
+      }'
+
+  """
+  try:
+    params, factory = _job_factory(request)
+  except ValidationError as e:
+    raise HTTPException(status_code=422, detail=str(e)) from e
+  job, created = await job_manager.submit(
+    request.kind,
+    params,
+    factory,
+    request.priority,
+  )
+  logger.debug("Job {} kind={} created={}", job.id, job.kind, created)
+  return JobInfo(**_job_info(job, deduplicated=not created))
+
+
+@ibkr_router.get("/jobs", operation_id="list_jobs", response_model=list[JobInfo])
+async def list_jobs() -> list[JobInfo]:
+  """List queued, running and recently finished jobs, newest first."""
+  return [JobInfo(**_job_info(job)) for job in job_manager.jobs()]
+
+
+@ibkr_router.get("/jobs/{job_id}", operation_id="get_job", response_model=JobResults)
+async def get_job(
+  job_id: str,
+  offset: int = Query(default=0, ge=0, description="First result to return"),
+  limit: int = Query(default=1000, ge=1, le=10000, description="Max results"),
+) -> JobResults:
+  """Get a job's status and a page of its results, which may still be growing.
+
+  Args:
+    job_id: ID returned by submit_job.
+    offset: Index of the first result to return (use next_offset from the
+      previous call to fetch only new results).
+    limit: Maximum number of results to return.
+
+  Returns:
+    JobResults: Status plus results[offset:offset + limit] and next_offset.
+
+  """
+  job = _get_job(job_id)
+  results = job.results[offset : offset + limit]
+  return JobResults(
+    **_job_info(job),
+    offset=offset,
+    next_offset=offset + len(results),
+    results=results,
+  )
+
+
+@ibkr_router.get(
+  "/jobs/{job_id}/stream",
+  operation_id="stream_job",
+  tags=["streaming"],
+  response_class=StreamingResponse,
+)
+async def stream_job(
+  job_id: str,
+  fmt: StreamFormat = STREAM_FORMAT_QUERY,
+) -> StreamingResponse:
+  """Stream a job's results so far, then each new batch until it finishes.
+
+  The summary record carries an "error" field if the job failed or was
+  cancelled.
+  """
+  return stream_batches(job_manager.iter_results(_get_job(job_id)), "result", fmt)
+
+
+@ibkr_router.delete("/jobs/{job_id}", operation_id="cancel_job", response_model=JobInfo)
+async def cancel_job(job_id: str) -> JobInfo:
+  """Cancel a queued or running job; results produced so far are kept.
+
+  Args:
+    job_id: ID returned by submit_job.
+
+  Returns:
+    JobInfo: The job's status after cancellation.
+
+  """
+  _get_job(job_id)
+  job = await job_manager.cancel(job_id)
+  return JobInfo(**_job_info(job))
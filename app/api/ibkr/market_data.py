@@ -1,8 +1,32 @@
 """Contract and options-related tools."""
 
-from app.api.ibkr import ibkr_router, ib_interface
-from app.core.setup_logging import logger
-from app.models import TickerData, OptionsRequest
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.api.ibkr import ibkr_router, get_ib_interface
+from app.api.negotiation import (
+  binary_media_type,
+  json_response,
+  records_response,
+  tabular_response,
+)
+from app.api.streaming import STREAM_FORMAT_QUERY, StreamFormat, stream_batches
+from app.core.lazy import lazy_import
+from app.core.setup_logging import logger, summarize
+from app.models import (
+  ComboQuote,
+  ComboRequest,
+  OptionsChainRequest,
+  OptionsChainSnapshot,
+  OptionsRequest,
+  TickerData,
+)
+
+if TYPE_CHECKING:
+  import pandas as pd
+else:
+  pd = lazy_import("pandas")
 
 
 @ibkr_router.get(
@@ -11,15 +35,20 @@ from app.models import TickerData, OptionsRequest
   response_model=list[TickerData],
 )
 async def get_tickers(
+  http_request: Request,
   contract_ids: str | None = None,
-) -> list[TickerData]:
+) -> list[TickerData] | Response:
   """Get tickers for a list of contract IDs.
 
   This function queries the IB TWS to get the tickers for a list of contract IDs.
   It will return the last price and symbol, and greeks (if applicable).
+  Send Accept: application/vnd.apache.arrow.stream, application/x-parquet or
+  application/x-msgpack for a columnar binary response with greeks flattened
+  into columns.
 
   Args:
     contract_ids (str): Comma-separated list of contract IDs to get tickers for.
+    http_request: Incoming request; its Accept header selects the encoding.
 
   Returns:
     List[dict]: A list of ticker dictionaries for the contract IDs.
@@ -45,21 +74,30 @@ async def get_tickers(
   """
   if not contract_ids:
     logger.warning("get_tickers called with no contract_ids")
-    return []
+    tickers = []
+  else:
+    tickers = await _get_tickers(contract_ids)
+  if (media_type := binary_media_type(http_request)) is not None:
+    return await records_response(tickers, media_type, flatten=("greeks",))
+  return await json_response(tickers)
+
+
+async def _get_tickers(contract_ids: str) -> list[TickerData]:
+  """Fetch tickers for comma-separated contract IDs ([] on error)."""
   try:
     contract_ids_list = [
       int(cid.strip()) for cid in contract_ids.split(",") if cid.strip()
     ]
     logger.debug(
       "Getting tickers for contract IDs: {contract_ids_list}",
-      contract_ids_list=contract_ids_list,
+      contract_ids_list=summarize(contract_ids_list),
     )
-    tickers = await ib_interface.get_tickers(contract_ids_list)
+    tickers = await get_ib_interface().get_tickers(contract_ids_list)
   except Exception as e:
     logger.error("Error in get_tickers: {!s}", str(e))
     return []
   else:
-    logger.debug("Tickers: {tickers}", tickers=tickers)
+    logger.debug("Tickers: {tickers}", tickers=summarize(tickers))
     return tickers
 
 
@@ -70,7 +108,8 @@ async def get_tickers(
 )
 async def get_and_filter_options_tickers(
   request: OptionsRequest,
-) -> list[TickerData]:
+  http_request: Request,
+) -> list[TickerData] | Response:
   """Get and filter option chain tickers based on market data criteria.
 
   This endpoint retrieves an option chain and filters it based on both
@@ -81,15 +120,22 @@ async def get_and_filter_options_tickers(
     request (OptionsRequest): A request body containing the underlying
       contract details, filters, and optional market data criteria.
       you must specify at least one filter to reduce the number of options in the chain,
-      you must specify expirations, you can specify tradingClass, strikes, and rights.
+      you must specify expirations or min_dte/max_dte, you can specify
+      tradingClass, strikes, rights and moneyness filters.
       - tradingClass: List of trading classes to filter by.
       - expirations: List of expirations to filter by.
       - strikes: List of strikes to filter by.
       - rights: List of rights to filter by.
+      - min_dte/max_dte: Days-to-expiration range instead of expirations.
+      - strike_range_pct: Strike band around spot (0.1 for ±10%).
+      - nearest_strikes: Keep the N strikes closest to spot.
+      - max_contracts: Cap on contracts, nearest to the money first.
+    http_request: Incoming request; its Accept header selects the encoding.
 
   Returns:
     list[TickerData]: A list of filtered ticker data for options that
-    match all specified conditions.
+    match all specified conditions. Arrow IPC, Parquet or MessagePack
+    columns instead when requested via the Accept header.
 
   Example (using curl):
     curl -X 'POST'
@@ -114,16 +160,16 @@ async def get_and_filter_options_tickers(
   try:
     logger.debug(
       "Received options tickers request: {request}",
-      request=request.model_dump_json(indent=2),
+      request=request,
     )
 
     # `exclude_none=True` ensures we don't pass keys with null values.
-    filters_dict = request.filters.model_dump(exclude_none=True)
+    filters_dict = request.filters.model_dump(exclude_none=True, by_alias=True)
     criteria_dict = (
       request.criteria.model_dump(exclude_none=True) if request.criteria else None
     )
 
-    filtered_options = await ib_interface.get_and_filter_options(
+    filtered_options = await get_ib_interface().get_and_filter_options(
       request.underlying_symbol,
       request.underlying_sec_type,
       request.underlying_con_id,
@@ -132,10 +178,200 @@ async def get_and_filter_options_tickers(
     )
   except Exception as e:
     logger.error("Error in filter_options_tickers: {!s}", str(e))
-    return []
+    filtered_options = []
   else:
     logger.debug(
       "Filtered options tickers: {filtered_options}",
-      filtered_options=filtered_options,
+      filtered_options=summarize(filtered_options),
+    )
+  if (media_type := binary_media_type(http_request)) is not None:
+    return await records_response(
+      filtered_options,
+      media_type,
+      flatten=("greeks",),
+    )
+  return await json_response(filtered_options)
+
+
+@ibkr_router.get(
+  "/tickers/stream",
+  operation_id="stream_tickers",
+  tags=["streaming"],
+  response_class=StreamingResponse,
+)
+async def stream_tickers(
+  contract_ids: str = Query(description="Comma-separated list of contract IDs"),
+  fmt: StreamFormat = STREAM_FORMAT_QUERY,
+) -> StreamingResponse:
+  """Stream tickers for a list of contract IDs as they arrive.
+
+  Emits one {"type": "tickers", "data": [...]} record per completed batch,
+  followed by a {"type": "summary", ...} record with the total count.
+
+  Example:
+    GET /ibkr/tickers/stream?contract_ids=123456,789012&format=ndjson
+
+  """
+  try:
+    contract_ids_list = [
+      int(cid.strip()) for cid in contract_ids.split(",") if cid.strip()
+    ]
+  except ValueError as e:
+    raise HTTPException(status_code=422, detail="Invalid contract_ids") from e
+  logger.debug("Streaming tickers for {} contract IDs", len(contract_ids_list))
+  return stream_batches(
+    get_ib_interface().iter_tickers(contract_ids_list),
+    "tickers",
+    fmt,
+  )
+
+
+@ibkr_router.post(
+  "/filtered_options_tickers/stream",
+  operation_id="stream_filtered_options_tickers",
+  tags=["streaming"],
+  response_class=StreamingResponse,
+)
+async def stream_filtered_options_tickers(
+  request: OptionsRequest,
+  fmt: StreamFormat = STREAM_FORMAT_QUERY,
+) -> StreamingResponse:
+  """Stream option tickers matching filters and criteria as they are priced.
+
+  Takes the same body as /ibkr/filtered_options_tickers. Emits one
+  {"type": "tickers", "data": [...]} record per batch with at least one
+  match, followed by a {"type": "summary", ...} record.
+
+  """
+  logger.debug(
+    "Streaming filtered options tickers for symbol: {symbol}",
+    symbol=request.underlying_symbol,
+  )
+  filters_dict = request.filters.model_dump(exclude_none=True, by_alias=True)
+  criteria_dict = (
+    request.criteria.model_dump(exclude_none=True) if request.criteria else None
+  )
+  return stream_batches(
+    get_ib_interface().iter_filtered_options(
+      request.underlying_symbol,
+      request.underlying_sec_type,
+      request.underlying_con_id,
+      filters_dict,
+      criteria_dict,
+    ),
+    "tickers",
+    fmt,
+  )
+
+
+@ibkr_router.post(
+  "/options_chain_snapshot",
+  operation_id="get_options_chain_snapshot",
+  response_model=OptionsChainSnapshot,
+)
+async def get_options_chain_snapshot(
+  request: OptionsChainRequest,
+  http_request: Request,
+) -> OptionsChainSnapshot | Response:
+  """Get a priced options chain (quotes, greeks, IV) in a single call.
+
+  Returns one entry per contract as parallel arrays (columnar), sorted by
+  expiration, strike and right, so a volatility surface can be built
+  without separate options_chain and tickers calls. Results are cached for
+  a few seconds per underlying and filter set.
+
+  Args:
+    request (OptionsChainRequest): Underlying contract details and filters,
+      see filtered_options_tickers for the available filters.
+    http_request: Incoming request; its Accept header selects the encoding.
+
+  Returns:
+    OptionsChainSnapshot: Columnar arrays (contractId, expiration, strike,
+    right, bid, ask, last, delta, gamma, vega, theta, impliedVol). With
+    Accept: application/vnd.apache.arrow.stream, application/x-parquet or
+    application/x-msgpack the arrays are returned as a binary table and the
+    scalar fields as metadata.
+
+  Example (using curl):
+    curl -X 'POST'
+      'http://127.0.0.1:8000/ibkr/options_chain_snapshot'
+      -H 'Content-Type: application/json'
+      -d '{
+        "underlying_symbol": "SPX",
+        "underlying_sec_type": "IND",
+        "underlying_con_id": 416904,
+        "filters": {
+          "tradingClass": ["SPXW"],
+          "min_dte": 7,
+          "max_dte": 45,
+          "strike_range_pct": 0.1
+        }
+      }'
+
+  """
+  try:
+    logger.debug(
+      "Getting options chain snapshot for symbol: {symbol}",
+      symbol=request.underlying_symbol,
+    )
+    filters_dict = request.filters.model_dump(exclude_none=True, by_alias=True)
+    snapshot = await get_ib_interface().get_options_chain_snapshot(
+      request.underlying_symbol,
+      request.underlying_sec_type,
+      request.underlying_con_id,
+      filters_dict,
+    )
+  except Exception as e:
+    logger.error("Error in get_options_chain_snapshot: {!s}", str(e))
+    raise HTTPException(status_code=502, detail=f"IB Gateway error: {e}") from e
+  if (media_type := binary_media_type(http_request)) is not None:
+    fields = snapshot.model_dump()
+    columns = {k: v for k, v in fields.items() if isinstance(v, list)}
+    metadata = {k: v for k, v in fields.items() if k not in columns}
+    return await tabular_response(pd.DataFrame(columns), media_type, metadata)
+  return snapshot
+
+
+@ibkr_router.post(
+  "/combo_quote", operation_id="get_combo_quote", response_model=ComboQuote
+)
+async def get_combo_quote(request: ComboRequest) -> ComboQuote:
+  """Price a combo (spread) and its net greeks from its legs in one call.
+
+  Legs are qualified once (cached by contract ID) and priced concurrently.
+  Net bid and ask are what selling and buying one unit of the combo would
+  get at the legs' quotes; greeks are weighted by ratio, positive for BUY
+  and negative for SELL legs. With native_quote IB's own BAG quote is added;
+  that subscription stays open, so repeat calls for the same combo are
+  cheap.
+
+  Args:
+    request (ComboRequest): legs as [{"contract_id", "action", "ratio"}],
+      exchange and native_quote.
+
+  Returns:
+    ComboQuote: Per-leg quotes, net bid/ask/mid, net greeks and, if
+    requested, the native BAG quote.
+
+  Example (using curl):
+    curl -X 'POST'
+      'http://127.0.0.1:8000/ibkr/combo_quote'
+      -H 'Content-Type: application/json'
+      -d '{
+        "legs": [
+          {"contract_id": 700000001, "action": "BUY", "ratio": 1},
+          {"contract_id": 700000002, "action": "SELL", "ratio": 2}
+        ],
+        "native_quote": true
+      }'
+
+  """
+  try:
+    return await get_ib_interface().get_combo_quote(
+      [(leg.contract_id, leg.action, leg.ratio) for leg in request.legs],
+      request.exchange,
+      native_quote=request.native_quote,
     )
-    return filtered_options
+  except Exception as e:
+    logger.error("Error in get_combo_quote: {!s}", str(e))
+    raise HTTPException(status_code=502, detail=f"IB Gateway error: {e}") from e
@@ -1,14 +1,28 @@
 """Position-related tools."""
 
-from fastapi import HTTPException
-from app.api.ibkr import ibkr_router, ib_interface
-from app.core.setup_logging import logger
+from fastapi import HTTPException, Query, Request, Response
+from app.api.ibkr import ibkr_router, get_ib_interface
+from app.api.negotiation import binary_media_type, records_response
+from app.core.setup_logging import logger, summarize
+from app.models import (
+  AccountPnL,
+  AccountSummaryValue,
+  PortfolioPosition,
+  PortfolioRisk,
+)
 
 
-@ibkr_router.get("/positions", operation_id="get_positions")
-async def get_positions() -> list[dict]:
+@ibkr_router.get(
+  "/positions",
+  operation_id="get_positions",
+  response_model=list[dict],
+)
+async def get_positions(http_request: Request) -> list[dict] | Response:
   """Get positions for all accounts.
 
+  Send Accept: application/vnd.apache.arrow.stream, application/x-parquet or
+  application/x-msgpack for a columnar binary response instead of JSON.
+
   Returns:
     list[dict]: A list of dictionaries containing the positions for the accounts.
 
@@ -19,10 +33,134 @@ async def get_positions() -> list[dict]:
   """
   try:
     logger.debug("Getting positions")
-    positions = await ib_interface.get_positions()
+    positions = await get_ib_interface().get_positions()
   except Exception as e:
     logger.error("Error in get_positions: {!s}", str(e))
     raise HTTPException(status_code=500, detail="Failed to retrieve positions") from e
   else:
-    logger.debug("Positions: {positions}", positions=positions)
+    logger.debug("Positions: {positions}", positions=summarize(positions))
+    if (media_type := binary_media_type(http_request)) is not None:
+      return await records_response(positions, media_type)
     return positions
+
+
+@ibkr_router.get(
+  "/portfolio",
+  operation_id="get_portfolio",
+  response_model=list[PortfolioPosition],
+)
+async def get_portfolio(http_request: Request) -> list[PortfolioPosition] | Response:
+  """Get positions with market price, market value and PnL.
+
+  Served from an in-memory mirror kept current by IB portfolio and PnL
+  updates, so repeated calls do not query IB. Accepts the same binary
+  formats as get_positions.
+
+  Returns:
+    list[PortfolioPosition]: One entry per open position.
+
+  Example:
+    >>> get_portfolio()
+    [{"contractId":265598,"symbol":"AAPL","secType":"STK","position":100,
+      "marketPrice":190.1,"marketValue":19010.0,"averageCost":150.25,
+      "unrealizedPnL":3985.0,"realizedPnL":0.0,"dailyPnL":120.0}]
+
+  """
+  try:
+    portfolio = await get_ib_interface().get_portfolio()
+  except Exception as e:
+    logger.error("Error in get_portfolio: {!s}", str(e))
+    raise HTTPException(status_code=500, detail="Failed to retrieve portfolio") from e
+  if (media_type := binary_media_type(http_request)) is not None:
+    return await records_response(portfolio, media_type)
+  return portfolio
+
+
+@ibkr_router.get("/pnl", operation_id="get_pnl", response_model=list[AccountPnL])
+async def get_pnl() -> list[AccountPnL]:
+  """Get daily, unrealized and realized PnL for each account.
+
+  Returns:
+    list[AccountPnL]: One entry per account; values are null until IB sends
+      the first update.
+
+  """
+  try:
+    return await get_ib_interface().get_pnl()
+  except Exception as e:
+    logger.error("Error in get_pnl: {!s}", str(e))
+    raise HTTPException(status_code=500, detail="Failed to retrieve PnL") from e
+
+
+@ibkr_router.get(
+  "/account_summary",
+  operation_id="get_account_summary",
+  response_model=list[AccountSummaryValue],
+)
+async def get_account_summary() -> list[AccountSummaryValue]:
+  """Get account summary values such as NetLiquidation and BuyingPower.
+
+  Returns:
+    list[AccountSummaryValue]: tag, value and currency for each summary item.
+
+  """
+  try:
+    return await get_ib_interface().get_account_summary()
+  except Exception as e:
+    logger.error("Error in get_account_summary: {!s}", str(e))
+    raise HTTPException(
+      status_code=500,
+      detail="Failed to retrieve account summary",
+    ) from e
+
+
+_SPOT_SHOCKS = Query(
+  default=None,
+  description="Relative spot moves (default -10%,-5%,-2%,0,2%,5%,10%)",
+)
+_VOL_SHOCKS = Query(
+  default=None,
+  description="Absolute implied volatility moves (default -0.05,0,0.05)",
+)
+
+
+@ibkr_router.get(
+  "/portfolio_risk",
+  operation_id="get_portfolio_risk",
+  response_model=PortfolioRisk,
+)
+async def get_portfolio_risk(
+  spot_shocks: list[float] | None = _SPOT_SHOCKS,
+  vol_shocks: list[float] | None = _VOL_SHOCKS,
+) -> PortfolioRisk:
+  """Get net delta, gamma, vega, theta and scenario PnL of the portfolio.
+
+  Positions are joined with streaming greeks and summed per underlying
+  symbol (options, stock and futures on the same symbol are netted) and in
+  total. The first call subscribes to market data for every held contract;
+  later calls reuse the live subscriptions and are answered locally.
+
+  Args:
+    spot_shocks: Relative spot moves for the scenario rows, e.g. 0.05 = +5%.
+    vol_shocks: Implied volatility moves for the scenario columns,
+      e.g. 0.05 = +5 vol points.
+
+  Returns:
+    PortfolioRisk: per-underlying and total exposure. scenarioPnL[i][j] is
+    the estimated PnL for spotShocks[i] and volShocks[j]. Contracts without
+    greeks or a price are listed in missing.
+
+  Example:
+    >>> get_portfolio_risk(spot_shocks=[-0.05, 0.05], vol_shocks=[0])
+    {"total": {"dollarDelta": 25000.0, "vega": 1200.0, ...,
+               "scenarioPnL": [[-1310.0], [1190.0]]}, ...}
+
+  """
+  try:
+    return await get_ib_interface().get_portfolio_risk(spot_shocks, vol_shocks)
+  except Exception as e:
+    logger.error("Error in get_portfolio_risk: {!s}", str(e))
+    raise HTTPException(
+      status_code=500,
+      detail="Failed to compute portfolio risk",
+    ) from e
@@ -1,8 +1,8 @@
 """Scanner-related tools."""
 
 from fastapi import Query
-from app.api.ibkr import ibkr_router, ib_interface
-from app.core.setup_logging import logger
+from app.api.ibkr import ibkr_router, get_ib_interface
+from app.core.setup_logging import logger, summarize
 from app.models import ScannerRequest
 from pydantic import ValidationError
 
@@ -128,7 +128,7 @@ async def get_scanner_instrument_codes() -> dict:
   """
   try:
     logger.debug("Getting scanner instrument codes")
-    tags = await ib_interface.get_scanner_instrument_codes()
+    tags = await get_ib_interface().get_scanner_instrument_codes()
 
     # Create detailed response with descriptions
     descriptions = {
@@ -145,7 +145,7 @@ async def get_scanner_instrument_codes() -> dict:
     logger.error("Error in get_scanner_instrument_codes: {!s}", str(e))
     return {"error": "Error getting scanner instrument codes"}
   else:
-    logger.debug("Scanner instrument codes: {tags}", tags=tags)
+    logger.debug("Scanner instrument codes: {tags}", tags=summarize(tags))
     return {
       "instrument_codes": tags,
       "count": len(tags),
@@ -178,7 +178,7 @@ async def get_scanner_location_codes() -> dict:
   """
   try:
     logger.debug("Getting scanner location codes")
-    tags = await ib_interface.get_scanner_location_codes()
+    tags = await get_ib_interface().get_scanner_location_codes()
     descriptions = {
       "STK.US": "US stocks and ETFs",
       "STK.EU": "European stocks",
@@ -187,7 +187,7 @@ async def get_scanner_location_codes() -> dict:
     logger.error("Error in get_scanner_location_codes: {!s}", str(e))
     return {"error": "Error getting scanner location codes"}
   else:
-    logger.debug("Scanner location codes: {tags}", tags=tags)
+    logger.debug("Scanner location codes: {tags}", tags=summarize(tags))
     return {
       "location_codes": tags,
       "count": len(tags),
@@ -220,7 +220,7 @@ async def get_scanner_scan_codes() -> dict:
   """
   try:
     logger.debug("Getting scanner scan codes")
-    tags = await ib_interface.get_scanner_scan_codes()
+    tags = await get_ib_interface().get_scanner_scan_codes()
 
     # Create detailed response with descriptions
     descriptions = {
@@ -234,7 +234,7 @@ async def get_scanner_scan_codes() -> dict:
     logger.error("Error in get_scanner_scan_codes: {!s}", str(e))
     return {"error": "Error getting scanner scan codes"}
   else:
-    logger.debug("Scanner scan codes: {tags}", tags=tags)
+    logger.debug("Scanner scan codes: {tags}", tags=summarize(tags))
     return {
       "scan_codes": tags,
       "descriptions": descriptions,
@@ -272,13 +272,13 @@ async def get_scanner_filter_codes() -> dict:
   """
   try:
     logger.debug("Getting scanner filter codes")
-    tags = await ib_interface.get_scanner_filter_codes()
+    tags = await get_ib_interface().get_scanner_filter_codes()
 
   except Exception as e:
     logger.error("Error in get_scanner_filter_codes: {!s}", str(e))
     return {"error": "Error getting scanner filter codes"}
   else:
-    logger.debug("Scanner filter codes: {tags}", tags=tags)
+    logger.debug("Scanner filter codes: {tags}", tags=summarize(tags))
     return {
       "filter_codes": tags,
       "count": len(tags),
@@ -371,20 +371,16 @@ async def get_scanner_results(
     except ValueError as e:
       return f"Error: {str(e)!r}"
 
-    logger.debug(
-      f"""
-      Getting scanner results for instrument code: {scanner_request.instrument_code},
-      location code: {scanner_request.location_code},
-      filters: {filters},
-      scan_code: {scanner_request.scan_code},
-      max results: {scanner_request.max_results}
-      parsed filter codes: {scanner_request.get_filter_codes()},
-      """,
+    # lazy: filter codes are only parsed if debug logging is on
+    logger.opt(lazy=True).debug(
+      "Getting scanner results for {}, parsed filter codes: {}",
+      lambda: scanner_request,
+      scanner_request.get_filter_codes,
     )
-    results = await ib_interface.get_scanner_results(scanner_request)
+    results = await get_ib_interface().get_scanner_results(scanner_request)
   except Exception as e:
     logger.error("Error in get_scanner_results: {!s}", str(e))
     return "Error getting scanner results"
   else:
-    logger.debug("Scanner results: {results}", results=results)
+    logger.debug("Scanner results: {results}", results=summarize(results))
     return f"I found {len(results)} stocks matching the scanner parameters: {results}"
@@ -0,0 +1,220 @@
+"""Binary tabular responses (Arrow IPC, Parquet, MessagePack) chosen by Accept."""
+
+from __future__ import annotations
+
+import importlib
+import json
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel
+
+from app.core.executor import get_executor
+from app.core.lazy import lazy_import
+
+if TYPE_CHECKING:
+  from types import ModuleType
+
+  import pandas as pd
+else:
+  pd = lazy_import("pandas")
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PARQUET = "application/x-parquet"
+MSGPACK = "application/x-msgpack"
+
+# Accept header values mapped to the canonical binary type; None means JSON.
+_ACCEPTED: dict[str, str | None] = {
+  ARROW_STREAM: ARROW_STREAM,
+  PARQUET: PARQUET,
+  "application/vnd.apache.parquet": PARQUET,
+  MSGPACK: MSGPACK,
+  "application/msgpack": MSGPACK,
+  "application/vnd.msgpack": MSGPACK,
+  "application/json": None,
+  "application/*": None,
+  "*/*": None,
+}
+
+# Encoders are optional dependencies (the "binary" extra).
+_ENCODER_MODULES: dict[str, str] = {
+  ARROW_STREAM: "pyarrow",
+  PARQUET: "pyarrow.parquet",
+  MSGPACK: "msgpack",
+}
+
+
+def binary_media_type(request: Request) -> str | None:
+  """Return the binary media type the client prefers, or None for JSON.
+
+  Accept entries are ranked by q-value (ties go to the first listed);
+  unrecognised types are ignored.
+  """
+  best: tuple[float, int, str | None] | None = None
+  for index, part in enumerate(request.headers.get("accept", "").split(",")):
+    media, *params = (p.strip() for p in part.split(";"))
+    if media.lower() not in _ACCEPTED:
+      continue
+    q = 1.0
+    for param in params:
+      if param.startswith("q="):
+        try:
+          q = float(param[2:])
+        except ValueError:
+          q = 0.0
+    candidate = (q, -index, _ACCEPTED[media.lower()])
+    if q > 0 and (best is None or candidate[:2] > best[:2]):
+      best = candidate
+  return best[2] if best is not None else None
+
+
+def _encoder(media_type: str) -> ModuleType:
+  """Import the encoder for a media type.
+
+  Raises:
+    HTTPException: 406 if the optional dependency is not installed.
+
+  """
+  name = _ENCODER_MODULES[media_type]
+  try:
+    return importlib.import_module(name)
+  except ImportError as e:
+    raise HTTPException(
+      status_code=406,
+      detail=f"{media_type} needs the optional '{name.split('.')[0]}' package "
+      "(install ibkr-mcp-server[binary]); request application/json instead",
+    ) from e
+
+
+def records_frame(
+  records: list[dict] | list[BaseModel],
+  flatten: tuple[str, ...] = (),
+) -> pd.DataFrame:
+  """Build a DataFrame from records, one row per record.
+
+  Nested objects named in flatten (e.g. "greeks") are lifted into top-level
+  columns; where one is null those columns are missing values.
+  """
+  rows = []
+  for record in records:
+    row = record.model_dump() if isinstance(record, BaseModel) else dict(record)
+    for key in flatten:
+      row.update(row.pop(key, None) or {})
+    rows.append(row)
+  return pd.DataFrame(rows)
+
+
+def encode_table(
+  frame: pd.DataFrame,
+  media_type: str,
+  metadata: dict | None = None,
+) -> bytes:
+  """Encode a DataFrame as Arrow IPC stream, Parquet or MessagePack.
+
+  Arrow and Parquet keep the column types and carry metadata as schema
+  metadata; MessagePack is a map of column name to value list with the
+  metadata keys alongside.
+
+  Raises:
+    HTTPException: 406 if the encoder for media_type is not installed.
+
+  """
+  encoder = _encoder(media_type)
+  if media_type == MSGPACK:
+    columns = {
+      str(col): frame[col].astype(object).where(frame[col].notna(), None).tolist()
+      for col in frame.columns
+    }
+    return encoder.packb({**(metadata or {}), **columns})
+
+  pa = _encoder(ARROW_STREAM)
+  table = pa.Table.from_pandas(frame, preserve_index=False)
+  if metadata:
+    table = table.replace_schema_metadata(
+      {**(table.schema.metadata or {}), **{k: str(v) for k, v in metadata.items()}},
+    )
+  sink = pa.BufferOutputStream()
+  if media_type == ARROW_STREAM:
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+      writer.write_table(table)
+  else:
+    encoder.write_table(table, sink)
+  return sink.getvalue().to_pybytes()
+
+
+def _encode_records(
+  records: list[dict] | list[BaseModel],
+  media_type: str,
+  flatten: tuple[str, ...],
+) -> bytes:
+  return encode_table(records_frame(records, flatten), media_type)
+
+
+def _encode_json(records: list[dict] | list[BaseModel]) -> bytes:
+  return json.dumps(
+    [
+      record.model_dump(mode="json") if isinstance(record, BaseModel) else record
+      for record in records
+    ],
+    separators=(",", ":"),
+    default=str,
+  ).encode()
+
+
+async def tabular_response(
+  frame: pd.DataFrame,
+  media_type: str,
+  metadata: dict | None = None,
+) -> Response:
+  """Return a DataFrame encoded by encode_table, off the loop if it is large.
+
+  Raises:
+    HTTPException: 406 if the encoder for media_type is not installed.
+
+  """
+  _encoder(media_type)
+  content = await get_executor().run(
+    encode_table,
+    frame,
+    media_type,
+    metadata,
+    items=len(frame),
+    process_safe=True,
+  )
+  return Response(content=content, media_type=media_type)
+
+
+async def records_response(
+  records: list[dict] | list[BaseModel],
+  media_type: str,
+  flatten: tuple[str, ...] = (),
+) -> Response:
+  """Return records as a binary table (see records_frame and encode_table).
+
+  Raises:
+    HTTPException: 406 if the encoder for media_type is not installed.
+
+  """
+  _encoder(media_type)
+  content = await get_executor().run(
+    _encode_records,
+    records,
+    media_type,
+    flatten,
+    items=len(records),
+    process_safe=True,
+  )
+  return Response(content=content, media_type=media_type)
+
+
+async def json_response[T: list](records: T) -> T | Response:
+  """Return records for FastAPI to serialize, or pre-encoded JSON if large.
+
+  Large lists are encoded in the work executor and skip response model
+  validation, which would otherwise run on the loop once per record.
+  """
+  executor = get_executor()
+  if executor.kind == "inline" or len(records) < executor.min_items:
+    return records
+  content = await executor.run(_encode_json, records, process_safe=True)
+  return Response(content=content, media_type="application/json")
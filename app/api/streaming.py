@@ -0,0 +1,73 @@
+"""Incremental NDJSON / server-sent-event responses."""
+
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.core.setup_logging import logger
+
+StreamFormat = Literal["ndjson", "sse"]
+
+# Module-level singleton for the Query param (avoids B008).
+STREAM_FORMAT_QUERY = Query(
+  default="ndjson",
+  alias="format",
+  description="ndjson (application/x-ndjson) or sse (text/event-stream)",
+)
+
+_MEDIA_TYPES: dict[str, str] = {
+  "ndjson": "application/x-ndjson",
+  "sse": "text/event-stream",
+}
+
+
+def _encode(record: dict, fmt: StreamFormat) -> bytes:
+  """Encode one record as an NDJSON line or an SSE event."""
+  data = json.dumps(record, default=str, separators=(",", ":"))
+  if fmt == "sse":
+    return f"event: {record['type']}\ndata: {data}\n\n".encode()
+  return f"{data}\n".encode()
+
+
+def stream_batches(
+  batches: AsyncIterator[list[BaseModel]] | AsyncIterator[list[dict]],
+  record_type: str,
+  fmt: StreamFormat = "ndjson",
+) -> StreamingResponse:
+  """Stream batches of models (or dicts) as they are produced, then a summary.
+
+  Each batch is emitted as {"type": record_type, "data": [...]}. The final
+  record is {"type": "summary", "count", "batches", "elapsed_seconds"} and
+  carries an "error" field if the producer failed part way through, since
+  the HTTP status has already been sent by then.
+  """
+
+  async def body() -> AsyncIterator[bytes]:
+    t0 = time.monotonic()
+    summary: dict = {"type": "summary", "count": 0, "batches": 0}
+    try:
+      async for batch in batches:
+        summary["count"] += len(batch)
+        summary["batches"] += 1
+        yield _encode(
+          {
+            "type": record_type,
+            "data": [
+              item.model_dump() if isinstance(item, BaseModel) else item
+              for item in batch
+            ],
+          },
+          fmt,
+        )
+    except Exception as e:
+      logger.error("Error while streaming {}: {!s}", record_type, e)
+      summary["error"] = str(e)
+    summary["elapsed_seconds"] = round(time.monotonic() - t0, 3)
+    yield _encode(summary, fmt)
+
+  return StreamingResponse(body(), media_type=_MEDIA_TYPES[fmt])
@@ -9,6 +9,7 @@ from app.core.config import get_config
 UNPROTECTED_PATHS = [
   "/",
   "/health",
+  "/ready",
   "/gateway/status",
 ]
 
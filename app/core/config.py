@@ -1,9 +1,29 @@
 """Configuration for the application."""
 
 import secrets
+from typing import Literal
+
 from pydantic import PrivateAttr, field_validator
 from pydantic_settings import BaseSettings
 
+# Where WorkExecutor runs CPU-heavy steps; defined here so config can validate it
+ExecutorKind = Literal["thread", "process", "inline"]
+
+
+def _parse_contracts(value: str) -> list[tuple[str, str, str]]:
+  """Parse SYMBOL[:SEC_TYPE[:EXCHANGE]],… into (symbol, sec_type, exchange) tuples.
+
+  SEC_TYPE defaults to STK and EXCHANGE to SMART.
+  """
+  contracts = []
+  for entry in value.split(","):
+    parts = [part.strip().upper() for part in entry.split(":")]
+    if not parts[0]:
+      continue
+    symbol, sec_type, exchange = (*parts, "STK", "SMART")[:3]
+    contracts.append((symbol, sec_type, exchange))
+  return contracts
+
 
 class Config(BaseSettings):
   """Global configuration for the application."""
@@ -25,11 +45,102 @@ class Config(BaseSettings):
   ib_gateway_host: str = "localhost"  # IBKR_IB_GATEWAY_HOST
   ib_gateway_port: int = 8888  # IBKR_IB_GATEWAY_PORT
 
+  # IB request pacing (IB disconnects clients above ~50 messages/second)
+  ib_max_messages_per_second: float = 45.0  # IBKR_IB_MAX_MESSAGES_PER_SECOND
+  ib_max_concurrent_requests: int = 8  # IBKR_IB_MAX_CONCURRENT_REQUESTS
+
+  # Bulk contract qualification
+  qualify_batch_size: int = 50  # IBKR_QUALIFY_BATCH_SIZE (initial batch size)
+  qualify_max_batch_size: int = 400  # IBKR_QUALIFY_MAX_BATCH_SIZE
+  qualify_concurrency: int = 4  # IBKR_QUALIFY_CONCURRENCY (batches in flight)
+  qualify_batch_timeout: float = 30.0  # IBKR_QUALIFY_BATCH_TIMEOUT (seconds)
+
+  # Bulk market data snapshots (each ticker in flight holds a market data line)
+  ticker_batch_size: int = 50  # IBKR_TICKER_BATCH_SIZE
+  ticker_concurrency: int = 2  # IBKR_TICKER_CONCURRENCY (batches in flight)
+
+  # Caches
+  chain_cache_ttl: float = 3600.0  # IBKR_CHAIN_CACHE_TTL (seconds)
+  chain_snapshot_ttl: float = 5.0  # IBKR_CHAIN_SNAPSHOT_TTL (seconds)
+  history_cache_ttl: float = 60.0  # IBKR_HISTORY_CACHE_TTL (windows incl. today)
+  history_cache_ttl_closed: float = 86400.0  # IBKR_HISTORY_CACHE_TTL_CLOSED (past)
+  scanner_catalog_ttl: float = 86400.0  # IBKR_SCANNER_CATALOG_TTL (seconds)
+
+  # Seconds between readiness checks; failed checks reconnect and re-warm
+  ready_check_interval: float = 10.0  # IBKR_READY_CHECK_INTERVAL
+
+  # Warmup run after each connect, before /ready passes: contracts qualified,
+  # chain definitions cached and live bar subscriptions (with their recent
+  # bars) opened for every symbol and window
+  warmup_symbols: str = ""  # IBKR_WARMUP_SYMBOLS (SYMBOL[:SEC_TYPE[:EXCHANGE]],…)
+  warmup_chain_underlyings: str = ""  # IBKR_WARMUP_CHAIN_UNDERLYINGS (same format)
+  warmup_bar_windows: str = ""  # IBKR_WARMUP_BAR_WINDOWS (FREQ:DAYS,…, e.g. 1min:1)
+
+  # Off-hours price snapshots prefetched after each session close
+  price_watchlist: str = ""  # IBKR_PRICE_WATCHLIST (SYMBOL[:SEC_TYPE[:EXCHANGE]],…)
+  price_prefetch_delay: float = 300.0  # IBKR_PRICE_PREFETCH_DELAY (s after close)
+
+  # Bulk historical downloads
+  history_concurrency: int = 4  # IBKR_HISTORY_CONCURRENCY (contracts in flight)
+  history_output_dir: str = "data/history"  # IBKR_HISTORY_OUTPUT_DIR
+
+  # Background jobs
+  job_workers: int = 2  # IBKR_JOB_WORKERS (jobs running at once)
+  job_ttl: float = 3600.0  # IBKR_JOB_TTL (seconds finished jobs are kept)
+
+  # Historical responses above this many bars skip per-bar model validation
+  bar_model_limit: int = 5000  # IBKR_BAR_MODEL_LIMIT
+
+  # Seconds portfolio_risk waits for greeks of newly held contracts
+  risk_greeks_timeout: float = 5.0  # IBKR_RISK_GREEKS_TIMEOUT
+
+  # Live BAG quote subscriptions kept for combo_quote (least recently used go)
+  combo_max_subscriptions: int = 20  # IBKR_COMBO_MAX_SUBSCRIPTIONS
+  combo_quote_timeout: float = 2.0  # IBKR_COMBO_QUOTE_TIMEOUT (first quote wait)
+
+  # Live bar subscriptions stay open this long after their last listener leaves
+  bar_stream_linger: float = 60.0  # IBKR_BAR_STREAM_LINGER (seconds)
+
   # Non-essential parameters
   enable_file_logging: bool = False  # IBKR_ENABLE_FILE_LOGGING
   enable_mcp: bool = False  # IBKR_ENABLE_MCP
   log_file_path: str = "logs/app.log"  # IBKR_LOG_FILE_PATH
 
+  # Log output: text or one JSON object per line, written from a background
+  # thread (enqueue) so sinks never block the event loop
+  log_format: str = "text"  # IBKR_LOG_FORMAT (text, json)
+  log_enqueue: bool = True  # IBKR_LOG_ENQUEUE
+  # Debug dumps of large payloads show counts and a preview unless this is set
+  log_full_payloads: bool = False  # IBKR_LOG_FULL_PAYLOADS
+  # High-frequency log lines are emitted once per this many occurrences
+  log_sample_every: int = 100  # IBKR_LOG_SAMPLE_EVERY
+
+  # Event loop lag sampling (0 disables) and the lag logged with a stack trace
+  loop_monitor_interval: float = 0.5  # IBKR_LOOP_MONITOR_INTERVAL (seconds)
+  loop_stall_threshold: float = 0.1  # IBKR_LOOP_STALL_THRESHOLD (seconds)
+
+  # CPU-heavy steps (DataFrame building, filtering, XML parsing, encoding)
+  # on inputs of at least offload_min_items items run in a worker pool:
+  # thread, process (picklable steps only; others use threads) or inline
+  executor_kind: ExecutorKind = "thread"  # IBKR_EXECUTOR_KIND (thread, process, inline)
+  executor_workers: int = 4  # IBKR_EXECUTOR_WORKERS
+  offload_min_items: int = 200  # IBKR_OFFLOAD_MIN_ITEMS
+
+  # Longest sampling profile /admin/profile may run
+  profile_max_duration: float = 60.0  # IBKR_PROFILE_MAX_DURATION (seconds)
+
+  # Recent requests kept for /admin/requests (slowest requests and per route)
+  request_log_history: int = 1000  # IBKR_REQUEST_LOG_HISTORY
+
+  # OpenTelemetry tracing (needs the "tracing" extra); exporter is one of
+  # none, otlp, file (JSON lines) or console
+  tracing_exporter: str = "none"  # IBKR_TRACING_EXPORTER
+  tracing_otlp_endpoint: str = (
+    "http://localhost:4318/v1/traces"  # IBKR_TRACING_OTLP_ENDPOINT
+  )
+  tracing_file_path: str = "logs/traces.jsonl"  # IBKR_TRACING_FILE_PATH
+  tracing_service_name: str = "ibkr-mcp-server"  # IBKR_TRACING_SERVICE_NAME
+
   # Security parameters
   cors_allowed_origins: str = "*"  # IBKR_CORS_ALLOWED_ORIGINS (comma-separated)
   auth_token: str | None = None  # IBKR_AUTH_TOKEN
@@ -53,6 +164,34 @@ class Config(BaseSettings):
       if origin.strip()
     ]
 
+  def get_price_watchlist(self) -> list[tuple[str, str, str]]:
+    """Parse the price watchlist into (symbol, sec_type, exchange) tuples.
+
+    Entries are SYMBOL[:SEC_TYPE[:EXCHANGE]]; SEC_TYPE defaults to STK and
+    EXCHANGE to SMART.
+    """
+    return _parse_contracts(self.price_watchlist)
+
+  def get_warmup_symbols(self) -> list[tuple[str, str, str]]:
+    """Parse the warmup symbols (same format as the price watchlist)."""
+    return _parse_contracts(self.warmup_symbols)
+
+  def get_warmup_chain_underlyings(self) -> list[tuple[str, str, str]]:
+    """Parse the warmup chain underlyings (same format as the price watchlist)."""
+    return _parse_contracts(self.warmup_chain_underlyings)
+
+  def get_warmup_bar_windows(self) -> list[tuple[str, int]]:
+    """Parse the warmup bar windows FREQ:DAYS,… into (freq, lookback_days) tuples.
+
+    DAYS defaults to 1.
+    """
+    windows = []
+    for entry in self.warmup_bar_windows.split(","):
+      freq, _, days = (part.strip() for part in entry.partition(":"))
+      if freq:
+        windows.append((freq, int(days or 1)))
+    return windows
+
   def get_effective_auth_token(self) -> str:
     """Get the effective auth token, generating one if none provided."""
     if self.auth_token:
@@ -0,0 +1,99 @@
+"""Worker pools for CPU-heavy steps, so large payloads do not stall the loop."""
+
+import asyncio
+import functools
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.core.config import ExecutorKind, get_config
+from app.core.metrics import OFFLOADED_WORK
+from app.core.setup_logging import logger
+
+
+class WorkExecutor:
+  """Run CPU-bound functions off the event loop once their input is large.
+
+  Calls with fewer than `min_items` items run inline, where a hand-off would
+  cost more than the work. Larger ones go to a thread pool or, for kind
+  "process", to a process pool if the call is marked process_safe (function
+  and arguments picklable, no shared state); other calls still use threads.
+
+  Threads share the GIL with the loop, so they cap how long the loop is
+  blocked (the interpreter switches every few ms) rather than add CPU.
+  Processes add CPU at the cost of pickling inputs and results.
+  """
+
+  def __init__(self, kind: ExecutorKind, workers: int, min_items: int) -> None:
+    """Initialize the executor; pools start on first use.
+
+    Args:
+      kind: thread, process or inline (everything runs on the loop).
+      workers: Maximum workers per pool.
+      min_items: Smallest input (rows, records, contracts) that is offloaded.
+
+    """
+    self.kind = kind
+    self.workers = max(1, workers)
+    self.min_items = min_items
+    self._threads: ThreadPoolExecutor | None = None
+    self._processes: ProcessPoolExecutor | None = None
+
+  def _pool(self, *, process_safe: bool) -> tuple[str, Executor]:
+    if process_safe and self.kind == "process":
+      if self._processes is None:
+        # spawn: forking a process that runs threads and an event loop is unsafe
+        self._processes = ProcessPoolExecutor(
+          max_workers=self.workers,
+          mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info("Started process pool with {} workers", self.workers)
+      return "process", self._processes
+    if self._threads is None:
+      self._threads = ThreadPoolExecutor(
+        max_workers=self.workers,
+        thread_name_prefix="work",
+      )
+    return "thread", self._threads
+
+  async def run[T](
+    self,
+    fn: Callable[..., T],
+    *args: object,
+    items: int | None = None,
+    process_safe: bool = False,
+  ) -> T:
+    """Return fn(*args), computed in a worker if the input is large enough.
+
+    Args:
+      fn: Function to call.
+      *args: Positional arguments for fn.
+      items: Size of the input; None means always large enough to offload.
+      process_safe: fn and args can be pickled to a worker process.
+
+    """
+    if self.kind == "inline" or (items is not None and items < self.min_items):
+      OFFLOADED_WORK.labels("inline").inc()
+      return fn(*args)
+    name, pool = self._pool(process_safe=process_safe)
+    OFFLOADED_WORK.labels(name).inc()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, functools.partial(fn, *args))
+
+  def shutdown(self) -> None:
+    """Stop the pools, cancelling work that has not started."""
+    for pool in (self._threads, self._processes):
+      if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+    self._threads = self._processes = None
+
+
+@functools.cache
+def get_executor() -> WorkExecutor:
+  """Get the global work executor configured by IBKR_EXECUTOR_*."""
+  config = get_config()
+  return WorkExecutor(
+    kind=config.executor_kind,
+    workers=config.executor_workers,
+    min_items=config.offload_min_items,
+  )
@@ -0,0 +1,32 @@
+"""Deferred imports for heavy dependencies, to keep startup fast.
+
+A module returned by lazy_import() is only executed on first attribute
+access, so importing the app does not pay for pandas, numpy,
+exchange_calendars or docker until a request (or the warmup) uses them.
+Modules import the real package under TYPE_CHECKING for annotations:
+
+  if TYPE_CHECKING:
+    import pandas as pd
+  else:
+    pd = lazy_import("pandas")
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+  """Return module `name`, executed on first attribute access."""
+  if (module := sys.modules.get(name)) is not None:
+    return module
+  spec = importlib.util.find_spec(name)
+  if spec is None or spec.loader is None:
+    msg = f"No module named {name!r}"
+    raise ModuleNotFoundError(msg, name=name)
+  loader = importlib.util.LazyLoader(spec.loader)
+  spec.loader = loader
+  module = importlib.util.module_from_spec(spec)
+  sys.modules[name] = module
+  loader.exec_module(module)
+  return module
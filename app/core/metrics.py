@@ -0,0 +1,123 @@
+"""Prometheus metrics for IB round trips, caches, subscriptions, loop lag and HTTP."""
+
+import time
+
+from prometheus_client import (
+  CONTENT_TYPE_LATEST,
+  Counter,
+  Gauge,
+  Histogram,
+  generate_latest,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# IB round trips range from ~1 ms (cached) to minutes (large history pulls).
+_IB_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+_HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+IB_REQUEST_SECONDS = Histogram(
+  "ibkr_ib_request_seconds",
+  "Duration of IB API round trips by call type, excluding pacing waits",
+  ["call"],
+  buckets=_IB_BUCKETS,
+)
+IB_REQUEST_ERRORS = Counter(
+  "ibkr_ib_request_errors_total",
+  "IB API calls that raised, by call type",
+  ["call"],
+)
+PACING_WAIT_SECONDS = Histogram(
+  "ibkr_pacing_wait_seconds",
+  "Time IB calls waited for a pacing slot and message tokens",
+  ["call"],
+  buckets=_IB_BUCKETS,
+)
+PACING_IN_FLIGHT = Gauge(
+  "ibkr_pacing_in_flight",
+  "IB calls holding a pacing slot",
+)
+PACING_WAITING = Gauge(
+  "ibkr_pacing_waiting",
+  "IB calls queued for a pacing slot or tokens",
+)
+CACHE_REQUESTS = Counter(
+  "ibkr_cache_requests_total",
+  "Cache lookups by cache and result (hit or miss)",
+  ["cache", "result"],
+)
+CACHE_ENTRIES = Gauge(
+  "ibkr_cache_entries",
+  "Entries held per cache, including expired ones not yet evicted",
+  ["cache"],
+)
+SUBSCRIPTIONS = Gauge(
+  "ibkr_subscriptions",
+  "Open streaming IB subscriptions by kind",
+  ["kind"],
+)
+IB_CONNECTED = Gauge("ibkr_ib_connected", "1 while connected to IB Gateway")
+IB_CONNECTS = Counter("ibkr_ib_connects_total", "Successful IB Gateway connects")
+IB_DISCONNECTS = Counter("ibkr_ib_disconnects_total", "IB Gateway disconnects")
+EVENT_LOOP_LAG = Histogram(
+  "ibkr_event_loop_lag_seconds",
+  "How late the event loop ran a timer; high values mean blocking callbacks",
+  buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+EVENT_LOOP_STALLS = Counter(
+  "ibkr_event_loop_stalls_total",
+  "Event loop lags above IBKR_LOOP_STALL_THRESHOLD",
+)
+OFFLOADED_WORK = Counter(
+  "ibkr_offloaded_work_total",
+  "CPU-heavy steps by where they ran (inline, thread or process)",
+  ["pool"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+  "ibkr_http_request_seconds",
+  "HTTP request duration until the last body byte, by route template",
+  ["method", "route", "status"],
+  buckets=_HTTP_BUCKETS,
+)
+
+
+def latest() -> tuple[bytes, str]:
+  """Return the current metrics in the text exposition format and its type."""
+  return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class HTTPMetricsMiddleware:
+  """Record request duration per route template (not raw path) and status.
+
+  Duration runs until the response body is fully sent, so it includes
+  serialization and streaming time; compare it with ibkr_ib_request_seconds
+  to see where a slow response spent its time.
+  """
+
+  def __init__(self, app: ASGIApp) -> None:
+    """Wrap an ASGI app."""
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    """Time one HTTP request."""
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    status = 500
+    t0 = time.perf_counter()
+
+    async def send_with_status(message: Message) -> None:
+      nonlocal status
+      if message["type"] == "http.response.start":
+        status = message["status"]
+      await send(message)
+
+    try:
+      await self.app(scope, receive, send_with_status)
+    finally:
+      route = scope.get("route")
+      HTTP_REQUEST_SECONDS.labels(
+        scope["method"],
+        getattr(route, "path", "unmatched"),
+        str(status),
+      ).observe(time.perf_counter() - t0)
@@ -0,0 +1,327 @@
+"""Sampling profiler and event loop stall monitor, cheap enough for production.
+
+Both work from a background thread that reads other threads' Python stacks
+with sys._current_frames(), so nothing is instrumented and the event loop
+only pays for the GIL hand-offs while a sample is taken.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import datetime as dt
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Literal
+
+from app.core.metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+from app.core.setup_logging import logger
+
+if TYPE_CHECKING:
+  from types import CodeType, FrameType
+
+ProfileMode = Literal["wall", "cpu"]
+
+# Deeper stacks are cut at the root end; frames near the leaf matter most.
+_MAX_DEPTH = 128
+
+
+def _current_frames() -> dict[int, FrameType]:
+  return sys._current_frames()  # noqa: SLF001
+
+
+def _thread_cpu_time(thread_id: int) -> float | None:
+  """Return the CPU seconds used by a thread, or None where unsupported."""
+  try:
+    return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+  except (AttributeError, OSError):
+    return None
+
+
+def _is_idle(frame: FrameType) -> bool:
+  """Return True if the event loop is waiting in its selector."""
+  code = frame.f_code
+  return code.co_name == "select" and code.co_filename.endswith("selectors.py")
+
+
+def _task_label(loop: asyncio.AbstractEventLoop) -> str:
+  """Name the coroutine the loop is running, for async-aware stacks."""
+  try:
+    task = asyncio.current_task(loop)
+  except RuntimeError:
+    task = None
+  if task is None:
+    return "[loop callbacks]"
+  return f"[task] {task.get_coro().__qualname__}"
+
+
+@dataclass
+class Profile:
+  """Aggregated stacks (frame indices, root first) and their seconds."""
+
+  mode: ProfileMode
+  interval: float
+  duration: float = 0.0
+  samples: int = 0
+  frames: list[tuple[str, str, int]] = field(default_factory=list)
+  stacks: Counter[tuple[int, ...]] = field(default_factory=Counter)
+
+  def to_speedscope(self) -> dict:
+    """Return the profile in speedscope's sampled file format."""
+    stacks = list(self.stacks.items())
+    return {
+      "$schema": "https://www.speedscope.app/file-format-schema.json",
+      "exporter": "ibkr-mcp-server",
+      "name": f"ibkr-mcp-server {self.mode} profile",
+      "activeProfileIndex": 0,
+      "shared": {
+        "frames": [
+          {"name": name, "file": file, "line": line} for name, file, line in self.frames
+        ],
+      },
+      "profiles": [
+        {
+          "type": "sampled",
+          "name": f"{self.mode} time, {self.samples} samples",
+          "unit": "seconds",
+          "startValue": 0,
+          "endValue": sum(weight for _, weight in stacks),
+          "samples": [list(stack) for stack, _ in stacks],
+          "weights": [weight for _, weight in stacks],
+        },
+      ],
+    }
+
+  def to_collapsed(self) -> str:
+    """Return folded stacks ("a;b;c <microseconds>") for flamegraph tools."""
+    lines = []
+    for stack, weight in self.stacks.most_common():
+      path = ";".join(self.frames[i][0] for i in stack)
+      lines.append(f"{path} {round(weight * 1e6)}")
+    return "\n".join(lines) + "\n"
+
+
+class SamplingProfiler:
+  """Sample the stacks of the event loop thread (or every thread).
+
+  In wall mode each sample weighs the wall time since the previous one, so
+  time blocked in I/O or sleeps shows up. In cpu mode it weighs the CPU time
+  the thread used since then; where per-thread CPU clocks are unavailable,
+  samples of a loop idling in its selector are dropped instead.
+  """
+
+  def __init__(
+    self,
+    loop: asyncio.AbstractEventLoop,
+    loop_thread_id: int,
+    interval: float,
+    mode: ProfileMode,
+    *,
+    all_threads: bool = False,
+  ) -> None:
+    """Initialize the profiler; call run() from a thread other than the loop's."""
+    self.loop = loop
+    self.loop_thread_id = loop_thread_id
+    self.all_threads = all_threads
+    self.profile = Profile(mode=mode, interval=interval)
+    self._frame_index: dict[CodeType | str, int] = {}
+    self._cpu_times: dict[int, float] = {}
+
+  def run(self, duration: float) -> Profile:
+    """Sample until `duration` seconds have passed and return the profile."""
+    own_id = threading.get_ident()
+    names = {t.ident: t.name for t in threading.enumerate()}
+    started = last = time.monotonic()
+    deadline = started + duration
+    while (now := time.monotonic()) < deadline:
+      elapsed, last = now - last, now
+      for thread_id, frame in _current_frames().items():
+        if thread_id == own_id:
+          continue
+        if not self.all_threads and thread_id != self.loop_thread_id:
+          continue
+        weight = self._weight(thread_id, frame, elapsed)
+        if weight > 0:
+          self._record(thread_id, frame, weight, names)
+      time.sleep(self.profile.interval)
+    self.profile.duration = time.monotonic() - started
+    return self.profile
+
+  def _weight(self, thread_id: int, frame: FrameType, elapsed: float) -> float:
+    if self.profile.mode == "wall":
+      return elapsed
+    cpu = _thread_cpu_time(thread_id)
+    if cpu is None:
+      return 0.0 if _is_idle(frame) else elapsed
+    previous = self._cpu_times.get(thread_id)
+    self._cpu_times[thread_id] = cpu
+    return 0.0 if previous is None else cpu - previous
+
+  def _index(self, key: CodeType | str) -> int:
+    index = self._frame_index.get(key)
+    if index is None:
+      index = self._frame_index[key] = len(self.profile.frames)
+      if isinstance(key, str):
+        self.profile.frames.append((key, "", 0))
+      else:
+        self.profile.frames.append(
+          (key.co_qualname, key.co_filename, key.co_firstlineno)
+        )
+    return index
+
+  def _record(
+    self,
+    thread_id: int,
+    frame: FrameType | None,
+    weight: float,
+    names: dict[int | None, str],
+  ) -> None:
+    stack = []
+    while frame is not None and len(stack) < _MAX_DEPTH:
+      stack.append(self._index(frame.f_code))
+      frame = frame.f_back
+    if thread_id == self.loop_thread_id:
+      stack.append(self._index(_task_label(self.loop)))
+    if self.all_threads:
+      stack.append(self._index(f"[thread] {names.get(thread_id, thread_id)}"))
+    stack.reverse()
+    self.profile.stacks[tuple(stack)] += weight
+    self.profile.samples += 1
+
+
+@dataclass
+class Stall:
+  """One event loop stall: when, how long, and where the loop was stuck."""
+
+  at: str
+  task: str
+  stack: list[str] | None = None
+  duration_ms: float | None = None
+
+
+class LoopMonitor:
+  """Measure event loop lag and log what the loop runs when it stalls.
+
+  A task sleeps `interval` seconds at a time; the overshoot is the lag. A
+  watchdog thread checks the task's heartbeat and, once the loop has been
+  blocked for longer than `threshold`, logs the loop thread's stack while
+  the blocking callback is still running.
+  """
+
+  def __init__(self, interval: float, threshold: float, history: int = 20) -> None:
+    """Initialize the monitor.
+
+    Args:
+      interval: Seconds between lag measurements; 0 disables the monitor.
+      threshold: Lag in seconds reported as a stall.
+      history: Number of recent stalls kept for the admin endpoint.
+
+    """
+    self.interval = interval
+    self.threshold = threshold
+    self.last_lag = 0.0
+    self.max_lag = 0.0
+    self.stalls: deque[Stall] = deque(maxlen=history)
+    self._heartbeat = time.monotonic()
+    self._pending: Stall | None = None
+    self._task: asyncio.Task | None = None
+    self._stop = threading.Event()
+
+  @property
+  def running(self) -> bool:
+    """Return True while the monitor task is active."""
+    return self._task is not None and not self._task.done()
+
+  def stats(self, *, stacks: bool = False) -> dict:
+    """Return lag figures and recent stalls, newest first.
+
+    Args:
+      stacks: Include the captured stack of each stall.
+
+    """
+    stalls = []
+    for stall in reversed(self.stalls):
+      entry = dataclasses.asdict(stall)
+      if not stacks:
+        del entry["stack"]
+      stalls.append(entry)
+    return {
+      "running": self.running,
+      "interval_s": self.interval,
+      "threshold_ms": self.threshold * 1000,
+      "last_lag_ms": self.last_lag * 1000,
+      "max_lag_ms": self.max_lag * 1000,
+      "stalls": stalls,
+    }
+
+  def start(self) -> None:
+    """Start the lag task and watchdog thread on the running loop."""
+    if self.interval <= 0 or self.running:
+      return
+    loop = asyncio.get_running_loop()
+    self._stop.clear()
+    self._heartbeat = time.monotonic()
+    self._task = asyncio.create_task(self._measure())
+    threading.Thread(
+      target=self._watch,
+      args=(loop, threading.get_ident()),
+      name="loop-watchdog",
+      daemon=True,
+    ).start()
+
+  async def stop(self) -> None:
+    """Stop the lag task and watchdog thread."""
+    self._stop.set()
+    if self._task is not None:
+      self._task.cancel()
+      await asyncio.gather(self._task, return_exceptions=True)
+      self._task = None
+
+  async def _measure(self) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+      t0 = loop.time()
+      await asyncio.sleep(self.interval)
+      lag = max(0.0, loop.time() - t0 - self.interval)
+      self._heartbeat = time.monotonic()
+      self.last_lag = lag
+      self.max_lag = max(self.max_lag, lag)
+      EVENT_LOOP_LAG.observe(lag)
+      if lag < self.threshold:
+        continue
+      EVENT_LOOP_STALLS.inc()
+      stall, self._pending = self._pending, None
+      if stall is None:
+        # Shorter than the watchdog's polling period; no stack was captured.
+        stall = Stall(at=dt.datetime.now(dt.UTC).isoformat(), task="unknown")
+        self.stalls.append(stall)
+      stall.duration_ms = lag * 1000
+      logger.warning("Event loop blocked for {:.0f} ms", stall.duration_ms)
+
+  def _watch(self, loop: asyncio.AbstractEventLoop, thread_id: int) -> None:
+    """Watchdog thread: capture the loop's stack while it is blocked."""
+    period = max(self.threshold / 2, 0.01)
+    while not self._stop.wait(period):
+      blocked = time.monotonic() - self._heartbeat - self.interval
+      if blocked < self.threshold or self._pending is not None:
+        continue
+      frame = _current_frames().get(thread_id)
+      if frame is None:
+        continue
+      stall = Stall(
+        at=dt.datetime.now(dt.UTC).isoformat(),
+        task=_task_label(loop),
+        stack=traceback.format_stack(frame),
+      )
+      self._pending = stall
+      self.stalls.append(stall)
+      logger.warning(
+        "Event loop blocked for over {:.0f} ms in {}:\n{}",
+        blocked * 1000,
+        stall.task,
+        "".join(stall.stack),
+      )
@@ -0,0 +1,163 @@
+"""Per-request latency breakdown: one log line per request and a slow-request view.
+
+The middleware puts a RequestStats in a context variable for the duration of
+the request; the pacing governor and the caches add to it, so every IB round
+trip and cache lookup made on behalf of the request is attributed to it.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import statistics
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from app.core.setup_logging import logger
+
+if TYPE_CHECKING:
+  from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+@dataclass(slots=True)
+class RequestStats:
+  """Where one HTTP request spent its time.
+
+  IB times are summed over calls, so requests that run IB calls concurrently
+  can report more IB time than total time.
+  """
+
+  method: str
+  path: str
+  route: str | None = None
+  operation: str | None = None
+  status: int = 500
+  at: float = 0.0
+  duration_ms: float = 0.0
+  ib_calls: int = 0
+  ib_messages: int = 0
+  ib_ms: float = 0.0
+  pacing_wait_ms: float = 0.0
+  cache_hits: int = 0
+  cache_misses: int = 0
+  bytes_sent: int = 0
+
+  def as_dict(self) -> dict:
+    """Return the stats as a plain dict."""
+    return dataclasses.asdict(self)
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def record_ib_call(messages: int, waited: float, elapsed: float) -> None:
+  """Add one IB round trip (seconds waited for pacing and on IB) to the request."""
+  if (stats := _current.get()) is not None:
+    stats.ib_calls += 1
+    stats.ib_messages += messages
+    stats.pacing_wait_ms += waited * 1000
+    stats.ib_ms += elapsed * 1000
+
+
+def record_cache(*, hit: bool) -> None:
+  """Add one cache lookup to the request."""
+  if (stats := _current.get()) is not None:
+    if hit:
+      stats.cache_hits += 1
+    else:
+      stats.cache_misses += 1
+
+
+class RequestLog:
+  """The most recent requests, for the slowest-requests admin view."""
+
+  def __init__(self, history: int) -> None:
+    """Keep the last `history` requests."""
+    self.requests: deque[RequestStats] = deque(maxlen=max(1, history))
+
+  def add(self, stats: RequestStats) -> None:
+    """Record a finished request."""
+    self.requests.append(stats)
+
+  def slowest(self, limit: int, route: str | None = None) -> list[dict]:
+    """Return the slowest recent requests, optionally for one route template."""
+    requests = [r for r in self.requests if route is None or r.route == route]
+    requests.sort(key=lambda r: r.duration_ms, reverse=True)
+    return [r.as_dict() for r in requests[:limit]]
+
+  def routes(self) -> dict[str, dict]:
+    """Return latency and IB figures per route over the recent requests."""
+    by_route: dict[str, list[RequestStats]] = {}
+    for r in self.requests:
+      by_route.setdefault(f"{r.method} {r.route or 'unmatched'}", []).append(r)
+    summary = {}
+    for name, requests in by_route.items():
+      durations = sorted(r.duration_ms for r in requests)
+      summary[name] = {
+        "count": len(requests),
+        "mean_ms": statistics.fmean(durations),
+        "p95_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+        "max_ms": durations[-1],
+        "mean_ib_ms": statistics.fmean(r.ib_ms for r in requests),
+        "mean_pacing_wait_ms": statistics.fmean(r.pacing_wait_ms for r in requests),
+        "mean_ib_messages": statistics.fmean(r.ib_messages for r in requests),
+      }
+    return dict(sorted(summary.items(), key=lambda kv: -kv[1]["p95_ms"]))
+
+
+class RequestStatsMiddleware:
+  """Collect RequestStats per HTTP request, log them and keep them in a RequestLog.
+
+  Replaces the uvicorn access log: the line carries the same method, path
+  and status plus the latency breakdown, and the fields are bound to the
+  record so JSON logs carry them as structured values.
+  """
+
+  def __init__(self, app: ASGIApp, request_log: RequestLog) -> None:
+    """Wrap an ASGI app."""
+    self.app = app
+    self.request_log = request_log
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    """Measure one HTTP request."""
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    stats = RequestStats(method=scope["method"], path=scope["path"], at=time.time())
+    token = _current.set(stats)
+    t0 = time.perf_counter()
+
+    async def send_with_stats(message: Message) -> None:
+      if message["type"] == "http.response.start":
+        stats.status = message["status"]
+      elif message["type"] == "http.response.body":
+        stats.bytes_sent += len(message.get("body", b""))
+      await send(message)
+
+    try:
+      await self.app(scope, receive, send_with_stats)
+    finally:
+      _current.reset(token)
+      stats.duration_ms = (time.perf_counter() - t0) * 1000
+      if (route := scope.get("route")) is not None:
+        stats.route = route.path
+        stats.operation = getattr(route, "operation_id", None) or route.name
+      self.request_log.add(stats)
+      logger.bind(request=stats.as_dict()).info(
+        "{} {} {} {:.1f} ms (IB {} calls, {} msgs, {:.1f} ms, pacing {:.1f} ms; "
+        "cache {}/{} hits; {} bytes)",
+        stats.method,
+        stats.path,
+        stats.status,
+        stats.duration_ms,
+        stats.ib_calls,
+        stats.ib_messages,
+        stats.ib_ms,
+        stats.pacing_wait_ms,
+        stats.cache_hits,
+        stats.cache_hits + stats.cache_misses,
+        stats.bytes_sent,
+      )
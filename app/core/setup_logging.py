@@ -3,29 +3,42 @@
 from __future__ import annotations
 
 import sys
+import json
 import logging
-from typing import TYPE_CHECKING
+import traceback
+from collections.abc import Mapping, Sized
+from typing import TYPE_CHECKING, Any
 from loguru import logger
 
 if TYPE_CHECKING:
-  from loguru import Logger
+  from loguru import Logger, Record
 from app.core.config import get_config
 
+# stdlib level numbers to loguru level names; others are passed as numbers
+_LEVELS = {
+  logging.CRITICAL: "CRITICAL",
+  logging.ERROR: "ERROR",
+  logging.WARNING: "WARNING",
+  logging.INFO: "INFO",
+  logging.DEBUG: "DEBUG",
+}
+
+# Longest preview of a summarized payload
+_PREVIEW_CHARS = 200
+
+_full_payloads = False
+
 
 class InterceptHandler(logging.Handler):
   """Intercept handler for logging."""
 
   def emit(self, record: logging.LogRecord) -> None:
     """Emit a record."""
-    # Get corresponding Loguru level if it exists
-    try:
-      level = logger.level(record.levelname).name
-    except ValueError:
-      level = record.levelno
+    level = _LEVELS.get(record.levelno, record.levelno)
 
     # Find caller from where originated the logged message
-    frame, depth = logging.currentframe(), 2
-    while frame.f_code.co_filename == logging.__file__:
+    frame, depth = sys._getframe(1), 1  # noqa: SLF001
+    while frame is not None and frame.f_code.co_filename == logging.__file__:
       frame = frame.f_back
       depth += 1
 
@@ -35,33 +48,136 @@ class InterceptHandler(logging.Handler):
     )
 
 
+def _json_format(record: Record) -> str:
+  """Render a record as one JSON line (used as a loguru format function)."""
+  entry: dict[str, Any] = {
+    "time": record["time"].isoformat(),
+    "level": record["level"].name,
+    "logger": record["name"],
+    "function": record["function"],
+    "line": record["line"],
+    "message": record["message"],
+  }
+  extra = {k: v for k, v in record["extra"].items() if k != "json"}
+  if extra:
+    entry["extra"] = extra
+  if (exception := record["exception"]) is not None:
+    entry["exception"] = "".join(
+      traceback.format_exception(exception.type, exception.value, exception.traceback),
+    )
+  record["extra"]["json"] = json.dumps(entry, default=str)
+  return "{extra[json]}\n"
+
+
+class _Summary:
+  """Stand-in for a payload that renders as a short description."""
+
+  __slots__ = ("payload",)
+
+  def __init__(self, payload: object) -> None:
+    self.payload = payload
+
+  def __str__(self) -> str:
+    if _full_payloads:
+      return str(self.payload)
+    return _describe(self.payload)
+
+  def __format__(self, spec: str) -> str:
+    return format(str(self), spec)
+
+
+def _describe(payload: object) -> str:
+  kind = type(payload).__name__
+  if isinstance(payload, str | bytes):
+    return f"{kind} of {len(payload)} chars"
+  if (shape := getattr(payload, "shape", None)) is not None:
+    return f"{kind} of shape {tuple(shape)}"
+  if isinstance(payload, Mapping):
+    return f"{kind} of {len(payload)} keys"
+  if isinstance(payload, Sized) and not hasattr(payload, "model_dump"):
+    size = len(payload)
+    if size == 0:
+      return f"empty {kind}"
+    first = next(iter(payload))
+    return f"{kind} of {size} {type(first).__name__}, first: {_preview(first)}"
+  return _preview(payload)
+
+
+def _preview(value: object) -> str:
+  text = str(value)
+  if len(text) > _PREVIEW_CHARS:
+    return f"{text[:_PREVIEW_CHARS]}... ({len(text)} chars)"
+  return text
+
+
+def summarize(payload: object) -> object:
+  """Wrap a payload so log messages show its size, not its contents.
+
+  The description (type, item count, a short preview of the first item) is
+  only built if the message is emitted; IBKR_LOG_FULL_PAYLOADS=true logs
+  the full payload instead.
+  """
+  return _Summary(payload)
+
+
+class LogSampler:
+  """Let one in `every` occurrences of a hot log line through.
+
+  The first occurrence is always logged; tick() returns how many
+  occurrences the emitted line stands for, or 0 when it is suppressed.
+  """
+
+  def __init__(self, every: int | None = None) -> None:
+    """Initialize the sampler; `every` defaults to IBKR_LOG_SAMPLE_EVERY."""
+    self.every = max(1, every if every is not None else get_config().log_sample_every)
+    self._seen = 0
+    self._pending = 0
+
+  def tick(self) -> int:
+    """Count one occurrence and return the number to report (0 to skip)."""
+    self._seen += 1
+    self._pending += 1
+    if self.every > 1 and self._seen % self.every != 1:
+      return 0
+    count, self._pending = self._pending, 0
+    return count
+
+
 def setup_logging() -> Logger:
   """Set up logging configuration based on settings."""
+  global _full_payloads  # noqa: PLW0603
   config = get_config()
+  _full_payloads = config.log_full_payloads
 
-  # Remove default logger
+  # Remove default logger (and flush queued records of previous sinks)
   logger.remove()
 
   # Configure console logging
-  log_level = config.log_level
+  log_level = config.log_level.upper()
+  json_output = config.log_format.lower() == "json"
+  log_format = _json_format if json_output else None
+  sink_options: dict[str, Any] = {"level": log_level, "enqueue": config.log_enqueue}
+  if log_format is not None:
+    sink_options["format"] = log_format
 
   # Add console handler
   logger.add(
     sys.stdout,
-    level=log_level,
-    colorize=True,
+    colorize=not json_output,
+    **sink_options,
   )
 
   # Add file handler if enabled
   if config.enable_file_logging and config.log_file_path:
     logger.add(
       config.log_file_path,
-      level=log_level,
       rotation="10 MB",
       retention="7 days",
+      **sink_options,
     )
 
-  logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
+  # Records below the log level are dropped by the stdlib before they are built
+  logging.basicConfig(handlers=[InterceptHandler()], level=log_level, force=True)
 
   logging.getLogger("ib_async").setLevel(logging.CRITICAL)
   logging.getLogger("uvicorn").setLevel(config.log_level)
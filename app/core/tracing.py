@@ -0,0 +1,199 @@
+"""Optional OpenTelemetry tracing; every helper is a no-op when it is off.
+
+Tracing needs the "tracing" extra (opentelemetry-sdk) and
+IBKR_TRACING_EXPORTER set to otlp, file or console. OTLP export also
+needs opentelemetry-exporter-otlp-proto-http.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import importlib
+import inspect
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.core.config import get_config
+from app.core.setup_logging import logger
+
+if TYPE_CHECKING:
+  from collections.abc import AsyncIterator, Callable, Iterator
+
+  from opentelemetry.trace import Span, Tracer
+  from starlette.types import ASGIApp, Receive, Scope, Send
+
+_tracer: Tracer | None = None
+_provider: Any = None
+
+
+def _exporter(kind: str, config: Any) -> Any:  # noqa: ANN401
+  """Build the span exporter for IBKR_TRACING_EXPORTER."""
+  if kind == "otlp":
+    module = importlib.import_module(
+      "opentelemetry.exporter.otlp.proto.http.trace_exporter",
+    )
+    return module.OTLPSpanExporter(endpoint=config.tracing_otlp_endpoint)
+  from opentelemetry.sdk.trace.export import ConsoleSpanExporter  # noqa: PLC0415
+
+  if kind == "file":
+    # One JSON span per line, for offline analysis.
+    path = Path(config.tracing_file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    out = path.open("a", encoding="utf-8")
+    return ConsoleSpanExporter(
+      out=out,
+      formatter=lambda span: span.to_json(indent=None) + "\n",
+    )
+  return ConsoleSpanExporter()
+
+
+def setup_tracing() -> bool:
+  """Configure the tracer from the config; return True if tracing is on."""
+  global _tracer, _provider  # noqa: PLW0603
+  config = get_config()
+  kind = config.tracing_exporter.lower()
+  if kind == "none":
+    return False
+  try:
+    from opentelemetry import trace  # noqa: PLC0415
+    from opentelemetry.sdk.resources import Resource  # noqa: PLC0415
+    from opentelemetry.sdk.trace import TracerProvider  # noqa: PLC0415
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor  # noqa: PLC0415
+
+    exporter = _exporter(kind, config)
+  except ImportError as e:
+    logger.warning(
+      "Tracing disabled: {} (install ibkr-mcp-server[tracing])",
+      str(e),
+    )
+    return False
+
+  _provider = TracerProvider(
+    resource=Resource.create({"service.name": config.tracing_service_name}),
+  )
+  _provider.add_span_processor(BatchSpanProcessor(exporter))
+  trace.set_tracer_provider(_provider)
+  _tracer = trace.get_tracer("ibkr-mcp-server")
+  logger.info("Tracing enabled with the {} exporter", kind)
+  return True
+
+
+def shutdown_tracing() -> None:
+  """Flush and stop the exporter."""
+  if _provider is not None:
+    _provider.shutdown()
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: str | float | bool) -> Iterator[Span | None]:
+  """Run the block in a child span of the current one (None when off)."""
+  if _tracer is None:
+    yield None
+    return
+  with _tracer.start_as_current_span(name, attributes=attributes) as current:
+    yield current
+
+
+def set_attributes(current: Span | None, **attributes: str | float | bool) -> None:
+  """Set attributes on a span returned by span(), if tracing is on."""
+  if current is not None:
+    current.set_attributes(attributes)
+
+
+def _trace_async_gen(name: str, fn: Callable) -> Callable:
+  """Wrap an async generator so each step runs inside one span.
+
+  The span is made current only while the generator runs, never across a
+  yield, so it does not leak into the consumer's context.
+  """
+
+  @functools.wraps(fn)
+  async def wrapper(*args: Any, **kwargs: Any) -> AsyncIterator:  # noqa: ANN401
+    if _tracer is None:
+      async for item in fn(*args, **kwargs):
+        yield item
+      return
+    from opentelemetry import trace  # noqa: PLC0415
+
+    current = _tracer.start_span(name)
+    generator = fn(*args, **kwargs)
+    try:
+      while True:
+        with trace.use_span(current):
+          try:
+            item = await anext(generator)
+          except StopAsyncIteration:
+            break
+        yield item
+    finally:
+      await generator.aclose()
+      current.end()
+
+  return wrapper
+
+
+def _trace_coroutine(name: str, fn: Callable) -> Callable:
+  @functools.wraps(fn)
+  async def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+    if _tracer is None:
+      return await fn(*args, **kwargs)
+    with _tracer.start_as_current_span(name):
+      return await fn(*args, **kwargs)
+
+  return wrapper
+
+
+def trace_public_methods[T](cls: type[T]) -> type[T]:
+  """Give every public async method of cls (inherited ones included) a span.
+
+  Spans are named "<class>.<method>"; the wrappers cost one check while
+  tracing is off.
+  """
+  for name in dir(cls):
+    if name.startswith("_"):
+      continue
+    fn = getattr(cls, name)
+    span_name = f"{cls.__name__}.{name}"
+    if inspect.isasyncgenfunction(fn):
+      setattr(cls, name, _trace_async_gen(span_name, fn))
+    elif inspect.iscoroutinefunction(fn):
+      setattr(cls, name, _trace_coroutine(span_name, fn))
+  return cls
+
+
+class TracingMiddleware:
+  """Open a server span per HTTP request, named by method and route template."""
+
+  def __init__(self, app: ASGIApp) -> None:
+    """Wrap an ASGI app."""
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    """Trace one HTTP request."""
+    if scope["type"] != "http" or _tracer is None:
+      await self.app(scope, receive, send)
+      return
+    from opentelemetry import trace  # noqa: PLC0415
+
+    # Newer FastAPI releases open their own server span; nest under it instead.
+    if trace.get_current_span().is_recording():
+      await self.app(scope, receive, send)
+      return
+
+    async def send_with_status(message: dict) -> None:
+      if message["type"] == "http.response.start":
+        current.set_attribute("http.response.status_code", message["status"])
+      await send(message)
+
+    with _tracer.start_as_current_span(
+      f"{scope['method']} {scope['path']}",
+      kind=trace.SpanKind.SERVER,
+      attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+    ) as current:
+      try:
+        await self.app(scope, receive, send_with_status)
+      finally:
+        if (route := scope.get("route")) is not None:
+          current.update_name(f"{scope['method']} {route.path}")
+          current.set_attribute("http.route", route.path)
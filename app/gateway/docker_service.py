@@ -1,14 +1,22 @@
 """Docker service for the IBKR Gateway."""
 
+from __future__ import annotations
+
 import time
 import asyncio
-import docker
+import functools
 from datetime import datetime, UTC
 from ib_async import IB
-from typing import Any
+from typing import TYPE_CHECKING, Any
+from app.core.lazy import lazy_import
 from app.core.setup_logging import logger
 from app.core.config import get_config
 
+if TYPE_CHECKING:
+  import docker
+else:
+  docker = lazy_import("docker")
+
 config = get_config()
 
 VNC_PORT = 6080
@@ -39,11 +47,14 @@ docker_config = {
 
 
 class IBKRGatewayDockerService:
-  """Service for managing IBKR Gateway Docker container."""
+  """Service for managing IBKR Gateway Docker container.
+
+  The docker SDK is blocking (HTTP to the daemon; pulls and stops can take
+  minutes), so every call to it runs in a worker thread.
+  """
 
   def __init__(self) -> None:
     """Initialize the IBKR Gateway Docker service."""
-    self.client = docker.from_env()
     self.container_name = "ibkr-gateway"
     self.container: docker.models.containers.Container | None = None
     self._health_check_semaphore = asyncio.Semaphore(1)
@@ -51,22 +62,30 @@ class IBKRGatewayDockerService:
     self._health_check_interval = 2
     self._connection_timeout = 120
 
+  @functools.cached_property
+  def client(self) -> docker.DockerClient:
+    """Docker client, connected on first use rather than at import."""
+    return docker.from_env()
+
   async def start_gateway(self) -> bool:
     """Start the IBKR Gateway container."""
     try:
       # Check if container already exists
       try:
-        existing_container = self.client.containers.get(self.container_name)
+        existing_container = await asyncio.to_thread(
+          self.client.containers.get,
+          self.container_name,
+        )
         if existing_container.status == "running":
-          logger.debug(f"Container {self.container_name} is already running")
+          logger.debug("Container {} is already running", self.container_name)
           self.container = existing_container
           return True
-        existing_container.remove()
+        await asyncio.to_thread(existing_container.remove)
       except docker.errors.NotFound:
         pass
 
       # Pull the IBKR Gateway image
-      self.client.images.pull(docker_config["image"])
+      await asyncio.to_thread(self.client.images.pull, docker_config["image"])
 
       # Container configuration
       container_config = {
@@ -80,7 +99,10 @@ class IBKRGatewayDockerService:
 
       # Start the container
       logger.debug("Starting IBKR Gateway container...")
-      self.container = self.client.containers.run(**container_config)
+      self.container = await asyncio.to_thread(
+        self.client.containers.run,
+        **container_config,
+      )
 
       # Wait for container to be ready
       if not await self.wait_for_container_ready():
@@ -131,11 +153,14 @@ class IBKRGatewayDockerService:
     timer = 0
     while not await self.health_check():
       if timer > self._connection_timeout:
-        logger.error(f"IBKR Gateway not ready after {self._connection_timeout} seconds")
+        logger.error(
+          "IBKR Gateway not ready after {} seconds",
+          self._connection_timeout,
+        )
         return False
       await asyncio.sleep(2)
       timer += 2
-    logger.debug(f"IBKR Gateway container is ready after {timer} seconds")
+    logger.debug("IBKR Gateway container is ready after {} seconds", timer)
     return True
 
   async def get_container_status(self) -> dict[str, Any]:
@@ -147,7 +172,10 @@ class IBKRGatewayDockerService:
         container_info = self.container.attrs
       else:
         try:
-          container = self.client.containers.get(self.container_name)
+          container = await asyncio.to_thread(
+            self.client.containers.get,
+            self.container_name,
+          )
           container_info = container.attrs
         except docker.errors.NotFound:
           return {
@@ -202,7 +230,8 @@ class IBKRGatewayDockerService:
   async def get_container_logs(self, tail: int = 100) -> str:
     """Get the logs from the IBKR Gateway container."""
     if self.container:
-      return self.container.logs(tail=tail).decode("utf-8")
+      logs = await asyncio.to_thread(self.container.logs, tail=tail)
+      return logs.decode("utf-8")
     return "Container not found"
 
   async def stop_gateway(self, *, persist: bool = False) -> bool:
@@ -214,15 +243,21 @@ class IBKRGatewayDockerService:
     try:
       if self.container:
         logger.debug("Stopping IBKR Gateway container...")
-        self.container.stop(timeout=self._connection_timeout)
-        self.container.remove()
+        await asyncio.to_thread(
+          self.container.stop,
+          timeout=self._connection_timeout,
+        )
+        await asyncio.to_thread(self.container.remove)
         self.container = None
         logger.debug("IBKR Gateway container stopped and removed")
         return True
       try:
-        container = self.client.containers.get(self.container_name)
-        container.stop(timeout=self._connection_timeout)
-        container.remove()
+        container = await asyncio.to_thread(
+          self.client.containers.get,
+          self.container_name,
+        )
+        await asyncio.to_thread(container.stop, timeout=self._connection_timeout)
+        await asyncio.to_thread(container.remove)
         logger.debug("IBKR Gateway container stopped and removed")
       except docker.errors.NotFound:
         logger.debug("No IBKR Gateway container found to stop")
@@ -236,7 +271,8 @@ class IBKRGatewayDockerService:
   def __del__(self) -> None:
     """Cleanup when the service is destroyed."""
     try:
-      if hasattr(self, "client"):
+      # Only close a client that was created; the property would connect
+      if "client" in self.__dict__:
         self.client.close()
     except Exception:
       logger.exception("Failed to cleanup IBKR Gateway Docker service")
@@ -128,7 +128,7 @@ class IBKRGatewayManager:
     try:
       container_status = await self.docker_service.get_container_status()
     except Exception as e:
-      logger.error(f"Failed to get gateway status: {e}")
+      logger.error("Failed to get gateway status: {}", e)
       return {
         "is_running": False,
         "mode": "internal",
@@ -163,11 +163,12 @@ class IBKRGatewayManager:
         not self.is_external
         and hasattr(self, "docker_service")
         and self.docker_service
-        and hasattr(self.docker_service, "client")
+        # client is created lazily; don't connect to the daemon just to close it
+        and "client" in self.docker_service.__dict__
       ):
         self.docker_service.client.close()
     except Exception as e:
-      logger.error(f"Error during cleanup: {e}")
+      logger.error("Error during cleanup: {}", e)
     finally:
       self.is_running = False
 
@@ -1,16 +1,23 @@
 """Main module for the IBKR MCP Server."""
 
-from fastapi import FastAPI, Depends
+import asyncio
+import contextlib
+
+from fastapi import FastAPI, Depends, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_mcp import FastApiMCP
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from app.api import gateway
-from app.api.ibkr import ibkr_router
+from app.api import admin, gateway
+from app.api.ibkr import get_ib_interface, ibkr_router, job_manager
 from app.core.config import get_config
+from app.core.executor import get_executor
 from app.core.auth import auth_dependency
+from app.core.metrics import HTTPMetricsMiddleware, latest
+from app.core.request_stats import RequestStatsMiddleware
 from app.core.setup_logging import logger
+from app.core.tracing import TracingMiddleware, setup_tracing, shutdown_tracing
 
 
 @asynccontextmanager
@@ -18,6 +25,9 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
   """Lifespan events for the application."""
   logger.info("Starting IBKR MCP Server...")
 
+  # Shared IB interface; created here so importing the app stays cheap
+  ib_interface = get_ib_interface()
+
   # Only start internal gateway during startup, external gateway is handled on-demand
   if not gateway.gateway_manager.is_external:
     try:
@@ -27,12 +37,33 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     except Exception:
       logger.exception("Error starting internal IBKR Gateway.")
   else:
-    logger.info("External gateway mode - connection will be established on-demand")
+    logger.info("External gateway mode - connecting to the running gateway")
+
+  # Connect, warm caches and run the configured warmup in the background;
+  # /ready reports when done, /gateway/status shows the warmup progress
+  ready_task = asyncio.create_task(ib_interface.keep_ready())
+
+  # Keep off-hours price snapshots for the watchlist cached
+  prefetch_task = None
+  if watchlist := config.get_price_watchlist():
+    prefetch_task = asyncio.create_task(
+      ib_interface.prefetch_closed_prices(watchlist),
+    )
+
+  admin.loop_monitor.start()
 
   yield
 
   # Shutdown
   logger.info("Shutting down IBKR MCP Server...")
+  await admin.loop_monitor.stop()
+  for task in (ready_task, prefetch_task):
+    if task is not None:
+      task.cancel()
+      with contextlib.suppress(asyncio.CancelledError):
+        await task
+  await job_manager.stop()
+  get_executor().shutdown()
 
   # Cleanup gateway
   try:
@@ -40,6 +71,9 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
   except Exception:
     logger.exception("Error during cleanup.")
 
+  shutdown_tracing()
+  await logger.complete()
+
 
 config = get_config()
 
@@ -55,7 +89,7 @@ app = FastAPI(
 )
 
 # Add CORS middleware
-logger.debug(f"CORS allowed origins: {config.get_cors_origins_list()}")
+logger.debug("CORS allowed origins: {}", config.get_cors_origins_list())
 app.add_middleware(
   CORSMiddleware,
   allow_origins=config.get_cors_origins_list(),
@@ -64,9 +98,20 @@ app.add_middleware(
   allow_headers=["*"],
 )
 
+# Per-route HTTP latency for /metrics
+app.add_middleware(HTTPMetricsMiddleware)
+
+# Access log line with the IB and cache breakdown, kept for /admin/requests
+app.add_middleware(RequestStatsMiddleware, request_log=admin.request_log)
+
+# Server span per request, parent of the service and IB call spans
+if setup_tracing():
+  app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(gateway.router)
 app.include_router(ibkr_router)
+app.include_router(admin.router)
 
 
 @app.get("/")
@@ -85,10 +130,36 @@ def health() -> dict:
   return {"status": "ok"}
 
 
-# MCP server, attached to the FastAPI app, excludes the gateway router
+@app.get("/ready", include_in_schema=False)
+def ready() -> JSONResponse:
+  """Readiness check — IB session connected and caches warm, from memory only.
+
+  Answers 503 until every check passes, so traffic only reaches servers
+  whose requests will not wait for the IB connect.
+  """
+  checks = get_ib_interface().readiness_checks()
+  is_ready = all(checks.values())
+  return JSONResponse(
+    {"status": "ready" if is_ready else "not ready", "checks": checks},
+    status_code=200 if is_ready else 503,
+  )
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+  """Prometheus metrics: IB round trips, pacing, caches, subscriptions, HTTP."""
+  content, media_type = latest()
+  return Response(content=content, media_type=media_type)
+
+
+# MCP server, attached to the FastAPI app, excludes the gateway and admin
+# routers and streaming endpoints (MCP tools need a single response body)
 if config.enable_mcp:
+  # Imported only when enabled: fastapi_mcp and the MCP SDK add ~1 s to startup
+  from fastapi_mcp import FastApiMCP
+
   mcp = FastApiMCP(
     app,
-    exclude_tags=["gateway"],
+    exclude_tags=["gateway", "admin", "streaming"],
   )
   mcp.mount()
@@ -1,8 +1,18 @@
 """Models package."""
 
-from .history import HistoricalBar, PriceSnapshot
-from .ticker import TickerData, GreeksData
+from .account import AccountPnL, AccountSummaryValue, PortfolioPosition
+from .combo import (
+  ComboLegQuote,
+  ComboLegRequest,
+  ComboNativeQuote,
+  ComboQuote,
+  ComboRequest,
+)
+from .history import BulkHistoryRequest, BulkHistoryResult, HistoricalBar, PriceSnapshot
+from .ticker import TickerData, GreeksData, OptionsChainSnapshot
 from .scanner import ScannerFilter, ScannerRequest
+from .jobs import JobInfo, JobResults, JobSubmitRequest
+from .risk import PortfolioRisk, RiskExposure
 from .options import (
   OptionsRequest,
   OptionsFilters,
@@ -13,15 +23,31 @@ from .options import (
 )
 
 __all__ = [
+  "AccountPnL",
+  "AccountSummaryValue",
+  "BulkHistoryRequest",
+  "BulkHistoryResult",
+  "ComboLegQuote",
+  "ComboLegRequest",
+  "ComboNativeQuote",
+  "ComboQuote",
+  "ComboRequest",
   "ContractDetailsRequest",
   "ContractOptions",
   "GreeksData",
   "HistoricalBar",
+  "JobInfo",
+  "JobResults",
+  "JobSubmitRequest",
   "OptionsChainRequest",
+  "OptionsChainSnapshot",
   "OptionsCriteria",
   "OptionsFilters",
   "OptionsRequest",
+  "PortfolioPosition",
+  "PortfolioRisk",
   "PriceSnapshot",
+  "RiskExposure",
   "ScannerFilter",
   "ScannerRequest",
   "TickerData",
@@ -0,0 +1,37 @@
+"""Pydantic models for portfolio, PnL and account summary data."""
+
+from pydantic import BaseModel, Field
+
+
+class PortfolioPosition(BaseModel):
+  """Position with market value and PnL as reported by IB."""
+
+  contractId: int = Field(..., description="Contract ID")
+  symbol: str = Field(..., description="Contract local symbol")
+  secType: str = Field(..., description="Security type")
+  position: float = Field(..., description="Position size")
+  marketPrice: float | None = Field(None, description="Mark price")
+  marketValue: float | None = Field(None, description="Market value")
+  averageCost: float | None = Field(
+    None,
+    description="Average cost per contract (including multiplier)",
+  )
+  unrealizedPnL: float | None = Field(None, description="Unrealized PnL")
+  realizedPnL: float | None = Field(None, description="Realized PnL")
+  dailyPnL: float | None = Field(None, description="PnL since the last close")
+
+
+class AccountPnL(BaseModel):
+  """Account-level PnL."""
+
+  dailyPnL: float | None = Field(None, description="PnL since the last close")
+  unrealizedPnL: float | None = Field(None, description="Unrealized PnL")
+  realizedPnL: float | None = Field(None, description="Realized PnL")
+
+
+class AccountSummaryValue(BaseModel):
+  """One account summary value (e.g. NetLiquidation)."""
+
+  tag: str = Field(..., description="Summary tag")
+  value: str = Field(..., description="Value as reported by IB")
+  currency: str = Field("", description="Currency of the value, if any")
@@ -0,0 +1,75 @@
+"""Pydantic models for combo (BAG) pricing."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from .ticker import GreeksData
+
+
+class ComboLegRequest(BaseModel):
+  """One leg of a combo."""
+
+  contract_id: int = Field(..., description="Contract ID of the leg")
+  action: Literal["BUY", "SELL"] = Field(..., description="BUY or SELL")
+  ratio: int = Field(default=1, ge=1, description="Leg ratio")
+
+
+class ComboRequest(BaseModel):
+  """Request model for the combo quote endpoint."""
+
+  legs: list[ComboLegRequest] = Field(
+    ...,
+    min_length=1,
+    description="Combo legs; at least one",
+  )
+  exchange: str = Field(default="SMART", description="Exchange for the combo")
+  native_quote: bool = Field(
+    default=False,
+    description="Also subscribe to IB's own quote for the BAG contract",
+  )
+
+
+class ComboLegQuote(BaseModel):
+  """Quote and greeks of one combo leg."""
+
+  contractId: int = Field(..., description="Contract ID")
+  symbol: str = Field(..., description="Contract local symbol")
+  action: str = Field(..., description="BUY or SELL")
+  ratio: int = Field(..., description="Leg ratio")
+  bid: float | None = Field(None, description="Bid price")
+  ask: float | None = Field(None, description="Ask price")
+  last: float | None = Field(None, description="Last price")
+  greeks: GreeksData | None = Field(None, description="Model greeks for options")
+
+
+class ComboNativeQuote(BaseModel):
+  """IB's quote for the BAG contract itself."""
+
+  bid: float | None = Field(None, description="Combo bid")
+  ask: float | None = Field(None, description="Combo ask")
+  last: float | None = Field(None, description="Combo last")
+
+
+class ComboQuote(BaseModel):
+  """Net price and greeks of a combo, per one unit of the combo."""
+
+  timestamp: str = Field(..., description="Quote time (UTC ISO-8601)")
+  legs: list[ComboLegQuote] = Field(..., description="Per-leg quotes")
+  bid: float | None = Field(
+    None,
+    description="Net bid: what selling the combo at leg quotes earns",
+  )
+  ask: float | None = Field(
+    None,
+    description="Net ask: what buying the combo at leg quotes costs",
+  )
+  mid: float | None = Field(None, description="Midpoint of net bid and ask")
+  greeks: GreeksData | None = Field(
+    None,
+    description="Ratio- and action-weighted net greeks (no impliedVol)",
+  )
+  native: ComboNativeQuote | None = Field(
+    None,
+    description="IB's own BAG quote, when native_quote was requested",
+  )
@@ -1,5 +1,8 @@
 """Pydantic models for current price and historical bar data."""
 
+import datetime as dt
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -30,3 +33,45 @@ class HistoricalBar(BaseModel):
     None,
     description="Volume (null for indices and instruments that report no volume)",
   )
+
+
+class BulkHistoryRequest(BaseModel):
+  """Request model for the bulk historical bars endpoint."""
+
+  symbols: list[str] = Field(..., min_length=1, description="Ticker symbols")
+  sec_type: str = Field("STK", description="Security type shared by all symbols")
+  exchange: str = Field("SMART", description="Exchange shared by all symbols")
+  currency: str = Field("USD", description="Currency")
+  freq: str = Field("1d", description="Bar frequency, as for /ibkr/historical")
+  from_date: dt.date = Field(..., description="Start date inclusive (YYYY-MM-DD)")
+  to_date: dt.date | None = Field(
+    None,
+    description="End date inclusive (YYYY-MM-DD). Defaults to today.",
+  )
+  use_rth: bool = Field(default=True, description="Regular trading hours only")
+  save: bool = Field(
+    default=False,
+    description="Write each symbol's bars to the server's history output "
+    "directory instead of returning them inline",
+  )
+  file_format: Literal["csv", "parquet"] = Field(
+    "csv",
+    description="File format when save is true (parquet needs pyarrow)",
+  )
+
+
+class BulkHistoryResult(BaseModel):
+  """Outcome for one symbol of a bulk historical download."""
+
+  symbol: str = Field(..., description="Ticker symbol")
+  conId: int | None = Field(None, description="Contract ID, if qualified")
+  count: int = Field(0, description="Number of bars")
+  completed: int = Field(0, description="Symbols finished so far, including this")
+  total: int = Field(0, description="Symbols in the request")
+  path: str | None = Field(None, description="File the bars were written to")
+  bars: dict[str, list] | None = Field(
+    None,
+    description="Bars as parallel arrays (timestamp, open, high, low, close, "
+    "volume) when not saved to a file",
+  )
+  error: str | None = Field(None, description="Why this symbol failed")
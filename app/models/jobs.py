@@ -0,0 +1,52 @@
+"""Pydantic models for background jobs."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+JobKind = Literal[
+  "filtered_options",
+  "options_chain_snapshot",
+  "historical_bulk",
+  "scanner",
+]
+
+
+class JobSubmitRequest(BaseModel):
+  """Request model for submitting a background job."""
+
+  kind: JobKind = Field(..., description="Operation to run")
+  params: dict = Field(
+    ...,
+    description="Request body of the matching endpoint: OptionsRequest for "
+    "filtered_options, OptionsChainRequest for options_chain_snapshot, "
+    "BulkHistoryRequest for historical_bulk, ScannerRequest for scanner",
+  )
+  priority: int = Field(default=0, description="Higher runs first")
+
+
+class JobInfo(BaseModel):
+  """Status of a background job."""
+
+  id: str = Field(..., description="Job ID")
+  kind: str = Field(..., description="Operation")
+  status: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+  priority: int = Field(..., description="Scheduling priority (higher runs first)")
+  created_at: str = Field(..., description="Submission time (UTC ISO-8601)")
+  started_at: str | None = Field(None, description="Start time (UTC ISO-8601)")
+  finished_at: str | None = Field(None, description="End time (UTC ISO-8601)")
+  result_count: int = Field(0, description="Result items produced so far")
+  batches: int = Field(0, description="Result batches produced so far")
+  error: str | None = Field(None, description="Failure reason")
+  deduplicated: bool = Field(
+    default=False,
+    description="True if an identical active job was returned on submit",
+  )
+
+
+class JobResults(JobInfo):
+  """Job status with a page of its (possibly partial) results."""
+
+  offset: int = Field(0, description="Index of the first returned result")
+  next_offset: int = Field(0, description="Offset to poll for newer results")
+  results: list[dict] = Field(default_factory=list, description="Result items")
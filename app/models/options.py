@@ -1,6 +1,8 @@
 """Pydantic models for options and contract requests."""
 
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Self
+
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 
 class OptionsFilters(BaseModel):
@@ -8,9 +10,10 @@ class OptionsFilters(BaseModel):
 
   model_config = ConfigDict(populate_by_name=True)
 
-  expirations: list[str] = Field(
-    ...,
-    description="List of expiration dates in YYYYMMDD format (required)",
+  expirations: list[str] | None = Field(
+    default=None,
+    description="List of expiration dates in YYYYMMDD format "
+    "(required unless min_dte or max_dte is given)",
   )
   trading_class: list[str] | None = Field(
     default=None,
@@ -25,6 +28,50 @@ class OptionsFilters(BaseModel):
     default=None,
     description="List of rights to filter by (C for calls, P for puts)",
   )
+  min_dte: int | None = Field(
+    default=None,
+    ge=0,
+    description="Minimum days to expiration, used when expirations is not given",
+  )
+  max_dte: int | None = Field(
+    default=None,
+    ge=0,
+    description="Maximum days to expiration, used when expirations is not given",
+  )
+  strike_range_pct: float | None = Field(
+    default=None,
+    gt=0,
+    description="Keep strikes within this fraction of spot (0.1 for ±10%), "
+    "used when strikes is not given",
+  )
+  nearest_strikes: int | None = Field(
+    default=None,
+    ge=1,
+    description="Keep only the N strikes closest to spot (at-the-money)",
+  )
+  max_contracts: int | None = Field(
+    default=None,
+    ge=1,
+    description="Cap on contracts to qualify, nearest to the money and expiry first",
+  )
+  underlying_price: float | None = Field(
+    default=None,
+    gt=0,
+    description="Spot price for moneyness filters; fetched from IB when omitted",
+  )
+
+  @model_validator(mode="after")
+  def validate_expiration_filter(self) -> Self:
+    """Require explicit expirations or a days-to-expiration range."""
+    if self.expirations is None and self.min_dte is None and self.max_dte is None:
+      raise ValueError("Specify expirations or a min_dte/max_dte range")
+    if (
+      self.min_dte is not None
+      and self.max_dte is not None
+      and self.min_dte > self.max_dte
+    ):
+      raise ValueError("min_dte must not be greater than max_dte")
+    return self
 
 
 class OptionsCriteria(BaseModel):
@@ -0,0 +1,53 @@
+"""Pydantic models for portfolio risk."""
+
+from pydantic import BaseModel, Field
+
+
+class RiskExposure(BaseModel):
+  """Greeks and scenario PnL summed over one underlying (or the portfolio)."""
+
+  underlying: str | None = Field(
+    None,
+    description="Underlying symbol; null for the portfolio total",
+  )
+  legs: int = Field(..., description="Number of contracts held")
+  spot: float | None = Field(None, description="Underlying price used")
+  delta: float | None = Field(
+    None,
+    description="Delta in underlying units (null for the portfolio total)",
+  )
+  gamma: float | None = Field(
+    None,
+    description="Gamma in underlying units per 1.0 move (null for the total)",
+  )
+  vega: float = Field(..., description="PnL per one vol point rise")
+  theta: float = Field(..., description="PnL per day of time decay")
+  dollarDelta: float = Field(..., description="Delta times spot")
+  dollarGamma: float = Field(
+    ...,
+    description="Change in dollar delta for a 1% move of the underlying",
+  )
+  scenarioPnL: list[list[float]] = Field(
+    ...,
+    description="PnL per [spot shock][vol shock] (delta-gamma-vega estimate)",
+  )
+
+
+class PortfolioRisk(BaseModel):
+  """Portfolio greeks per underlying and in total, with a scenario grid."""
+
+  timestamp: str = Field(..., description="Computation time (UTC ISO-8601)")
+  spotShocks: list[float] = Field(..., description="Relative spot moves (rows)")
+  volShocks: list[float] = Field(
+    ...,
+    description="Absolute implied volatility moves (columns)",
+  )
+  total: RiskExposure = Field(..., description="Whole-portfolio exposure")
+  underlyings: list[RiskExposure] = Field(
+    default_factory=list,
+    description="Exposure per underlying symbol",
+  )
+  missing: list[int] = Field(
+    default_factory=list,
+    description="Contract IDs left out for lack of greeks or a price",
+  )
@@ -23,3 +23,32 @@ class TickerData(BaseModel):
   bid: float | None = Field(None, description="Bid price")
   ask: float | None = Field(None, description="Ask price")
   greeks: GreeksData | None = Field(None, description="Greeks data for options")
+
+
+class OptionsChainSnapshot(BaseModel):
+  """Priced options chain in columnar form; row i of every list is one contract."""
+
+  underlying_con_id: int = Field(..., description="Contract ID of the underlying")
+  underlying_price: float | None = Field(
+    None,
+    description="Underlying spot used for moneyness filters, if any",
+  )
+  timestamp: str = Field(..., description="Snapshot time (UTC ISO-8601)")
+  count: int = Field(..., description="Number of contracts in the snapshot")
+  contractId: list[int] = Field(default_factory=list, description="Contract IDs")
+  symbol: list[str] = Field(default_factory=list, description="Local symbols")
+  tradingClass: list[str] = Field(default_factory=list, description="Trading classes")
+  expiration: list[str] = Field(default_factory=list, description="YYYYMMDD")
+  strike: list[float] = Field(default_factory=list, description="Strike prices")
+  right: list[str] = Field(default_factory=list, description="C or P")
+  bid: list[float | None] = Field(default_factory=list, description="Bid prices")
+  ask: list[float | None] = Field(default_factory=list, description="Ask prices")
+  last: list[float | None] = Field(default_factory=list, description="Last prices")
+  delta: list[float | None] = Field(default_factory=list, description="Model delta")
+  gamma: list[float | None] = Field(default_factory=list, description="Model gamma")
+  vega: list[float | None] = Field(default_factory=list, description="Model vega")
+  theta: list[float | None] = Field(default_factory=list, description="Model theta")
+  impliedVol: list[float | None] = Field(
+    default_factory=list,
+    description="Model implied volatility",
+  )
@@ -0,0 +1,158 @@
+"""In-memory mirror of positions, portfolio, PnL and account summary."""
+
+import math
+
+from ib_async.contract import Contract
+from ib_async.objects import AccountValue, PnL, PnLSingle, PortfolioItem, Position
+
+from app.core.setup_logging import logger
+from app.models.account import AccountPnL, AccountSummaryValue, PortfolioPosition
+
+# Mirror entries are keyed by (account, conId).
+PositionKey = tuple[str, int]
+
+
+def _number(v: float) -> float | None:
+  """Return v, or None for IB's NaN / unset sentinels."""
+  return None if v is None or math.isnan(v) or abs(v) >= 1e300 else v
+
+
+def _position_row(position: Position) -> dict:
+  """Shape a Position like the /positions response (avgCost per unit)."""
+  contract = position.contract
+  try:
+    avg_cost = position.avgCost / float(contract.multiplier or 1)
+  except (ValueError, TypeError, ZeroDivisionError):
+    logger.warning("Invalid multiplier {}, using 1", contract.localSymbol)
+    avg_cost = position.avgCost
+  return {
+    "contract": contract.localSymbol,
+    "position": position.position,
+    "avgCost": avg_cost,
+    "contractId": contract.conId,
+  }
+
+
+class AccountMirror:
+  """Account state kept current by IB events, read without IB round-trips.
+
+  The on_* handlers are subscribed to the IB events; response rows are built
+  when an update arrives so reads only copy prebuilt values. Account IDs are
+  used as keys but never returned.
+  """
+
+  def __init__(self) -> None:
+    """Initialize an empty mirror."""
+    self.synced = False
+    self._positions: dict[PositionKey, dict] = {}
+    self._holdings: dict[PositionKey, Position] = {}
+    self._portfolio: dict[PositionKey, PortfolioItem] = {}
+    self._pnl_single: dict[PositionKey, PnLSingle] = {}
+    self._portfolio_rows: dict[PositionKey, PortfolioPosition] = {}
+    self._pnl: dict[str, AccountPnL] = {}
+    self._summary: dict[tuple[str, str, str], AccountSummaryValue] = {}
+
+  def clear(self) -> None:
+    """Forget all state (e.g. after a disconnect)."""
+    self.synced = False
+    for store in (
+      self._positions,
+      self._holdings,
+      self._portfolio,
+      self._pnl_single,
+      self._portfolio_rows,
+      self._pnl,
+      self._summary,
+    ):
+      store.clear()
+
+  def positions(self) -> list[dict]:
+    """Return position rows (contract, position, avgCost, contractId)."""
+    return [dict(row) for row in self._positions.values()]
+
+  def portfolio(self) -> list[PortfolioPosition]:
+    """Return portfolio positions with market value and PnL."""
+    return list(self._portfolio_rows.values())
+
+  def pnl(self) -> list[AccountPnL]:
+    """Return account-level PnL, one entry per account."""
+    return list(self._pnl.values())
+
+  def account_summary(self) -> list[AccountSummaryValue]:
+    """Return account summary values."""
+    return list(self._summary.values())
+
+  def position_keys(self) -> list[PositionKey]:
+    """Return the (account, conId) of every open position."""
+    return list(self._positions)
+
+  def holdings(self) -> dict[int, tuple[Contract, float]]:
+    """Return {conId: (contract, position)} netted across accounts."""
+    held: dict[int, tuple[Contract, float]] = {}
+    for (_, con_id), position in self._holdings.items():
+      _, size = held.get(con_id, (None, 0.0))
+      held[con_id] = (position.contract, size + position.position)
+    return {con_id: entry for con_id, entry in held.items() if entry[1] != 0}
+
+  def has_position(self, key: PositionKey) -> bool:
+    """Return True if (account, conId) is an open position."""
+    return key in self._positions
+
+  def on_position(self, position: Position) -> None:
+    """Handle positionEvent; closed positions are dropped."""
+    key = (position.account, position.contract.conId)
+    if position.position == 0:
+      self._positions.pop(key, None)
+      self._holdings.pop(key, None)
+    else:
+      self._positions[key] = _position_row(position)
+      self._holdings[key] = position
+
+  def on_portfolio(self, item: PortfolioItem) -> None:
+    """Handle updatePortfolioEvent; closed positions are dropped."""
+    key = (item.account, item.contract.conId)
+    if item.position == 0:
+      self._portfolio.pop(key, None)
+      self._portfolio_rows.pop(key, None)
+      return
+    self._portfolio[key] = item
+    self._update_portfolio_row(key)
+
+  def on_pnl(self, pnl: PnL) -> None:
+    """Handle pnlEvent."""
+    self._pnl[pnl.account] = AccountPnL(
+      dailyPnL=_number(pnl.dailyPnL),
+      unrealizedPnL=_number(pnl.unrealizedPnL),
+      realizedPnL=_number(pnl.realizedPnL),
+    )
+
+  def on_pnl_single(self, pnl: PnLSingle) -> None:
+    """Handle pnlSingleEvent."""
+    key = (pnl.account, pnl.conId)
+    self._pnl_single[key] = pnl
+    if key in self._portfolio:
+      self._update_portfolio_row(key)
+
+  def on_account_summary(self, value: AccountValue) -> None:
+    """Handle accountSummaryEvent."""
+    self._summary[(value.account, value.tag, value.currency)] = AccountSummaryValue(
+      tag=value.tag,
+      value=value.value,
+      currency=value.currency,
+    )
+
+  def _update_portfolio_row(self, key: PositionKey) -> None:
+    item = self._portfolio[key]
+    pnl = self._pnl_single.get(key)
+    self._portfolio_rows[key] = PortfolioPosition(
+      contractId=item.contract.conId,
+      symbol=item.contract.localSymbol,
+      secType=item.contract.secType,
+      position=item.position,
+      marketPrice=_number(item.marketPrice),
+      marketValue=_number(item.marketValue),
+      averageCost=_number(item.averageCost),
+      unrealizedPnL=_number(item.unrealizedPNL),
+      realizedPnL=_number(item.realizedPNL),
+      dailyPnL=_number(pnl.dailyPnL) if pnl is not None else None,
+    )
@@ -0,0 +1,110 @@
+"""Live bar subscriptions shared by all listeners."""
+
+import asyncio
+from dataclasses import dataclass, field
+
+from ib_async.objects import BarData, BarDataList, RealTimeBar, RealTimeBarList
+
+from app.core.setup_logging import LogSampler, logger
+from app.models.history import HistoricalBar
+
+# Key of a live subscription: (conId, IB bar size, whatToShow, useRTH).
+BarStreamKey = tuple[int, str, str, bool]
+
+# Updates buffered per listener before the oldest are dropped.
+_LISTENER_QUEUE_SIZE = 1000
+
+
+def live_bar_to_model(bar: BarData | RealTimeBar) -> HistoricalBar:
+  """Convert a keepUpToDate BarData or a 5-second RealTimeBar to a model."""
+  if isinstance(bar, RealTimeBar):
+    timestamp, open_ = bar.time, bar.open_
+  else:
+    timestamp, open_ = bar.date, bar.open
+  return HistoricalBar(
+    timestamp=timestamp.isoformat(),
+    open=open_,
+    high=bar.high,
+    low=bar.low,
+    close=bar.close,
+    volume=int(bar.volume) if bar.volume > 0 else None,
+  )
+
+
+@dataclass(eq=False)
+class BarStream:
+  """One IB live bar subscription fanned out to any number of listeners.
+
+  `bars` is the list ib_async keeps up to date; it doubles as the local bar
+  cache for the subscription's window.
+  """
+
+  key: BarStreamKey
+  bars: BarDataList | RealTimeBarList
+  listeners: set[asyncio.Queue[list[HistoricalBar] | None]] = field(
+    default_factory=set,
+  )
+  idle_handle: asyncio.TimerHandle | None = None
+  # Pinned (warmup) subscriptions stay open without listeners until disconnect
+  pinned: bool = False
+  # Lagging listeners drop a bar per update; log a sample of them
+  lag_log: LogSampler = field(default_factory=LogSampler)
+
+  def __post_init__(self) -> None:
+    """Forward IB updates to the listeners."""
+    self.bars.updateEvent += self._on_update
+
+  def listen(self) -> asyncio.Queue[list[HistoricalBar] | None]:
+    """Register a listener and return its update queue.
+
+    A None item on the queue means the subscription ended.
+    """
+    if self.idle_handle is not None:
+      self.idle_handle.cancel()
+      self.idle_handle = None
+    queue: asyncio.Queue[list[HistoricalBar] | None] = asyncio.Queue(
+      _LISTENER_QUEUE_SIZE,
+    )
+    self.listeners.add(queue)
+    return queue
+
+  def unlisten(self, queue: asyncio.Queue[list[HistoricalBar] | None]) -> None:
+    """Remove a listener."""
+    self.listeners.discard(queue)
+
+  def snapshot(self) -> list[HistoricalBar]:
+    """Return every bar currently held by the subscription."""
+    return [live_bar_to_model(bar) for bar in self.bars]
+
+  def _on_update(self, bars: BarDataList | RealTimeBarList, has_new_bar: bool) -> None:
+    """Push the latest bar (and the one it completed, if any) to listeners.
+
+    keepUpToDate subscriptions also fire while the current bar is still
+    forming; real-time bar lists only fire when a bar is appended.
+    """
+    if not bars:
+      return
+    update = [live_bar_to_model(bars[-1])]
+    if has_new_bar and len(bars) > 1 and isinstance(bars, BarDataList):
+      update.insert(0, live_bar_to_model(bars[-2]))
+    for queue in self.listeners:
+      if queue.full():
+        queue.get_nowait()
+        if dropped := self.lag_log.tick():
+          logger.warning(
+            "Live bar listener for {} is lagging, dropped {} updates",
+            self.key,
+            dropped,
+          )
+      queue.put_nowait(update)
+
+  def close(self) -> None:
+    """Detach from IB updates and tell listeners the subscription ended."""
+    self.bars.updateEvent -= self._on_update
+    for queue in self.listeners:
+      if queue.full():
+        queue.get_nowait()
+      queue.put_nowait(None)
+    if self.idle_handle is not None:
+      self.idle_handle.cancel()
+      self.idle_handle = None
@@ -0,0 +1,140 @@
+"""Columnar OHLCV bar container."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+from .resample import bars_to_frame
+from app.core.lazy import lazy_import
+from app.models.history import HistoricalBar
+
+if TYPE_CHECKING:
+  from pathlib import Path
+
+  import numpy as np
+  import pandas as pd
+  from ib_async.objects import BarData
+else:
+  np = lazy_import("numpy")
+  pd = lazy_import("pandas")
+
+BarFileFormat = Literal["csv", "parquet"]
+
+
+def _iso_timestamps(values: pd.Series) -> np.ndarray:
+  """Format bar timestamps as ISO-8601 strings without per-bar Python objects.
+
+  Intraday columns are datetime64 (tz-aware for IB bars) and are formatted
+  in one vectorized pass; daily and coarser bars hold dt.date objects.
+  """
+  if isinstance(values.dtype, pd.DatetimeTZDtype):
+    text = values.dt.strftime("%Y-%m-%dT%H:%M:%S%z")
+    # strftime emits +HHMM; isoformat (and the per-bar path) uses +HH:MM.
+    return (text.str[:-2] + ":" + text.str[-2:]).to_numpy(dtype=object)
+  if pd.api.types.is_datetime64_any_dtype(values.dtype):
+    return values.dt.strftime("%Y-%m-%dT%H:%M:%S").to_numpy(dtype=object)
+  return np.array([v.isoformat() for v in values], dtype=object)
+
+
+@dataclass(frozen=True, eq=False)
+class BarSeries:
+  """OHLCV bars as parallel NumPy arrays, ordered oldest-first.
+
+  `timestamp` holds ISO-8601 strings (local exchange TZ for intraday bars,
+  YYYY-MM-DD for daily and coarser); `volume` is NaN where IB reports none.
+  """
+
+  timestamp: np.ndarray
+  open: np.ndarray
+  high: np.ndarray
+  low: np.ndarray
+  close: np.ndarray
+  volume: np.ndarray
+
+  @classmethod
+  def from_frame(cls, frame: pd.DataFrame) -> BarSeries:
+    """Build a series from a bar DataFrame (see resample.BAR_COLUMNS)."""
+    return cls(
+      timestamp=_iso_timestamps(frame["timestamp"]),
+      open=frame["open"].to_numpy(dtype=float),
+      high=frame["high"].to_numpy(dtype=float),
+      low=frame["low"].to_numpy(dtype=float),
+      close=frame["close"].to_numpy(dtype=float),
+      volume=frame["volume"].to_numpy(dtype=float),
+    )
+
+  @classmethod
+  def from_bars(cls, bars: list[BarData]) -> BarSeries:
+    """Build a series from ib_async bars."""
+    return cls.from_frame(bars_to_frame(bars))
+
+  def __len__(self) -> int:
+    """Return the number of bars."""
+    return len(self.timestamp)
+
+  def _volumes(self) -> list[int | None]:
+    """Return volumes as ints, None where missing."""
+    return [None if np.isnan(v) else int(v) for v in self.volume.tolist()]
+
+  def to_frame(self) -> pd.DataFrame:
+    """Return the bars as a DataFrame with a nullable integer volume column."""
+    return pd.DataFrame(
+      {
+        "timestamp": self.timestamp,
+        "open": self.open,
+        "high": self.high,
+        "low": self.low,
+        "close": self.close,
+        "volume": pd.array(self._volumes(), dtype="Int64"),
+      },
+    )
+
+  def to_models(self) -> list[HistoricalBar]:
+    """Return one HistoricalBar per bar (for small responses)."""
+    return [
+      HistoricalBar(timestamp=t, open=o, high=h, low=lo, close=c, volume=v)
+      for t, o, h, lo, c, v in zip(
+        self.timestamp.tolist(),
+        self.open.tolist(),
+        self.high.tolist(),
+        self.low.tolist(),
+        self.close.tolist(),
+        self._volumes(),
+        strict=True,
+      )
+    ]
+
+  def to_columns(self) -> dict[str, list]:
+    """Return {"timestamp": [...], "open": [...], ...} parallel lists."""
+    return {
+      "timestamp": self.timestamp.tolist(),
+      "open": self.open.tolist(),
+      "high": self.high.tolist(),
+      "low": self.low.tolist(),
+      "close": self.close.tolist(),
+      "volume": self._volumes(),
+    }
+
+  def to_records_json(self) -> str:
+    """Encode the bars as a JSON array of HistoricalBar-shaped objects."""
+    return self.to_frame().to_json(orient="records", double_precision=15)
+
+  def to_columns_json(self) -> str:
+    """Encode the bars as a JSON object of parallel arrays plus a count."""
+    return json.dumps(
+      {"count": len(self), **self.to_columns()},
+      separators=(",", ":"),
+    )
+
+  def to_csv(self) -> str:
+    """Encode the bars as CSV with a header row."""
+    return self.to_frame().to_csv(index=False)
+
+  def write(self, path: Path, file_format: BarFileFormat = "csv") -> None:
+    """Write the bars to a CSV or Parquet file (Parquet needs pyarrow)."""
+    if file_format == "parquet":
+      self.to_frame().to_parquet(path, index=False)
+    else:
+      self.to_frame().to_csv(path, index=False)
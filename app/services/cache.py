@@ -0,0 +1,81 @@
+"""In-memory TTL cache used by the service clients."""
+
+import time
+from collections import OrderedDict
+
+from app.core.metrics import CACHE_ENTRIES, CACHE_REQUESTS
+from app.core.request_stats import record_cache
+
+
+class TTLCache[K, V]:
+  """Small LRU cache whose entries expire after a time-to-live.
+
+  Hit and miss counts are kept so cache effectiveness can be reported; a
+  named cache also exports them, and its size, as Prometheus metrics.
+  """
+
+  def __init__(self, ttl: float, maxsize: int = 1024, name: str | None = None) -> None:
+    """Initialize the cache.
+
+    Args:
+      ttl: Default lifetime of an entry in seconds.
+      maxsize: Maximum number of entries; least recently used are evicted.
+      name: Metrics label; unnamed caches are not exported.
+
+    """
+    self.ttl = ttl
+    self.maxsize = maxsize
+    self.hits = 0
+    self.misses = 0
+    self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+    self._hit_counter = self._miss_counter = None
+    if name is not None:
+      self._hit_counter = CACHE_REQUESTS.labels(name, "hit")
+      self._miss_counter = CACHE_REQUESTS.labels(name, "miss")
+      CACHE_ENTRIES.labels(name).set_function(self.__len__)
+
+  def get(self, key: K) -> V | None:
+    """Return the cached value for key, or None if missing or expired."""
+    entry = self._data.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+      if entry is not None:
+        del self._data[key]
+      self.misses += 1
+      if self._miss_counter is not None:
+        self._miss_counter.inc()
+      record_cache(hit=False)
+      return None
+    self._data.move_to_end(key)
+    self.hits += 1
+    if self._hit_counter is not None:
+      self._hit_counter.inc()
+    record_cache(hit=True)
+    return entry[1]
+
+  def set(self, key: K, value: V, ttl: float | None = None) -> None:
+    """Store value under key for ttl seconds (defaults to the cache TTL)."""
+    expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+    self._data[key] = (expires, value)
+    self._data.move_to_end(key)
+    while len(self._data) > self.maxsize:
+      self._data.popitem(last=False)
+
+  def pop(self, key: K) -> V | None:
+    """Remove key and return its value if present and not expired."""
+    entry = self._data.pop(key, None)
+    if entry is None or entry[0] <= time.monotonic():
+      return None
+    return entry[1]
+
+  def clear(self) -> None:
+    """Drop all entries."""
+    self._data.clear()
+
+  def __contains__(self, key: K) -> bool:
+    """Return True if key holds an unexpired entry; not counted as a lookup."""
+    entry = self._data.get(key)
+    return entry is not None and entry[0] > time.monotonic()
+
+  def __len__(self) -> int:
+    """Return the number of stored entries, including expired ones."""
+    return len(self._data)
@@ -0,0 +1,55 @@
+"""Exchange session calendars."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from app.core.lazy import lazy_import
+
+if TYPE_CHECKING:
+  import exchange_calendars as ecals
+else:
+  ecals = lazy_import("exchange_calendars")
+
+# IB exchange codes mapped to exchange_calendars names. US index and equity
+# venues all follow NYSE regular hours.
+_EXCHANGE_CALENDARS: dict[str, str] = {
+  "NYSE": "XNYS",
+  "ARCA": "XNYS",
+  "AMEX": "XNYS",
+  "BATS": "XNYS",
+  "CBOE": "XNYS",
+  "SMART": "XNYS",
+  "NASDAQ": "XNAS",
+  "ISLAND": "XNAS",
+  "CME": "CMES",
+  "GLOBEX": "CMES",
+  "LSE": "XLON",
+  "IBIS": "XETR",
+  "TSE": "XTKS",
+}
+
+DEFAULT_CALENDAR = "XNYS"
+
+# Calendars exchange_calendars has already built and cached.
+_built: set[str] = set()
+
+
+def get_exchange_calendar(exchange: str) -> ecals.ExchangeCalendar:
+  """Return the session calendar for an IB exchange code (NYSE if unknown)."""
+  name = _EXCHANGE_CALENDARS.get(exchange.upper(), DEFAULT_CALENDAR)
+  return ecals.get_calendar(name)
+
+
+async def load_exchange_calendar(exchange: str) -> ecals.ExchangeCalendar:
+  """Return the session calendar, building it in a worker thread on first use.
+
+  Building a calendar takes a few hundred milliseconds of CPU, which would
+  otherwise stall the event loop; later calls return the cached calendar.
+  """
+  name = _EXCHANGE_CALENDARS.get(exchange.upper(), DEFAULT_CALENDAR)
+  if name not in _built:
+    await asyncio.to_thread(ecals.get_calendar, name)
+    _built.add(name)
+  return ecals.get_calendar(name)
@@ -0,0 +1,114 @@
+"""Option chain definitions indexed for range queries."""
+
+import bisect
+import datetime as dt
+from dataclasses import dataclass, field
+
+from ib_async.objects import OptionChain
+
+
+def _contains[T](values: tuple[T, ...], value: T) -> bool:
+  """Binary search membership test on a sorted tuple."""
+  i = bisect.bisect_left(values, value)
+  return i < len(values) and values[i] == value
+
+
+@dataclass(frozen=True)
+class ChainClass:
+  """Listed expirations and strikes for one trading class, sorted ascending."""
+
+  expirations: tuple[str, ...]
+  strikes: tuple[float, ...]
+
+  def has_expiration(self, expiration: str) -> bool:
+    """Return True if the expiration (YYYYMMDD) is listed."""
+    return _contains(self.expirations, expiration)
+
+  def has_strike(self, strike: float) -> bool:
+    """Return True if the strike is listed."""
+    return _contains(self.strikes, float(strike))
+
+  def expirations_between(self, first: dt.date, last: dt.date) -> list[str]:
+    """Return listed expirations within [first, last] inclusive."""
+    lo = bisect.bisect_left(self.expirations, first.strftime("%Y%m%d"))
+    hi = bisect.bisect_right(self.expirations, last.strftime("%Y%m%d"))
+    return list(self.expirations[lo:hi])
+
+  def expirations_by_dte(
+    self,
+    min_dte: int | None = None,
+    max_dte: int | None = None,
+    today: dt.date | None = None,
+  ) -> list[str]:
+    """Return listed expirations whose days-to-expiry fall in [min_dte, max_dte]."""
+    today = today or dt.date.today()
+    first = today + dt.timedelta(days=min_dte or 0)
+    last = today + dt.timedelta(days=max_dte) if max_dte is not None else dt.date.max
+    return self.expirations_between(first, last)
+
+  def strikes_between(self, low: float, high: float) -> list[float]:
+    """Return listed strikes within [low, high] inclusive."""
+    lo = bisect.bisect_left(self.strikes, low)
+    hi = bisect.bisect_right(self.strikes, high)
+    return list(self.strikes[lo:hi])
+
+  def strikes_around(self, spot: float, pct: float) -> list[float]:
+    """Return listed strikes within ±pct (e.g. 0.1 for 10%) of spot."""
+    return self.strikes_between(spot * (1 - pct), spot * (1 + pct))
+
+  def nearest_strikes(self, spot: float, count: int) -> list[float]:
+    """Return the `count` listed strikes closest to spot, sorted ascending."""
+    i = bisect.bisect_left(self.strikes, spot)
+    lo, hi = i, i
+    while hi - lo < count and (lo > 0 or hi < len(self.strikes)):
+      below = spot - self.strikes[lo - 1] if lo > 0 else float("inf")
+      above = self.strikes[hi] - spot if hi < len(self.strikes) else float("inf")
+      if below <= above:
+        lo -= 1
+      else:
+        hi += 1
+    return list(self.strikes[lo:hi])
+
+
+@dataclass(frozen=True)
+class ChainDefinition:
+  """Option chain definition for an underlying, merged across exchanges.
+
+  `classes` holds the listed expirations/strikes per trading class and
+  `merged` holds their union across all trading classes.
+  """
+
+  underlying_con_id: int
+  exchanges: tuple[str, ...]
+  classes: dict[str, ChainClass] = field(default_factory=dict)
+  merged: ChainClass = field(default_factory=lambda: ChainClass((), ()))
+
+  @classmethod
+  def from_chains(
+    cls, underlying_con_id: int, chains: list[OptionChain]
+  ) -> "ChainDefinition":
+    """Build a definition from reqSecDefOptParams results."""
+    expirations: dict[str, set[str]] = {}
+    strikes: dict[str, set[float]] = {}
+    for chain in chains:
+      expirations.setdefault(chain.tradingClass, set()).update(chain.expirations)
+      strikes.setdefault(chain.tradingClass, set()).update(map(float, chain.strikes))
+    classes = {
+      name: ChainClass(tuple(sorted(expirations[name])), tuple(sorted(strikes[name])))
+      for name in expirations
+    }
+    merged = ChainClass(
+      tuple(sorted(set().union(*expirations.values()))),
+      tuple(sorted(set().union(*strikes.values()))),
+    )
+    return cls(
+      underlying_con_id=underlying_con_id,
+      exchanges=tuple(sorted({chain.exchange for chain in chains})),
+      classes=classes,
+      merged=merged,
+    )
+
+  @property
+  def trading_classes(self) -> list[str]:
+    """Return the trading class names."""
+    return list(self.classes)
@@ -1,14 +1,37 @@
 """Base IB client connection handling."""
 
+from __future__ import annotations
+
 import asyncio
 import datetime as dt
 import secrets
+import time
+from collections import deque
+from typing import TYPE_CHECKING
 
-import exchange_calendars as ecals
 from ib_async import IB
+from ib_async.contract import Contract
 
 from app.core.config import get_config
+from app.core.executor import get_executor
+from app.core.metrics import (
+  CACHE_ENTRIES,
+  CACHE_REQUESTS,
+  IB_CONNECTED,
+  IB_CONNECTS,
+  IB_DISCONNECTS,
+)
+from app.core.request_stats import record_cache
 from app.core.setup_logging import logger
+from app.core.tracing import set_attributes, span
+from .cache import TTLCache
+from .calendar import get_exchange_calendar, load_exchange_calendar
+from .pacing import PacingGovernor
+
+if TYPE_CHECKING:
+  from collections.abc import AsyncIterator, Awaitable, Callable
+
+  from .chains import ChainDefinition
 
 
 class IBClient:
@@ -21,6 +44,34 @@ class IBClient:
     # Qualified contracts keyed by (symbol, sec_type, exchange, currency).
     # qualifyContractsAsync is an IB round-trip; caching eliminates it on repeat calls.
     self._contract_cache: dict[tuple[str, str, str, str], object] = {}
+    # Watchlist descriptions IB could not qualify; they do not hold back /ready.
+    self._unknown_contracts: set[tuple[str, str, str, str]] = set()
+    # Qualified contracts keyed by conId, for requests that only carry a conId.
+    self._con_id_cache: dict[int, Contract] = {}
+    # Option chain definitions keyed by underlying conId (reqSecDefOptParams).
+    self._chain_cache: TTLCache[int, ChainDefinition] = TTLCache(
+      ttl=self.config.chain_cache_ttl,
+      name="chain",
+    )
+    self._contract_cache_hits = CACHE_REQUESTS.labels("contract", "hit")
+    self._contract_cache_misses = CACHE_REQUESTS.labels("contract", "miss")
+    self._con_id_cache_hits = CACHE_REQUESTS.labels("con_id", "hit")
+    self._con_id_cache_misses = CACHE_REQUESTS.labels("con_id", "miss")
+    CACHE_ENTRIES.labels("contract").set_function(lambda: len(self._contract_cache))
+    CACHE_ENTRIES.labels("con_id").set_function(lambda: len(self._con_id_cache))
+    IB_CONNECTED.set_function(self.ib.isConnected)
+    self.ib.disconnectedEvent += IB_DISCONNECTS.inc
+    # Market data type last requested (1 = live, 2 = frozen); reset per connection.
+    self._market_data_type: int | None = None
+    self.ib.disconnectedEvent += self._reset_market_data_type
+    # CPU-heavy steps on large inputs run in its worker pools.
+    self._executor = get_executor()
+    # Every IB request goes through the governor to stay under IB's pacing limit.
+    self._pacing = PacingGovernor(
+      rate=self.config.ib_max_messages_per_second,
+      burst=int(self.config.ib_max_messages_per_second),
+      max_concurrent=self.config.ib_max_concurrent_requests,
+    )
 
   async def _connect(self) -> None:
     """Create and connect IB client."""
@@ -39,10 +90,23 @@ class IBClient:
         readonly=False,
       )
       self.ib.RequestTimeout = 20
+      IB_CONNECTS.inc()
+      # Build the calendar _is_market_open reads off the event loop
+      await load_exchange_calendar("NYSE")
     except Exception as e:
       logger.error("Error connecting to IB: {}", e)
       raise
 
+  @staticmethod
+  def _contract_key(
+    symbol: str,
+    sec_type: str,
+    exchange: str,
+    currency: str,
+  ) -> tuple[str, str, str, str]:
+    """Return the _contract_cache key for a contract description."""
+    return (symbol.upper(), sec_type.upper(), exchange.upper(), currency.upper())
+
   async def _qualify_contract(
     self,
     symbol: str,
@@ -53,15 +117,24 @@ class IBClient:
     """Return a qualified Contract, using a cache to avoid redundant IB round-trips."""
     from ib_async.contract import Contract  # noqa: PLC0415
 
-    key = (symbol.upper(), sec_type.upper(), exchange.upper(), currency.upper())
-    if key not in self._contract_cache:
+    key = self._contract_key(symbol, sec_type, exchange, currency)
+    if key in self._contract_cache:
+      self._contract_cache_hits.inc()
+      record_cache(hit=True)
+    else:
+      self._contract_cache_misses.inc()
+      record_cache(hit=False)
       contract = Contract(
         symbol=symbol,
         secType=sec_type,
         exchange=exchange,
         currency=currency,
       )
-      [qualified] = await self.ib.qualifyContractsAsync(contract)
+      async with self._pacing.acquire(call="qualifyContracts"):
+        [qualified] = await self.ib.qualifyContractsAsync(contract)
+      if qualified is None:
+        msg = f"Unknown contract {symbol}/{sec_type}/{exchange}/{currency}"
+        raise ValueError(msg)
       self._contract_cache[key] = qualified
       logger.debug(
         "Qualified contract {}/{} conId={}",
@@ -71,14 +144,178 @@ class IBClient:
       )
     return self._contract_cache[key]
 
+  async def _qualify_con_id(self, con_id: int) -> Contract:
+    """Return a qualified Contract for a conId, cached after the first lookup."""
+    if con_id in self._con_id_cache:
+      self._con_id_cache_hits.inc()
+      record_cache(hit=True)
+    else:
+      self._con_id_cache_misses.inc()
+      record_cache(hit=False)
+      async with self._pacing.acquire(call="qualifyContracts"):
+        [qualified] = await self.ib.qualifyContractsAsync(Contract(conId=con_id))
+      if qualified is None:
+        msg = f"Unknown contract ID {con_id}"
+        raise ValueError(msg)
+      self._con_id_cache[con_id] = qualified
+    return self._con_id_cache[con_id]
+
+  async def _qualify_batch(
+    self,
+    batch: list[Contract],
+  ) -> tuple[list[Contract | None] | None, float]:
+    """Qualify one batch under the pacing governor.
+
+    Returns the qualified batch (None on failure) and the elapsed seconds.
+    """
+    t0 = time.monotonic()
+    try:
+      async with self._pacing.acquire(len(batch), call="qualifyContracts"):
+        qualified = await asyncio.wait_for(
+          self.ib.qualifyContractsAsync(*batch),
+          timeout=self.config.qualify_batch_timeout,
+        )
+    except Exception as e:
+      logger.warning("Qualifying batch of {} contracts failed: {!r}", len(batch), e)
+      return None, time.monotonic() - t0
+    return qualified, time.monotonic() - t0
+
+  async def _iter_qualified(
+    self,
+    contracts: list[Contract],
+  ) -> AsyncIterator[list[Contract]]:
+    """Qualify contracts in adaptively sized concurrent batches.
+
+    Batches that finish well within the timeout grow the batch size, failed
+    batches are split in half and retried, and a contract that fails on its
+    own is dropped. Successfully qualified contracts are yielded per batch as
+    soon as each batch completes, so callers can consume partial results.
+    """
+    pending = deque(contracts)
+    size = self.config.qualify_batch_size
+    max_size = self.config.qualify_max_batch_size
+    fast = self.config.qualify_batch_timeout / 4
+    running: dict[asyncio.Task, list[Contract]] = {}
+    try:
+      while pending or running:
+        while pending and len(running) < self.config.qualify_concurrency:
+          batch = [pending.popleft() for _ in range(min(size, len(pending)))]
+          running[asyncio.create_task(self._qualify_batch(batch))] = batch
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+          batch = running.pop(task)
+          qualified, elapsed = task.result()
+          if qualified is not None:
+            if elapsed < fast:
+              size = min(size * 2, max_size)
+            yield [c for c in qualified if isinstance(c, Contract)]
+          elif len(batch) == 1:
+            logger.warning("Dropping contract that failed to qualify: {}", batch[0])
+          else:
+            size = max(1, len(batch) // 2)
+            pending.extendleft(reversed(batch))
+    finally:
+      for task in running:
+        task.cancel()
+
+  async def _qualify_contracts_bulk(self, contracts: list[Contract]) -> list[Contract]:
+    """Qualify contracts in batches and return all that qualified."""
+    qualified: list[Contract] = []
+    with span("qualify_contracts", contracts=len(contracts)) as current:
+      async for batch in self._iter_qualified(contracts):
+        qualified.extend(batch)
+      set_attributes(current, qualified=len(qualified))
+    return qualified
+
   def _is_market_open(self) -> bool:
     """Return True if the NYSE is currently in a trading minute (UTC).
 
     Used to select live (type 1) vs. frozen (type 2) market data.
     """
-    nyse = ecals.get_calendar("NYSE")
+    nyse = get_exchange_calendar("NYSE")
     return nyse.is_trading_minute(dt.datetime.now(dt.UTC))
 
+  def _request_market_data_type(self) -> None:
+    """Request live (1) market data while the market is open, frozen (2) otherwise."""
+    self._market_data_type = 1 if self._is_market_open() else 2
+    self.ib.reqMarketDataType(self._market_data_type)
+
+  def _reset_market_data_type(self) -> None:
+    """Forget the market data type; IB resets it with the connection."""
+    self._market_data_type = None
+
+  def readiness_checks(self) -> dict[str, bool]:
+    """Return the readiness checks from in-memory state, without IB round trips.
+
+    Mixins holding warmable state add their own checks, and the step that
+    warms it under the same name in _prepare_steps().
+    """
+    connected = self.ib.isConnected()
+    watchlist = [
+      self._contract_key(symbol, sec_type, exchange, "USD")
+      for symbol, sec_type, exchange in self.config.get_price_watchlist()
+    ]
+    return {
+      "ib_connected": connected,
+      "market_data_type": connected and self._market_data_type is not None,
+      "contract_cache": all(
+        key in self._contract_cache or key in self._unknown_contracts
+        for key in watchlist
+      ),
+    }
+
+  def _prepare_steps(self) -> dict[str, Callable[[], Awaitable[object]]]:
+    """Return the steps that warm each readiness check, keyed by check name."""
+    return {"contract_cache": self._qualify_watchlist}
+
+  async def _qualify_watchlist(self) -> None:
+    """Qualify the price watchlist; contracts IB does not know are skipped."""
+    for symbol, sec_type, exchange in self.config.get_price_watchlist():
+      try:
+        await self._qualify_contract(symbol, sec_type, exchange, "USD")
+      except ValueError as e:
+        self._unknown_contracts.add(
+          self._contract_key(symbol, sec_type, exchange, "USD"),
+        )
+        logger.warning("Skipping watchlist contract: {!s}", e)
+
+  async def _prepare(self) -> None:
+    """Connect and run the steps of the readiness checks that fail.
+
+    Steps are independent: a failing step is logged and the others still
+    run, and every step is a no-op when its state is already warm.
+    """
+    await self._connect()
+    self._request_market_data_type()
+    checks = self.readiness_checks()
+    for name, step in self._prepare_steps().items():
+      if checks.get(name):
+        continue
+      try:
+        await step()
+      except Exception as e:
+        logger.warning("Preparing {} failed: {!s}", name, e)
+
+  async def keep_ready(self) -> None:
+    """Bring the client to ready and back after disconnects; runs until cancelled.
+
+    Readiness is checked every ready_check_interval seconds; when a check
+    fails, the session is (re)connected and its caches warmed, so requests
+    routed to a ready server never wait for the IB connect.
+    """
+    ready = False
+    while True:
+      if not all(self.readiness_checks().values()):
+        ready = False
+        try:
+          await self._prepare()
+        except Exception as e:
+          logger.warning("Preparing the IB session failed: {!s}", e)
+      if not ready and all(self.readiness_checks().values()):
+        ready = True
+        logger.info("IB session ready")
+      await asyncio.sleep(self.config.ready_check_interval)
+
   async def send_command_to_ibc(self, command: str) -> None:
     """Send a command to the IBC Command Server.
 
@@ -1,11 +1,17 @@
 """Contract operations."""
 
+import asyncio
+
 from ib_async import util
 from ib_async.contract import Contract, Option, ComboLeg
 
 from app.core.setup_logging import logger
+from .chains import ChainDefinition
 from .client import IBClient
 
+# Filters that need the underlying spot price to resolve.
+_MONEYNESS_FILTERS = {"strike_range_pct", "nearest_strikes", "max_contracts"}
+
 
 class ContractClient(IBClient):
   """Contract operations.
@@ -71,7 +77,8 @@ class ContractClient(IBClient):
         **contract_params,
       )
 
-      contracts = await self.ib.qualifyContractsAsync(contract)
+      async with self._pacing.acquire(call="qualifyContracts"):
+        contracts = await self.ib.qualifyContractsAsync(contract)
       contracts = util.df(contracts)
       contracts = contracts[
         [
@@ -90,6 +97,156 @@ class ContractClient(IBClient):
     else:
       return contracts.to_dict(orient="records")
 
+  async def _get_chain_definition(
+    self,
+    underlying_symbol: str,
+    underlying_sec_type: str,
+    underlying_con_id: int,
+  ) -> ChainDefinition:
+    """Return the cached chain definition, requesting it from IB on a miss."""
+    definition = self._chain_cache.get(underlying_con_id)
+    if definition is None:
+      await self._connect()
+      async with self._pacing.acquire(call="reqSecDefOptParams"):
+        chains = await self.ib.reqSecDefOptParamsAsync(
+          underlying_symbol,
+          "",
+          underlying_sec_type,
+          underlying_con_id,
+        )
+      definition = ChainDefinition.from_chains(underlying_con_id, chains)
+      if not definition.classes:
+        # Empty answers also come from gateway hiccups; don't pin them for an hour
+        logger.warning(
+          "No option chain definition for {} conId={}; not cached",
+          underlying_symbol,
+          underlying_con_id,
+        )
+        return definition
+      self._chain_cache.set(underlying_con_id, definition)
+      logger.debug(
+        "Cached chain definition for {} conId={}: {} classes, {} expirations",
+        underlying_symbol,
+        underlying_con_id,
+        len(definition.classes),
+        len(definition.merged.expirations),
+      )
+    return definition
+
+  async def _get_underlying_price(self, underlying_con_id: int) -> float:
+    """Return the current price of the underlying for moneyness filters."""
+    contract = await self._qualify_con_id(underlying_con_id)
+    # _price_snapshot is provided by HistoryClient via IBInterface MRO
+    snapshot = await self._price_snapshot(contract, contract.symbol, contract.secType)
+    price = snapshot.last if snapshot.last is not None else snapshot.close
+    if price is None:
+      msg = f"No price available for underlying conId {underlying_con_id}"
+      raise RuntimeError(msg)
+    return price
+
+  def _build_option_contracts(
+    self,
+    underlying_symbol: str,
+    definition: ChainDefinition,
+    filters: dict,
+    spot: float | None = None,
+  ) -> list[Option]:
+    """Build option contracts for the listed combinations matching filters.
+
+    Explicit expirations/strikes take precedence over range filters. Requested
+    values that are not listed for a trading class are skipped so they never
+    reach qualification. Moneyness filters (strike_range_pct, nearest_strikes)
+    require spot.
+    """
+    rights = filters.get("rights", ["C", "P"])
+    strike_range_pct = filters.get("strike_range_pct")
+    nearest = filters.get("nearest_strikes")
+    contracts = []
+    for trading_class in filters.get("tradingClass", definition.trading_classes):
+      chain_class = definition.classes.get(trading_class)
+      if chain_class is None:
+        continue
+
+      if "expirations" in filters:
+        expirations = [
+          e for e in filters["expirations"] if chain_class.has_expiration(e)
+        ]
+      else:
+        expirations = chain_class.expirations_by_dte(
+          filters.get("min_dte"),
+          filters.get("max_dte"),
+        )
+
+      if "strikes" in filters:
+        strikes = [s for s in filters["strikes"] if chain_class.has_strike(s)]
+      elif strike_range_pct is not None and spot is not None:
+        strikes = chain_class.strikes_around(spot, strike_range_pct)
+      elif nearest is not None and spot is not None:
+        strikes = chain_class.nearest_strikes(spot, nearest)
+      else:
+        strikes = list(chain_class.strikes)
+      if nearest is not None and spot is not None and len(strikes) > nearest:
+        strikes = sorted(sorted(strikes, key=lambda s: abs(s - spot))[:nearest])
+
+      contracts.extend(
+        Option(
+          underlying_symbol,
+          expiry,
+          strike,
+          right,
+          "SMART",
+          tradingClass=trading_class,
+        )
+        for right in rights
+        for strike in sorted(strikes)
+        for expiry in sorted(expirations)
+      )
+
+    max_contracts = filters.get("max_contracts")
+    if max_contracts is not None and len(contracts) > max_contracts:
+      contracts.sort(
+        key=lambda c: (
+          abs(c.strike - spot) if spot is not None else 0.0,
+          c.lastTradeDateOrContractMonth,
+        ),
+      )
+      contracts = contracts[:max_contracts]
+    return contracts
+
+  async def _resolve_option_contracts(
+    self,
+    underlying_symbol: str,
+    underlying_sec_type: str,
+    underlying_con_id: int,
+    filters: dict | None,
+  ) -> tuple[list[Option], float | None]:
+    """Return the unqualified option contracts matching filters, and the spot used.
+
+    Spot is only fetched when a moneyness filter needs it and the caller did
+    not pass underlying_price.
+    """
+    definition = await self._get_chain_definition(
+      underlying_symbol,
+      underlying_sec_type,
+      underlying_con_id,
+    )
+    filters = filters or {}
+    spot = filters.get("underlying_price")
+    if spot is None and _MONEYNESS_FILTERS.intersection(filters):
+      spot = await self._get_underlying_price(underlying_con_id)
+    contracts = self._build_option_contracts(
+      underlying_symbol,
+      definition,
+      filters,
+      spot,
+    )
+    logger.debug(
+      "Resolved {} option contracts for {}",
+      len(contracts),
+      underlying_symbol,
+    )
+    return contracts, spot
+
   async def get_options_chain(
     self,
     underlying_symbol: str,
@@ -110,73 +267,73 @@ class ContractClient(IBClient):
         - expirations: List of expirations to filter by.
         - strikes: List of strikes to filter by.
         - rights: List of rights to filter by.
-
+        - min_dte/max_dte: Days-to-expiration range (if no expirations).
+        - strike_range_pct: Strike band around spot, e.g. 0.1 (if no strikes).
+        - nearest_strikes: Keep the N strikes closest to spot.
+        - max_contracts: Cap on contracts, nearest to the money first.
+        - underlying_price: Spot to use instead of fetching it from IB.
 
     Returns:
       List of options chain for the given underlying contract.
 
     """
     try:
+      # Connect even when the chain definition is cached: qualification below
+      # drops contracts whose batches fail, which would return an empty chain.
       await self._connect()
-      chains = await self.ib.reqSecDefOptParamsAsync(
+      contracts, _ = await self._resolve_option_contracts(
         underlying_symbol,
-        "",
         underlying_sec_type,
         underlying_con_id,
+        filters,
       )
-      chains = util.df(chains)
-      chains = chains[
-        [
-          "exchange",
-          "underlyingConId",
-          "tradingClass",
-          "expirations",
-          "strikes",
-        ]
-      ]
-
-      if filters:
-        expirations = filters.get("expirations", chains["expirations"].iloc[0])
-        strikes = filters.get("strikes", chains["strikes"].iloc[0])
-        rights = filters.get("rights", ["C", "P"])
-        trading_classes = filters.get("tradingClass", chains["tradingClass"].unique())
-      else:
-        expirations = chains["expirations"].iloc[0]
-        strikes = chains["strikes"].iloc[0]
-        rights = ["C", "P"]
-        trading_classes = chains["tradingClass"].unique()
-      contracts = [
-        Option(
-          underlying_symbol,
-          expiry,
-          strike,
-          right,
-          "SMART",
-          tradingClass=trading_class,
-        )
-        for right in rights
-        for strike in strikes
-        for expiry in expirations
-        for trading_class in trading_classes
-      ]
-      try:
-        contracts = await self.ib.qualifyContractsAsync(*contracts)
-        contracts = [c for c in contracts if c is not None]
-        contracts = util.df(contracts, labels=["conId", "localSymbol"])
-      except Exception as e:
-        logger.warning("Error qualifying contracts: {}", str(e))
-        raise
+      contracts = await self._qualify_contracts_bulk(contracts)
     except Exception as e:
       logger.error("Error getting options chain: {}", str(e))
       raise
     else:
-      return contracts.to_dict(orient="records")
+      return [{"conId": c.conId, "localSymbol": c.localSymbol} for c in contracts]
+
+  async def _combo_contract(
+    self,
+    legs: list[tuple[int, str, int]],
+    exchange: str,
+  ) -> tuple[Contract, list[Contract]]:
+    """Build a BAG contract from (conId, action, ratio) legs.
+
+    Legs are qualified concurrently through the conId cache, so repeated
+    combos over the same legs cost no IB round-trips.
+
+    Returns:
+      The BAG contract and the qualified leg contracts, in leg order.
+
+    """
+    contracts = list(
+      await asyncio.gather(*(self._qualify_con_id(con_id) for con_id, _, _ in legs)),
+    )
+    combo = Contract(
+      symbol=contracts[0].symbol,
+      secType="BAG",
+      exchange=exchange,
+      currency=contracts[0].currency,
+      comboLegs=[
+        ComboLeg(
+          conId=contract.conId,
+          ratio=ratio,
+          action=action.upper(),
+          exchange=exchange,
+        )
+        for contract, (_, action, ratio) in zip(contracts, legs, strict=True)
+      ],
+    )
+    return combo, contracts
 
   async def create_combo_contract(
     self,
     contract_ids: list[int],
     actions: list[str],
     exchange: str = "SMART",
+    ratios: list[int] | None = None,
   ) -> dict | None:
     """Create the spread contract from contract ids and actions.
 
@@ -184,43 +341,27 @@ class ContractClient(IBClient):
       contract_ids: List of contract ids.
       actions: List of actions.
       exchange: Exchange to create the combo contract for.
+      ratios: Leg ratios (default 1 for every leg).
 
     Returns:
       Contract: The created combo contract.
 
     """
-    if len(contract_ids) != len(actions):
-      logger.error("Number of contracts and actions must be the same")
+    ratios = ratios or [1] * len(contract_ids)
+    if not len(contract_ids) == len(actions) == len(ratios):
+      logger.error("Number of contracts, actions and ratios must be the same")
       return None
 
     try:
       await self._connect()
-      contracts = [Contract(conId=contract_id) for contract_id in contract_ids]
-      contracts = await self.ib.qualifyContractsAsync(*contracts)
+      contract, _ = await self._combo_contract(
+        list(zip(contract_ids, actions, ratios, strict=True)),
+        exchange,
+      )
     except Exception as e:
       logger.error("Error qualifying contracts: {}", str(e))
       return None
 
-    # Create empty combo contract
-    contract = Contract(
-      symbol=contracts[0].symbol,
-      secType="BAG",
-      exchange=exchange,
-    )
-
-    # Add legs to the contract
-    legs = []
-    for action, contract in zip(actions, contracts, strict=True):
-      logger.debug("Adding leg to combo contract: {contract}", contract=contract)
-      leg = ComboLeg()
-      leg.conId = contract.conId
-      leg.ratio = 1
-      leg.exchange = exchange
-      leg.action = action.upper()
-      legs.append(leg)
-
-    contract.comboLegs = legs
-
     # Log contract details
     logger.debug("Target combo contract: {}", contract)
 
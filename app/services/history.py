@@ -1,14 +1,35 @@
 """Historical OHLCV bars and current price snapshot operations."""
 
+from __future__ import annotations
+
+import asyncio
 import datetime as dt
+import functools
 import math
 import time
+from typing import TYPE_CHECKING
 
-from ib_async.objects import BarData
+from ib_async.contract import Contract
+from ib_async.objects import BarData, RealTimeBarList
 
+from .bar_streams import BarStream, BarStreamKey
+from .bars import BarFileFormat, BarSeries
+from .cache import TTLCache
+from .calendar import load_exchange_calendar
 from .client import IBClient
+from .resample import BarFreq, bars_to_frame, parse_freq, resample_frame
+from app.core.metrics import SUBSCRIPTIONS
 from app.core.setup_logging import logger
-from app.models.history import HistoricalBar, PriceSnapshot
+from app.models.history import BulkHistoryResult, HistoricalBar, PriceSnapshot
+from app.core.lazy import lazy_import
+
+if TYPE_CHECKING:
+  from collections.abc import AsyncIterator
+  from pathlib import Path
+
+  import pandas as pd
+else:
+  pd = lazy_import("pandas")
 
 
 # Maps user-facing frequency strings to IB bar size settings.
@@ -24,6 +45,19 @@ FREQ_TO_BAR_SIZE: dict[str, str] = {
   "1M": "1 month",
 }
 
+# Native IB intraday bar sizes by length in minutes, finest first.
+_INTRADAY_BAR_SIZES: dict[int, str] = {
+  1: "1 min",
+  5: "5 mins",
+  15: "15 mins",
+  30: "30 mins",
+  60: "1 hour",
+  240: "4 hours",
+}
+
+# Live-only frequency served by IB real-time 5-second bars.
+REALTIME_FREQ = "5s"
+
 # IB whatToShow value per security type.
 _WHAT_TO_SHOW: dict[str, str] = {
   "IND": "TRADES",
@@ -46,22 +80,157 @@ def _bar_date(bar: BarData) -> dt.date:
   return d.date() if isinstance(d, dt.datetime) else d  # type: ignore[return-value]
 
 
-def _bar_to_model(bar: BarData) -> HistoricalBar:
-  """Convert an ib_async BarData to a HistoricalBar model."""
-  vol = int(bar.volume) if bar.volume > 0 else None
-  return HistoricalBar(
-    timestamp=bar.date.isoformat(),
-    open=bar.open,
-    high=bar.high,
-    low=bar.low,
-    close=bar.close,
-    volume=vol,
-  )
+def _source_bar_sizes(freq: str, target: BarFreq, use_rth: bool) -> list[str]:
+  """Return native IB bar sizes that target bars can be built from, finest first.
+
+  Intraday sources must divide the target length. Day-level targets can be
+  built from any intraday size (regular hours only, so sessions match IB
+  daily bars) or from daily bars.
+  """
+  if target.intraday:
+    return [
+      size
+      for minutes, size in _INTRADAY_BAR_SIZES.items()
+      if target.minutes % minutes == 0
+    ]
+  sizes = [*_INTRADAY_BAR_SIZES.values()] if use_rth else []
+  sizes.append("1 day")
+  if freq in FREQ_TO_BAR_SIZE and FREQ_TO_BAR_SIZE[freq] not in sizes:
+    sizes.append(FREQ_TO_BAR_SIZE[freq])
+  return sizes
 
 
 class HistoryClient(IBClient):
   """Current price snapshots and historical OHLCV bar retrieval."""
 
+  def __init__(self) -> None:
+    """Initialize live bar subscription state."""
+    super().__init__()
+    # One live IB subscription per (conId, bar size, whatToShow, useRTH).
+    self._bar_streams: dict[BarStreamKey, BarStream] = {}
+    self.ib.disconnectedEvent += self._close_all_bar_streams
+    # Fetched bars keyed by (conId, bar size, whatToShow, useRTH, from, to), so
+    # coarser frequencies over the same window are resampled locally.
+    self._bar_frame_cache: TTLCache[tuple, pd.DataFrame] = TTLCache(
+      ttl=self.config.history_cache_ttl,
+      maxsize=256,
+      name="bar_frame",
+    )
+    # Off-hours price snapshots keyed by conId; each entry expires at the next
+    # session open of its exchange, so the default TTL is only a fallback.
+    self._closed_price_cache: TTLCache[int, PriceSnapshot] = TTLCache(
+      ttl=self.config.history_cache_ttl_closed,
+      name="closed_price",
+    )
+    SUBSCRIPTIONS.labels("bar_stream").set_function(lambda: len(self._bar_streams))
+
+  async def _open_bar_stream(
+    self,
+    contract: Contract,
+    freq: str,
+    what_to_show: str,
+    use_rth: bool,
+    lookback_days: int,
+  ) -> BarStream:
+    """Return the live subscription for the contract, starting it if needed."""
+    bar_size = "5 secs" if freq == REALTIME_FREQ else FREQ_TO_BAR_SIZE[freq]
+    key = (contract.conId, bar_size, what_to_show, use_rth)
+    if key in self._bar_streams:
+      return self._bar_streams[key]
+
+    if freq == REALTIME_FREQ:
+      async with self._pacing.acquire(call="reqRealTimeBars"):
+        bars = self.ib.reqRealTimeBars(contract, 5, what_to_show, use_rth)
+    else:
+      async with self._pacing.acquire(call="reqHistoricalData"):
+        bars = await self.ib.reqHistoricalDataAsync(
+          contract,
+          endDateTime="",
+          durationStr=f"{lookback_days} D",
+          barSizeSetting=bar_size,
+          whatToShow=what_to_show,
+          useRTH=use_rth,
+          formatDate=1,
+          keepUpToDate=True,
+        )
+    if key in self._bar_streams:
+      # Another listener started the same subscription while we awaited.
+      self._cancel_bar_subscription(bars)
+      return self._bar_streams[key]
+
+    self._bar_streams[key] = BarStream(key, bars)
+    logger.debug("Started live bar subscription {}", key)
+    return self._bar_streams[key]
+
+  async def _warm_bar_stream(
+    self,
+    contract: Contract,
+    freq: str,
+    lookback_days: int,
+  ) -> int:
+    """Open a pinned live subscription and return the bars it holds.
+
+    Pinned subscriptions are not released when listeners leave, so they stay
+    open until the connection drops; get_historical_bars serves their window
+    meanwhile.
+    """
+    what_to_show = _WHAT_TO_SHOW.get(contract.secType.upper(), "TRADES")
+    stream = await self._open_bar_stream(
+      contract,
+      freq,
+      what_to_show,
+      use_rth=True,
+      lookback_days=lookback_days,
+    )
+    stream.pinned = True
+    if stream.idle_handle is not None:
+      stream.idle_handle.cancel()
+      stream.idle_handle = None
+    return len(stream.bars)
+
+  def _cancel_bar_subscription(self, bars: object) -> None:
+    """Cancel the IB subscription behind a live bar list."""
+    if not self.ib.isConnected():
+      return
+    if isinstance(bars, RealTimeBarList):
+      self.ib.cancelRealTimeBars(bars)
+    else:
+      self.ib.cancelHistoricalData(bars)
+
+  def _release_bar_stream(
+    self,
+    stream: BarStream,
+    queue: asyncio.Queue,
+  ) -> None:
+    """Drop a listener; idle subscriptions are cancelled after a linger period.
+
+    Lingering keeps the bar cache warm for clients that reconnect or poll
+    /ibkr/historical between stream sessions.
+    """
+    stream.unlisten(queue)
+    if stream.pinned:
+      return
+    if not stream.listeners and self._bar_streams.get(stream.key) is stream:
+      stream.idle_handle = asyncio.get_running_loop().call_later(
+        self.config.bar_stream_linger,
+        self._close_bar_stream,
+        stream.key,
+      )
+
+  def _close_bar_stream(self, key: BarStreamKey) -> None:
+    """Cancel a live subscription and notify its listeners."""
+    stream = self._bar_streams.pop(key, None)
+    if stream is None:
+      return
+    self._cancel_bar_subscription(stream.bars)
+    stream.close()
+    logger.debug("Closed live bar subscription {}", key)
+
+  def _close_all_bar_streams(self) -> None:
+    """End every live subscription (IB drops them on disconnect)."""
+    for key in list(self._bar_streams):
+      self._close_bar_stream(key)
+
   async def get_current_price(
     self,
     symbol: str,
@@ -81,18 +250,42 @@ class HistoryClient(IBClient):
       PriceSnapshot with last, bid, ask, close, and UTC timestamp.
 
     """
-    await self._connect()
+    # Closed-session snapshots are served without any IB traffic, not even a
+    # connection check, until the contract's next session opens.
+    contract = self._contract_cache.get(
+      self._contract_key(symbol, sec_type, exchange, currency),
+    )
+    if contract is not None:
+      cached = self._closed_price_cache.get(contract.conId)
+      if cached is not None:
+        return cached
 
-    t0 = time.monotonic()
+    await self._connect()
     contract = await self._qualify_contract(symbol, sec_type, exchange, currency)
-    logger.debug("qualify_contract took {:.2f}s", time.monotonic() - t0)
+    return await self._price_snapshot(contract, symbol, sec_type)
 
-    t0 = time.monotonic()
-    if self._is_market_open():
+  async def _price_snapshot(
+    self,
+    contract: Contract,
+    symbol: str,
+    sec_type: str,
+    refresh: bool = False,
+  ) -> PriceSnapshot:
+    """Fetch a price snapshot for an already qualified contract.
+
+    Outside trading hours of the contract's exchange the snapshot comes from
+    the last daily bar and is cached until the next session open (refresh
+    bypasses the cached value).
+    """
+    calendar = await load_exchange_calendar(
+      contract.primaryExchange or contract.exchange,
+    )
+    now = pd.Timestamp.now(tz="UTC")
+    if calendar.is_trading_minute(now):
       # Live path: reqTickersAsync returns real-time last/bid/ask.
       self.ib.reqMarketDataType(1)
-      [ticker] = await self.ib.reqTickersAsync(contract)
-      logger.debug("reqTickersAsync (live) took {:.2f}s", time.monotonic() - t0)
+      async with self._pacing.acquire(call="reqTickers"):
+        [ticker] = await self.ib.reqTickersAsync(contract)
       return PriceSnapshot(
         symbol=contract.localSymbol or symbol,
         sec_type=sec_type,
@@ -102,25 +295,27 @@ class HistoryClient(IBClient):
         close=_to_float(ticker.close),
         timestamp=dt.datetime.now(dt.UTC).isoformat(),
       )
+    if not refresh and (cached := self._closed_price_cache.get(contract.conId)):
+      return cached
     # Closed path: reqTickersAsync for indices waits ~11s for bid/ask that never
     # arrive. Use the last daily bar instead — IB returns it immediately.
     what_to_show = _WHAT_TO_SHOW.get(sec_type.upper(), "TRADES")
-    bars = await self.ib.reqHistoricalDataAsync(
-      contract,
-      endDateTime="",
-      durationStr="1 D",
-      barSizeSetting="1 day",
-      whatToShow=what_to_show,
-      useRTH=True,
-      formatDate=1,
-      keepUpToDate=False,
-    )
-    logger.debug("reqHistoricalDataAsync (closed) took {:.2f}s", time.monotonic() - t0)
+    async with self._pacing.acquire(call="reqHistoricalData"):
+      bars = await self.ib.reqHistoricalDataAsync(
+        contract,
+        endDateTime="",
+        durationStr="1 D",
+        barSizeSetting="1 day",
+        whatToShow=what_to_show,
+        useRTH=True,
+        formatDate=1,
+        keepUpToDate=False,
+      )
     if not bars:
-      msg = f"No historical data returned for {symbol}/{exchange}"
+      msg = f"No historical data returned for {symbol}/{contract.exchange}"
       raise RuntimeError(msg)
     close = _to_float(bars[-1].close)
-    return PriceSnapshot(
+    snapshot = PriceSnapshot(
       symbol=contract.localSymbol or symbol,
       sec_type=sec_type,
       last=close,
@@ -129,6 +324,49 @@ class HistoryClient(IBClient):
       close=close,
       timestamp=dt.datetime.now(dt.UTC).isoformat(),
     )
+    self._closed_price_cache.set(
+      contract.conId,
+      snapshot,
+      ttl=(calendar.next_open(now) - now).total_seconds(),
+    )
+    return snapshot
+
+  async def prefetch_closed_prices(self, watchlist: list[tuple[str, str, str]]) -> None:
+    """Keep closed-session snapshots cached for a watchlist; runs until cancelled.
+
+    Closed contracts are fetched on start, then again price_prefetch_delay
+    seconds after each session close (once the daily bar is final), so
+    off-hours price requests for the watchlist never wait on IB.
+
+    Args:
+      watchlist: (symbol, sec_type, exchange) tuples; currency is USD.
+
+    """
+    while True:
+      now = pd.Timestamp.now(tz="UTC")
+      next_close = None
+      for symbol, sec_type, exchange in watchlist:
+        try:
+          await self._connect()
+          contract = await self._qualify_contract(symbol, sec_type, exchange, "USD")
+          # Same calendar _price_snapshot decides open vs. closed with
+          calendar = await load_exchange_calendar(
+            contract.primaryExchange or contract.exchange,
+          )
+          close = calendar.next_close(now)
+          next_close = close if next_close is None else min(next_close, close)
+          if not calendar.is_trading_minute(now):
+            await self._price_snapshot(contract, symbol, sec_type, refresh=True)
+        except Exception as e:
+          logger.warning("Price prefetch for {}/{} failed: {!s}", symbol, exchange, e)
+      # Without any calendar (e.g. not connected yet), retry after the delay
+      delay = 0.0
+      if next_close is not None:
+        delay = max((next_close - pd.Timestamp.now(tz="UTC")).total_seconds(), 0)
+      logger.debug(
+        "Next price prefetch in {:.0f}s", delay + self.config.price_prefetch_delay
+      )
+      await asyncio.sleep(delay + self.config.price_prefetch_delay)
 
   async def get_historical_bars(
     self,
@@ -140,36 +378,276 @@ class HistoryClient(IBClient):
     to_date: dt.date,
     use_rth: bool = True,
     currency: str = "USD",
-  ) -> list[HistoricalBar]:
+  ) -> BarSeries:
     """Fetch OHLCV bars for a contract over a date range.
 
     Args:
       symbol: Ticker symbol (e.g. "SPX", "VIX", "AAPL").
       sec_type: Security type (IND, STK, ETF, FUT, CASH).
       exchange: Primary exchange.
-      freq: Bar frequency — one of: 1min, 5min, 15min, 30min, 1h, 4h, 1d, 1w, 1M.
+      freq: Bar frequency — a native size (1min, 5min, 15min, 30min, 1h, 4h,
+        1d, 1w, 1M) or a custom <N>min, <N>h, <N>d, <N>w, <N>M or "session".
+        Custom sizes are resampled from finer bars, anchored to the session
+        open; native sizes are resampled from finer cached bars of the same
+        window when available instead of requesting IB again.
       from_date: First bar date (inclusive).
       to_date: Last bar date (inclusive).
       use_rth: Include regular trading hours only (default True).
       currency: Currency code (default USD).
 
     Returns:
-      List of HistoricalBar ordered oldest-first.
+      BarSeries (columnar arrays) ordered oldest-first.
 
     Raises:
       ValueError: If freq is unrecognised or from_date is after to_date.
 
     """
+    target = parse_freq(freq)
+    if from_date > to_date:
+      raise ValueError("from_date must not be after to_date")
+
+    what_to_show = _WHAT_TO_SHOW.get(sec_type.upper(), "TRADES")
+
+    await self._connect()
+    contract = await self._qualify_contract(symbol, sec_type, exchange, currency)
+    return await self._contract_bars(
+      contract,
+      exchange,
+      freq,
+      target,
+      what_to_show,
+      use_rth,
+      from_date,
+      to_date,
+    )
+
+  async def _contract_bars(
+    self,
+    contract: Contract,
+    exchange: str,
+    freq: str,
+    target: BarFreq,
+    what_to_show: str,
+    use_rth: bool,
+    from_date: dt.date,
+    to_date: dt.date,
+  ) -> BarSeries:
+    """Return bars for a qualified contract from live/cached bars or IB."""
+    # Serve from a live subscription when its window covers the request.
     bar_size = FREQ_TO_BAR_SIZE.get(freq)
-    if bar_size is None:
-      msg = f"Unsupported frequency '{freq}'. Valid values: {sorted(FREQ_TO_BAR_SIZE)}"
-      raise ValueError(msg)
+    stream = self._bar_streams.get((contract.conId, bar_size, what_to_show, use_rth))
+    if stream is not None and stream.bars and _bar_date(stream.bars[0]) <= from_date:
+      logger.debug(
+        "Serving {}/{} freq={} from live subscription",
+        contract.symbol,
+        exchange,
+        freq,
+      )
+      return BarSeries.from_bars(
+        [b for b in stream.bars if from_date <= _bar_date(b) <= to_date],
+      )
+
+    # Reuse any cached bars fine enough to build the target; otherwise fetch
+    # the native size (or the coarsest size the target can be built from).
+    sources = _source_bar_sizes(freq, target, use_rth)
+    window = (contract.conId, what_to_show, use_rth, from_date, to_date)
+    source_size, frame = next(
+      (
+        (size, cached)
+        for size in sources
+        if (cached := self._bar_frame_cache.get((size, *window))) is not None
+      ),
+      (None, None),
+    )
+    if frame is None:
+      source_size = bar_size or (sources[-1] if target.intraday else "1 day")
+      frame = await self._fetch_bar_frame(
+        contract,
+        source_size,
+        what_to_show,
+        use_rth,
+        from_date,
+        to_date,
+      )
+      self._bar_frame_cache.set(
+        (source_size, *window),
+        frame,
+        ttl=None
+        if to_date >= dt.date.today()
+        else self.config.history_cache_ttl_closed,
+      )
+    else:
+      logger.debug("Building freq={} from cached {} bars", freq, source_size)
+
+    if source_size != bar_size:
+      calendar = await load_exchange_calendar(contract.primaryExchange or exchange)
+      frame = await self._executor.run(
+        functools.partial(resample_frame, anchor_to_session=bar_size is None),
+        frame,
+        target,
+        calendar,
+        items=len(frame),
+      )
+    return BarSeries.from_frame(frame)
 
+  async def iter_bulk_historical_bars(
+    self,
+    symbols: list[str],
+    sec_type: str,
+    exchange: str,
+    freq: str,
+    from_date: dt.date,
+    to_date: dt.date,
+    use_rth: bool = True,
+    currency: str = "USD",
+    output_dir: Path | None = None,
+    file_format: BarFileFormat = "csv",
+  ) -> AsyncIterator[list[BulkHistoryResult]]:
+    """Fetch bars for many symbols, yielding results as each symbol completes.
+
+    Contracts not already cached are qualified in batches, then fetches run
+    history_concurrency at a time under the pacing governor. Each result
+    carries completed/total progress; a symbol that fails to qualify or
+    fetch yields a result with an error instead of stopping the run.
+
+    Args:
+      symbols: Ticker symbols; duplicates are fetched once.
+      sec_type: Security type shared by all symbols.
+      exchange: Exchange shared by all symbols (e.g. SMART).
+      freq: Bar frequency, as for get_historical_bars.
+      from_date: First bar date (inclusive).
+      to_date: Last bar date (inclusive).
+      use_rth: Include regular trading hours only (default True).
+      currency: Currency code (default USD).
+      output_dir: If set, bars are written to
+        <output_dir>/<SYMBOL>_<freq>_<from>_<to>.<file_format> and results
+        carry the path instead of the bars.
+      file_format: csv or parquet (parquet needs pyarrow).
+
+    Raises:
+      ValueError: If freq is unrecognised or from_date is after to_date.
+
+    """
+    target = parse_freq(freq)
     if from_date > to_date:
       raise ValueError("from_date must not be after to_date")
-
     what_to_show = _WHAT_TO_SHOW.get(sec_type.upper(), "TRADES")
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    total = len(symbols)
+
+    await self._connect()
+    contracts = await self._qualify_symbols(symbols, sec_type, exchange, currency)
+
+    if output_dir is not None:
+      await asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(self.config.history_concurrency)
+
+    async def fetch(symbol: str, contract: Contract) -> BulkHistoryResult:
+      async with semaphore:
+        try:
+          bars = await self._contract_bars(
+            contract,
+            exchange,
+            freq,
+            target,
+            what_to_show,
+            use_rth,
+            from_date,
+            to_date,
+          )
+          path = None
+          if output_dir is not None:
+            path = output_dir / f"{symbol}_{freq}_{from_date}_{to_date}.{file_format}"
+            await self._executor.run(
+              bars.write,
+              path,
+              file_format,
+              process_safe=True,
+            )
+        except Exception as e:
+          logger.warning("Bulk history for {} failed: {!s}", symbol, e)
+          return BulkHistoryResult(symbol=symbol, conId=contract.conId, error=str(e))
+      return BulkHistoryResult(
+        symbol=symbol,
+        conId=contract.conId,
+        count=len(bars),
+        path=str(path) if path is not None else None,
+        bars=bars.to_columns() if path is None else None,
+      )
 
+    completed = 0
+    failed = [s for s in symbols if s not in contracts]
+    if failed:
+      completed = len(failed)
+      yield [
+        BulkHistoryResult(
+          symbol=s,
+          error="Contract could not be qualified",
+          completed=completed,
+          total=total,
+        )
+        for s in failed
+      ]
+
+    tasks = [asyncio.create_task(fetch(s, c)) for s, c in contracts.items()]
+    try:
+      for next_done in asyncio.as_completed(tasks):
+        result = await next_done
+        completed += 1
+        result.completed, result.total = completed, total
+        yield [result]
+    finally:
+      for task in tasks:
+        task.cancel()
+
+  async def _qualify_symbols(
+    self,
+    symbols: list[str],
+    sec_type: str,
+    exchange: str,
+    currency: str,
+  ) -> dict[str, Contract]:
+    """Return qualified contracts by symbol, qualifying uncached ones in batches.
+
+    Symbols that fail to qualify are missing from the result.
+    """
+    # Reuse cached contracts and qualify the rest in batches. ib_async
+    # qualifies contracts in place, so results map back by identity.
+    keys = {s: self._contract_key(s, sec_type, exchange, currency) for s in symbols}
+    contracts = {
+      s: self._contract_cache[keys[s]]
+      for s in symbols
+      if self._contract_cache.get(keys[s]) is not None
+    }
+    pending = [
+      Contract(symbol=s, secType=sec_type, exchange=exchange, currency=currency)
+      for s in symbols
+      if s not in contracts
+    ]
+    by_id = {id(c): c.symbol for c in pending}
+    t0 = time.monotonic()
+    async for batch in self._iter_qualified(pending):
+      for qualified in batch:
+        symbol = by_id[id(qualified)]
+        contracts[symbol] = self._contract_cache[keys[symbol]] = qualified
+    logger.debug(
+      "Bulk qualified {} of {} contracts in {:.2f}s",
+      len(contracts) - (len(symbols) - len(pending)),
+      len(pending),
+      time.monotonic() - t0,
+    )
+    return contracts
+
+  async def _fetch_bar_frame(
+    self,
+    contract: Contract,
+    bar_size: str,
+    what_to_show: str,
+    use_rth: bool,
+    from_date: dt.date,
+    to_date: dt.date,
+  ) -> pd.DataFrame:
+    """Request historical bars from IB and return them as a DataFrame."""
     # IB end datetime: end-of-day on to_date so all bars on that date are included.
     end_dt = dt.datetime.combine(to_date, dt.time(23, 59, 59))
 
@@ -178,33 +656,89 @@ class HistoryClient(IBClient):
     days = (to_date - from_date).days + 1
     duration = f"{math.ceil(days / 365)} Y" if days > 365 else f"{days} D"
 
-    await self._connect()
-
     t0 = time.monotonic()
-    contract = await self._qualify_contract(symbol, sec_type, exchange, currency)
-    logger.debug("qualify_contract took {:.2f}s", time.monotonic() - t0)
-
-    bars = await self.ib.reqHistoricalDataAsync(
-      contract,
-      endDateTime=end_dt,
-      durationStr=duration,
-      barSizeSetting=bar_size,
-      whatToShow=what_to_show,
-      useRTH=use_rth,
-      formatDate=1,
-      keepUpToDate=False,
-    )
+    async with self._pacing.acquire(call="reqHistoricalData"):
+      bars = await self.ib.reqHistoricalDataAsync(
+        contract,
+        endDateTime=end_dt,
+        durationStr=duration,
+        barSizeSetting=bar_size,
+        whatToShow=what_to_show,
+        useRTH=use_rth,
+        formatDate=1,
+        keepUpToDate=False,
+      )
 
     logger.debug(
-      "reqHistoricalData took {:.2f}s — received {} raw bars for {}/{} freq={} {}-{}",
+      "reqHistoricalData took {:.2f}s — received {} raw bars for {} size={} {}-{}",
       time.monotonic() - t0,
       len(bars),
-      symbol,
-      exchange,
-      freq,
+      contract.localSymbol or contract.symbol,
+      bar_size,
       from_date,
       to_date,
     )
     # IB's duration window is calendar days and may reach before from_date.
     # Post-filter to enforce the requested boundary.
-    return [_bar_to_model(b) for b in bars if _bar_date(b) >= from_date]
+    return bars_to_frame([b for b in bars if _bar_date(b) >= from_date])
+
+  async def iter_live_bars(
+    self,
+    symbol: str,
+    sec_type: str,
+    exchange: str,
+    freq: str,
+    use_rth: bool = True,
+    currency: str = "USD",
+    lookback_days: int = 1,
+  ) -> AsyncIterator[list[HistoricalBar]]:
+    """Yield the current window of bars, then each live bar update.
+
+    All listeners of the same contract, frequency and RTH setting share one
+    IB subscription: keepUpToDate historical bars, or 5-second real-time bars
+    for freq "5s". The subscription's bars also serve get_historical_bars.
+
+    Args:
+      symbol: Ticker symbol (e.g. "SPX", "VIX", "AAPL").
+      sec_type: Security type (IND, STK, ETF, FUT, CASH).
+      exchange: Primary exchange.
+      freq: "5s" or a frequency from FREQ_TO_BAR_SIZE.
+      use_rth: Include regular trading hours only (default True).
+      currency: Currency code (default USD).
+      lookback_days: History loaded when the subscription starts. Ignored
+        if the subscription is already running.
+
+    Yields:
+      The initial window of bars, then the latest (and just completed) bars
+      on every update.
+
+    Raises:
+      ValueError: If freq is unrecognised.
+      ConnectionError: If the subscription ends (e.g. IB disconnected).
+
+    """
+    if freq != REALTIME_FREQ and freq not in FREQ_TO_BAR_SIZE:
+      valid = [REALTIME_FREQ, *sorted(FREQ_TO_BAR_SIZE)]
+      msg = f"Unsupported frequency '{freq}'. Valid values: {valid}"
+      raise ValueError(msg)
+
+    await self._connect()
+    contract = await self._qualify_contract(symbol, sec_type, exchange, currency)
+    what_to_show = _WHAT_TO_SHOW.get(sec_type.upper(), "TRADES")
+    stream = await self._open_bar_stream(
+      contract,
+      freq,
+      what_to_show,
+      use_rth,
+      lookback_days,
+    )
+    queue = stream.listen()
+    try:
+      if initial := stream.snapshot():
+        yield initial
+      while (update := await queue.get()) is not None:
+        yield update
+      msg = f"Live bar subscription for {symbol} ended"
+      raise ConnectionError(msg)
+    finally:
+      self._release_bar_stream(stream, queue)
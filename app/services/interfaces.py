@@ -1,17 +1,25 @@
 """Main IB interface combining all functionality."""
 
+from app.core.tracing import trace_public_methods
+
 from .market_data import MarketDataClient
 from .contracts import ContractClient
 from .scanners import ScannerClient
 from .positions import PositionClient
 from .history import HistoryClient
+from .warmup import WarmupClient
 
 
+@trace_public_methods
 class IBInterface(
   MarketDataClient,
   ContractClient,
   ScannerClient,
   PositionClient,
   HistoryClient,
+  WarmupClient,
 ):
-  """Main IB interface combining all functionality."""
+  """Main IB interface combining all functionality.
+
+  Public async methods get a tracing span when tracing is enabled.
+  """
@@ -0,0 +1,248 @@
+"""Background job queue for long-running IB operations."""
+
+import asyncio
+import contextvars
+import datetime as dt
+import hashlib
+import heapq
+import itertools
+import json
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+from app.core.setup_logging import logger
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+# A job produces batches of result items (models or plain dicts).
+JobFactory = Callable[[], AsyncIterator[list[Any]]]
+
+_ACTIVE: frozenset[JobStatus] = frozenset({"queued", "running"})
+
+
+def _now() -> str:
+  return dt.datetime.now(dt.UTC).isoformat()
+
+
+@dataclass(eq=False)
+class Job:
+  """One submitted job and the results it has produced so far."""
+
+  id: str
+  kind: str
+  params: dict
+  key: str
+  priority: int
+  factory: JobFactory
+  status: JobStatus = "queued"
+  created_at: str = field(default_factory=_now)
+  started_at: str | None = None
+  finished_at: str | None = None
+  error: str | None = None
+  results: list[dict] = field(default_factory=list)
+  batches: int = 0
+  finished_monotonic: float | None = None
+  task: asyncio.Task | None = None
+  listeners: set[asyncio.Queue[list[dict] | None]] = field(default_factory=set)
+
+  @property
+  def done(self) -> bool:
+    """Return True once the job can no longer change."""
+    return self.status not in _ACTIVE
+
+  def publish(self, batch: list[dict] | None) -> None:
+    """Send a batch (None when the job ends) to every subscriber."""
+    for queue in self.listeners:
+      queue.put_nowait(batch)
+
+
+class JobManager:
+  """Runs submitted jobs on a bounded pool of workers, highest priority first.
+
+  Submitting the same kind and parameters while an identical job is queued
+  or running returns that job instead of starting another. Finished jobs
+  are kept for `ttl` seconds so clients can collect their results.
+  """
+
+  def __init__(self, workers: int, ttl: float) -> None:
+    """Initialize the manager; workers start with the first submission.
+
+    Args:
+      workers: Maximum number of jobs running at once.
+      ttl: Seconds a finished job is retained.
+
+    """
+    self.workers = workers
+    self.ttl = ttl
+    self._jobs: dict[str, Job] = {}
+    self._heap: list[tuple[int, int, Job]] = []
+    self._seq = itertools.count()
+    self._wakeup = asyncio.Condition()
+    self._worker_tasks: list[asyncio.Task] = []
+
+  @staticmethod
+  def job_key(kind: str, params: dict) -> str:
+    """Return the deduplication key for a kind and its parameters."""
+    payload = json.dumps([kind, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+  async def submit(
+    self,
+    kind: str,
+    params: dict,
+    factory: JobFactory,
+    priority: int = 0,
+  ) -> tuple[Job, bool]:
+    """Queue a job, or return the active job with identical parameters.
+
+    Returns:
+      The job and whether it was newly created.
+
+    """
+    self._prune()
+    key = self.job_key(kind, params)
+    for job in self._jobs.values():
+      if job.key == key and not job.done:
+        return job, False
+
+    self._start_workers()
+    job = Job(
+      id=uuid.uuid4().hex,
+      kind=kind,
+      params=params,
+      key=key,
+      priority=priority,
+      factory=factory,
+    )
+    self._jobs[job.id] = job
+    async with self._wakeup:
+      heapq.heappush(self._heap, (-priority, next(self._seq), job))
+      self._wakeup.notify()
+    logger.debug("Queued job {} kind={} priority={}", job.id, kind, priority)
+    return job, True
+
+  def get(self, job_id: str) -> Job | None:
+    """Return a job by id, or None if unknown or expired."""
+    self._prune()
+    return self._jobs.get(job_id)
+
+  def jobs(self) -> list[Job]:
+    """Return all retained jobs, newest first."""
+    self._prune()
+    return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+  async def cancel(self, job_id: str) -> Job | None:
+    """Cancel a queued or running job; returns the job, or None if unknown."""
+    job = self._jobs.get(job_id)
+    if job is None or job.done:
+      return job
+    if job.task is not None:
+      job.task.cancel()
+      # Let the job record its cancellation before reporting its status
+      await asyncio.wait([job.task])
+    else:
+      self._finish(job, "cancelled")
+    return job
+
+  async def iter_results(self, job: Job) -> AsyncIterator[list[dict]]:
+    """Yield the results produced so far, then each new batch until the job ends.
+
+    Raises:
+      RuntimeError: If the job failed or was cancelled.
+
+    """
+    queue: asyncio.Queue[list[dict] | None] = asyncio.Queue()
+    # A finished job publishes no more batches, not even the end sentinel
+    if job.done:
+      queue.put_nowait(None)
+    job.listeners.add(queue)
+    try:
+      if job.results:
+        yield list(job.results)
+      # Drain until the sentinel: batches published while the consumer was
+      # paused are still queued when the job is already done
+      while (batch := await queue.get()) is not None:
+        yield batch
+    finally:
+      job.listeners.discard(queue)
+    if job.status != "succeeded":
+      msg = job.error or f"Job {job.status}"
+      raise RuntimeError(msg)
+
+  async def stop(self) -> None:
+    """Cancel the workers and any running jobs."""
+    for job in self._jobs.values():
+      if job.task is not None and not job.done:
+        job.task.cancel()
+    for task in self._worker_tasks:
+      task.cancel()
+    await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+    self._worker_tasks.clear()
+
+  def _start_workers(self) -> None:
+    self._worker_tasks = [t for t in self._worker_tasks if not t.done()]
+    while len(self._worker_tasks) < self.workers:
+      # A fresh context, so the long-lived workers do not inherit the request
+      # stats and trace span of the request that happened to start them
+      self._worker_tasks.append(
+        asyncio.create_task(self._worker(), context=contextvars.Context()),
+      )
+
+  async def _worker(self) -> None:
+    while True:
+      async with self._wakeup:
+        await self._wakeup.wait_for(lambda: bool(self._heap))
+        _, _, job = heapq.heappop(self._heap)
+      if job.done:  # cancelled while queued
+        continue
+      job.task = asyncio.create_task(self._run(job))
+      await asyncio.wait([job.task])
+
+  async def _run(self, job: Job) -> None:
+    job.status = "running"
+    job.started_at = _now()
+    t0 = time.monotonic()
+    try:
+      async for batch in job.factory():
+        items = [
+          item.model_dump() if isinstance(item, BaseModel) else item for item in batch
+        ]
+        job.results.extend(items)
+        job.batches += 1
+        job.publish(items)
+    except asyncio.CancelledError:
+      self._finish(job, "cancelled")
+    except Exception as e:
+      logger.error("Job {} ({}) failed: {!s}", job.id, job.kind, e)
+      self._finish(job, "failed", str(e))
+    else:
+      self._finish(job, "succeeded")
+    logger.debug(
+      "Job {} {} in {:.2f}s with {} results",
+      job.id,
+      job.status,
+      time.monotonic() - t0,
+      len(job.results),
+    )
+
+  def _finish(self, job: Job, status: JobStatus, error: str | None = None) -> None:
+    job.status = status
+    job.error = error
+    job.finished_at = _now()
+    job.finished_monotonic = time.monotonic()
+    job.publish(None)
+
+  def _prune(self) -> None:
+    """Drop finished jobs older than the TTL."""
+    cutoff = time.monotonic() - self.ttl
+    for job_id in [
+      job.id
+      for job in self._jobs.values()
+      if job.finished_monotonic is not None and job.finished_monotonic < cutoff
+    ]:
+      del self._jobs[job_id]
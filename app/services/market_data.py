@@ -1,18 +1,217 @@
 """Market data operations."""
 
+from __future__ import annotations
+
 import asyncio
-import pandas as pd
+import contextlib
+import datetime as dt
+import json
+import math
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
 from ib_async import util
 from ib_async.contract import Contract
 
+from .cache import TTLCache
 from .client import IBClient
+from app.core.metrics import SUBSCRIPTIONS
+from .risk import OPTION_SEC_TYPES
 from app.core.setup_logging import logger
-from app.models import TickerData, GreeksData
+from app.core.tracing import set_attributes, span
+from app.models import (
+  ComboLegQuote,
+  ComboNativeQuote,
+  ComboQuote,
+  TickerData,
+  GreeksData,
+  OptionsChainSnapshot,
+)
+from app.core.lazy import lazy_import
+
+if TYPE_CHECKING:
+  from collections.abc import AsyncIterator
+
+  import pandas as pd
+  from ib_async.ticker import Ticker
+else:
+  pd = lazy_import("pandas")
+
+
+# Greek range criteria keys; each (min, max) pair is independent.
+_GREEK_FILTERS: dict[str, tuple[str, str]] = {
+  "delta": ("min_delta", "max_delta"),
+  "gamma": ("min_gamma", "max_gamma"),
+  "theta": ("min_theta", "max_theta"),
+  "vega": ("min_vega", "max_vega"),
+}
+
+
+def _filter_options(market_data: list[dict], criteria: dict | None) -> list[dict]:
+  """Return the ticker dicts whose greeks satisfy every requested range.
+
+  Rows missing a requested greek are always excluded.
+  """
+  filtered_data = pd.DataFrame(market_data)
+  for greek_name, (min_key, max_key) in _GREEK_FILTERS.items():
+    if not criteria or (min_key not in criteria and max_key not in criteria):
+      continue
+    filtered_data = filtered_data[
+      filtered_data["greeks"].apply(
+        lambda x, g=greek_name: bool(x and x.get(g) is not None),
+      )
+    ]
+    filtered_data = filtered_data[
+      filtered_data["greeks"].apply(
+        lambda x, g=greek_name, mn=min_key, mx=max_key: (
+          (mn not in criteria or x[g] >= criteria[mn])
+          and (mx not in criteria or x[g] <= criteria[mx])
+        ),
+      )
+    ]
+  return [
+    TickerData(
+      contractId=row["contractId"],
+      symbol=row["symbol"],
+      secType=row["secType"],
+      last=row["last"] if pd.notna(row["last"]) else None,
+      bid=row["bid"] if pd.notna(row["bid"]) else None,
+      ask=row["ask"] if pd.notna(row["ask"]) else None,
+      greeks=row["greeks"],
+    ).model_dump()
+    for _, row in filtered_data.iterrows()
+  ]
+
+
+def _matches_criteria(ticker: TickerData, criteria: dict | None) -> bool:
+  """Return True if the ticker's greeks satisfy every requested range.
+
+  Tickers missing a requested greek never match.
+  """
+  if not criteria:
+    return True
+  for greek_name, (min_key, max_key) in _GREEK_FILTERS.items():
+    if min_key not in criteria and max_key not in criteria:
+      continue
+    value = getattr(ticker.greeks, greek_name, None) if ticker.greeks else None
+    if value is None:
+      return False
+    if min_key in criteria and value < criteria[min_key]:
+      return False
+    if max_key in criteria and value > criteria[max_key]:
+      return False
+  return True
+
+
+def _value(v: float | None) -> float | None:
+  """Return v, or None if it is missing or NaN (IB sentinel for missing data)."""
+  return None if v is None or math.isnan(v) else v
+
+
+def _net_greeks(legs: list[tuple[int, Ticker]]) -> GreeksData | None:
+  """Sum (weight, ticker) legs into net greeks per combo unit.
+
+  Non-option legs count as delta 1; None if any option leg lacks greeks.
+  """
+  net = dict.fromkeys(("delta", "gamma", "vega", "theta"), 0.0)
+  for weight, ticker in legs:
+    if ticker.contract.secType not in OPTION_SEC_TYPES:
+      net["delta"] += weight
+      continue
+    greeks = ticker.modelGreeks
+    values = {g: _value(getattr(greeks, g)) if greeks else None for g in net}
+    if None in values.values():
+      return None
+    for greek, value in values.items():
+      net[greek] += weight * value
+  return GreeksData(**net)
+
+
+def _net_quote(legs: list[tuple[int, Ticker]]) -> tuple[float | None, float | None]:
+  """Return the net (bid, ask) of (weight, ticker) legs at leg quotes.
+
+  Buying the combo lifts the ask of bought legs and hits the bid of sold
+  ones; selling it does the reverse. A side is None if any quote it needs
+  is missing.
+  """
+  bid: float | None = 0.0
+  ask: float | None = 0.0
+  for weight, ticker in legs:
+    leg_bid, leg_ask = _value(ticker.bid), _value(ticker.ask)
+    buy_side, sell_side = (leg_ask, leg_bid) if weight > 0 else (leg_bid, leg_ask)
+    ask = None if ask is None or buy_side is None else ask + weight * buy_side
+    bid = None if bid is None or sell_side is None else bid + weight * sell_side
+  return bid, ask
 
 
 class MarketDataClient(IBClient):
   """Market data operations."""
 
+  def __init__(self) -> None:
+    """Initialize market data caches."""
+    super().__init__()
+    # Chain snapshots keyed by (underlying conId, filters JSON).
+    self._chain_snapshot_cache: TTLCache[tuple[int, str], OptionsChainSnapshot] = (
+      TTLCache(ttl=self.config.chain_snapshot_ttl, maxsize=64, name="chain_snapshot")
+    )
+    # Live BAG quote subscriptions keyed by (exchange, legs), least recently
+    # used first; the oldest is cancelled beyond combo_max_subscriptions.
+    self._combo_tickers: OrderedDict[tuple, Ticker] = OrderedDict()
+    self.ib.disconnectedEvent += self._combo_tickers.clear
+    SUBSCRIPTIONS.labels("combo_quote").set_function(lambda: len(self._combo_tickers))
+    # Snapshot batches in flight across all requests; each snapshot holds one
+    # of the account's market data lines.
+    self._ticker_slots = asyncio.Semaphore(self.config.ticker_concurrency)
+
+  async def _req_tickers_batched(self, contracts: list[Contract]) -> list[Ticker]:
+    """Request snapshot tickers in concurrent batches under the pacing governor.
+
+    Concurrency is capped separately, and shared by all callers, because
+    every snapshot in flight holds one of the account's market data lines.
+    """
+    size = self.config.ticker_batch_size
+
+    async def fetch(batch: list[Contract]) -> list[Ticker]:
+      async with (
+        self._ticker_slots,
+        self._pacing.acquire(len(batch), call="reqTickers"),
+      ):
+        return await self.ib.reqTickersAsync(*batch)
+
+    batches = await asyncio.gather(
+      *(fetch(contracts[i : i + size]) for i in range(0, len(contracts), size)),
+    )
+    return [ticker for batch in batches for ticker in batch]
+
+  async def _iter_priced(
+    self, contracts: list[Contract]
+  ) -> AsyncIterator[list[Ticker]]:
+    """Qualify and price contracts, yielding ticker batches as they complete.
+
+    Each qualified batch is priced as soon as qualification yields it, so
+    qualification and market data requests overlap.
+    """
+    queue: asyncio.Queue[list[Ticker] | None] = asyncio.Queue()
+
+    async def price(batch: list[Contract]) -> None:
+      await queue.put(await self._req_tickers_batched(batch))
+
+    async def produce() -> None:
+      try:
+        async with asyncio.TaskGroup() as group:
+          async for batch in self._iter_qualified(contracts):
+            group.create_task(price(batch))
+      finally:
+        queue.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+      while (batch := await queue.get()) is not None:
+        yield batch
+      await producer
+    finally:
+      producer.cancel()
+
   def _process_tickers(self, tickers: list[dict]) -> list[TickerData]:
     """Process tickers to extract required fields."""
     result = util.df(tickers)
@@ -73,19 +272,20 @@ class MarketDataClient(IBClient):
     try:
       await self._connect()
       contracts = [Contract(conId=contract_id) for contract_id in contract_ids]
-      qualified_contracts = await self.ib.qualifyContractsAsync(*contracts)
+      async with self._pacing.acquire(len(contracts), call="qualifyContracts"):
+        qualified_contracts = await self.ib.qualifyContractsAsync(*contracts)
 
       # First attempt to get tickers
-      if self._is_market_open():
-        logger.debug("Market is open, requesting live market data")
-        self.ib.reqMarketDataType(1)
-      else:
-        logger.debug("Market is closed, requesting delayed market data")
-        self.ib.reqMarketDataType(2)
-      tickers = await self.ib.reqTickersAsync(*qualified_contracts)
+      self._request_market_data_type()
+      logger.debug("Requesting market data type {}", self._market_data_type)
+      tickers = await self._req_tickers_batched(qualified_contracts)
 
       # Process tickers
-      result = self._process_tickers(tickers)
+      result = await self._executor.run(
+        self._process_tickers,
+        tickers,
+        items=len(tickers),
+      )
 
       # Check if we got any greeks data (only for options contracts)
       options_contracts = [ticker for ticker in result if ticker.secType == "OPT"]
@@ -101,14 +301,15 @@ class MarketDataClient(IBClient):
         await self._connect()
 
         # Second attempt
-        if self._is_market_open():
-          self.ib.reqMarketDataType(1)
-        else:
-          self.ib.reqMarketDataType(2)
-        tickers = await self.ib.reqTickersAsync(*qualified_contracts)
+        self._request_market_data_type()
+        tickers = await self._req_tickers_batched(qualified_contracts)
 
         # Process tickers again
-        result = self._process_tickers(tickers)
+        result = await self._executor.run(
+          self._process_tickers,
+          tickers,
+          items=len(tickers),
+        )
         # Check if we got greeks data after restart (only for options)
         options_contracts = [ticker for ticker in result if ticker.secType == "OPT"]
         has_greeks = False
@@ -141,11 +342,14 @@ class MarketDataClient(IBClient):
       underlying_con_id: ConID of the underlying contract.
       filters: Dictionary of filters to apply to the options chain,
       you must specify at least one filter to reduce the number of options in the chain,
-      you must specify expirations, you can specify tradingClass, strikes, and rights.
+      you must specify expirations or min_dte/max_dte, you can specify
+      tradingClass, strikes, rights and moneyness filters (see get_options_chain).
         - tradingClass: List of trading classes to filter by.
         - expirations: List of expirations to filter by.
         - strikes: List of strikes to filter by.
         - rights: List of rights to filter by.
+        - min_dte/max_dte: Days-to-expiration range instead of expirations.
+        - strike_range_pct, nearest_strikes, max_contracts: moneyness filters.
       criteria: Dictionary of criteria to match for any of the Greeks:
         - min/max_delta, min/max_gamma, min/max_theta, min/max_vega (float)
 
@@ -173,51 +377,288 @@ class MarketDataClient(IBClient):
         logger.warning("No market data available for options")
         return []
 
-      filtered_data = pd.DataFrame(market_data)
-
       # Apply greek range filters; each key pair is independent.
-      # Rows missing the requested greek are always excluded.
-      greek_filters = {
-        "delta": ("min_delta", "max_delta"),
-        "gamma": ("min_gamma", "max_gamma"),
-        "theta": ("min_theta", "max_theta"),
-        "vega": ("min_vega", "max_vega"),
-      }
-      for greek_name, (min_key, max_key) in greek_filters.items():
-        if not criteria or (min_key not in criteria and max_key not in criteria):
-          continue
-        filtered_data = filtered_data[
-          filtered_data["greeks"].apply(
-            lambda x, g=greek_name: bool(x and x.get(g) is not None),
-          )
-        ]
-        filtered_data = filtered_data[
-          filtered_data["greeks"].apply(
-            lambda x, g=greek_name, mn=min_key, mx=max_key: (
-              (mn not in criteria or x[g] >= criteria[mn])
-              and (mx not in criteria or x[g] <= criteria[mx])
-            ),
-          )
-        ]
-
-      if filtered_data.empty:
+      with span("filter_options", contracts=len(market_data)) as current:
+        filtered = await self._executor.run(
+          _filter_options,
+          market_data,
+          criteria,
+          items=len(market_data),
+          process_safe=True,
+        )
+        set_attributes(current, matched=len(filtered))
+
+    except Exception as e:
+      logger.error("Error filtering options: {}", str(e))
+      raise
+    else:
+      if not filtered:
         logger.warning("No options found matching the criteria")
-        return []
+      return filtered
 
-      filtered_tickers = [
-        TickerData(
-          contractId=row["contractId"],
-          symbol=row["symbol"],
-          secType=row["secType"],
-          last=row["last"] if pd.notna(row["last"]) else None,
-          bid=row["bid"] if pd.notna(row["bid"]) else None,
-          ask=row["ask"] if pd.notna(row["ask"]) else None,
-          greeks=row["greeks"],
-        )
-        for _, row in filtered_data.iterrows()
+  async def get_options_chain_snapshot(
+    self,
+    underlying_symbol: str,
+    underlying_sec_type: str,
+    underlying_con_id: int,
+    filters: dict | None = None,
+  ) -> OptionsChainSnapshot:
+    """Get a priced options chain (quotes and greeks) in columnar form.
+
+    Contracts are qualified in batches and each qualified batch is priced as
+    soon as it arrives, so qualification and market data requests overlap.
+    Results are cached for a short TTL per underlying and filter set.
+
+    Args:
+      underlying_symbol: Symbol of the underlying contract.
+      underlying_sec_type: Security type of the underlying contract.
+      underlying_con_id: ConID of the underlying contract.
+      filters: Options chain filters, see get_options_chain.
+
+    Returns:
+      OptionsChainSnapshot sorted by expiration, strike and right.
+
+    """
+    key = (underlying_con_id, json.dumps(filters or {}, sort_keys=True))
+    cached = self._chain_snapshot_cache.get(key)
+    if cached is not None:
+      return cached
+
+    try:
+      await self._connect()
+      # _resolve_option_contracts is provided by ContractClient via IBInterface MRO
+      contracts, spot = await self._resolve_option_contracts(
+        underlying_symbol,
+        underlying_sec_type,
+        underlying_con_id,
+        filters,
+      )
+      self._request_market_data_type()
+      tickers = [
+        ticker async for batch in self._iter_priced(contracts) for ticker in batch
       ]
-      return [ticker.model_dump() for ticker in filtered_tickers]
+    except Exception as e:
+      logger.error("Error getting options chain snapshot: {}", str(e))
+      raise
+
+    tickers.sort(
+      key=lambda t: (
+        t.contract.lastTradeDateOrContractMonth,
+        t.contract.strike,
+        t.contract.right,
+      ),
+    )
+    columns: dict[str, list] = {
+      name: []
+      for name in (
+        "contractId",
+        "symbol",
+        "tradingClass",
+        "expiration",
+        "strike",
+        "right",
+        "bid",
+        "ask",
+        "last",
+        "delta",
+        "gamma",
+        "vega",
+        "theta",
+        "impliedVol",
+      )
+    }
+    for ticker in tickers:
+      contract = ticker.contract
+      greeks = ticker.modelGreeks
+      columns["contractId"].append(contract.conId)
+      columns["symbol"].append(contract.localSymbol)
+      columns["tradingClass"].append(contract.tradingClass)
+      columns["expiration"].append(contract.lastTradeDateOrContractMonth)
+      columns["strike"].append(contract.strike)
+      columns["right"].append(contract.right)
+      columns["bid"].append(_value(ticker.bid))
+      columns["ask"].append(_value(ticker.ask))
+      columns["last"].append(_value(ticker.last))
+      for greek in ("delta", "gamma", "vega", "theta", "impliedVol"):
+        columns[greek].append(_value(getattr(greeks, greek)) if greeks else None)
+
+    snapshot = OptionsChainSnapshot(
+      underlying_con_id=underlying_con_id,
+      underlying_price=spot,
+      timestamp=dt.datetime.now(dt.UTC).isoformat(),
+      count=len(tickers),
+      **columns,
+    )
+    self._chain_snapshot_cache.set(key, snapshot)
+    return snapshot
+
+  async def iter_tickers(
+    self,
+    contract_ids: list[int],
+  ) -> AsyncIterator[list[TickerData]]:
+    """Yield tickers for contract IDs in batches as they arrive.
+
+    Unlike get_tickers this does not wait for the slowest contract and does
+    not retry via a gateway restart when greeks are missing.
+
+    Args:
+      contract_ids: List of contract IDs to get tickers for.
+
+    Yields:
+      Batches of TickerData in completion order.
+
+    """
+    await self._connect()
+    self._request_market_data_type()
+    contracts = [Contract(conId=contract_id) for contract_id in contract_ids]
+    async for tickers in self._iter_priced(contracts):
+      if tickers:
+        yield await self._executor.run(
+          self._process_tickers,
+          tickers,
+          items=len(tickers),
+        )
+
+  async def iter_filtered_options(
+    self,
+    underlying_symbol: str,
+    underlying_sec_type: str,
+    underlying_con_id: int,
+    filters: dict | None = None,
+    criteria: dict | None = None,
+  ) -> AsyncIterator[list[TickerData]]:
+    """Yield option tickers matching criteria in batches as they are priced.
+
+    Args:
+      underlying_symbol: Symbol of the underlying contract.
+      underlying_sec_type: Security type of the underlying contract.
+      underlying_con_id: ConID of the underlying contract.
+      filters: Options chain filters, see get_and_filter_options.
+      criteria: Greek range criteria, see get_and_filter_options.
 
+    Yields:
+      Non-empty batches of matching TickerData in completion order.
+
+    """
+    await self._connect()
+    # _resolve_option_contracts is provided by ContractClient via IBInterface MRO
+    contracts, _ = await self._resolve_option_contracts(
+      underlying_symbol,
+      underlying_sec_type,
+      underlying_con_id,
+      filters,
+    )
+    self._request_market_data_type()
+    async for tickers in self._iter_priced(contracts):
+      if not tickers:
+        continue
+      processed = await self._executor.run(
+        self._process_tickers,
+        tickers,
+        items=len(tickers),
+      )
+      matched = [t for t in processed if _matches_criteria(t, criteria)]
+      if matched:
+        yield matched
+
+  async def _combo_ticker(self, combo: Contract) -> Ticker:
+    """Return the live quote of a BAG contract, subscribing on first use.
+
+    A new subscription waits up to combo_quote_timeout for its first quote.
+    """
+    key = (
+      combo.exchange,
+      tuple((leg.conId, leg.action, leg.ratio) for leg in combo.comboLegs),
+    )
+    if key in self._combo_tickers:
+      self._combo_tickers.move_to_end(key)
+      return self._combo_tickers[key]
+
+    async with self._pacing.acquire(call="reqMktData"):
+      ticker = self.ib.reqMktData(combo)
+    self._combo_tickers[key] = ticker
+    while len(self._combo_tickers) > self.config.combo_max_subscriptions:
+      _, oldest = self._combo_tickers.popitem(last=False)
+      self.ib.cancelMktData(oldest.contract)
+
+    quoted = asyncio.Event()
+
+    def check(_: object = None) -> None:
+      if _value(ticker.bid) is not None or _value(ticker.ask) is not None:
+        quoted.set()
+
+    ticker.updateEvent += check
+    try:
+      check()
+      with contextlib.suppress(TimeoutError):
+        await asyncio.wait_for(quoted.wait(), self.config.combo_quote_timeout)
+    finally:
+      ticker.updateEvent -= check
+    return ticker
+
+  async def get_combo_quote(
+    self,
+    legs: list[tuple[int, str, int]],
+    exchange: str = "SMART",
+    native_quote: bool = False,
+  ) -> ComboQuote:
+    """Price a combo from its legs' quotes and greeks.
+
+    Legs are qualified through the conId cache and priced with one
+    concurrent ticker request; net bid, ask and greeks are weighted by ratio,
+    positive for BUY legs and negative for SELL legs.
+
+    Args:
+      legs: (contract ID, "BUY" or "SELL", ratio) per leg.
+      exchange: Exchange for the BAG contract.
+      native_quote: Also subscribe to IB's quote for the BAG contract; the
+        subscription is kept so repeat calls read it locally.
+
+    Returns:
+      ComboQuote with per-leg quotes, net bid/ask/mid and net greeks.
+
+    """
+    try:
+      await self._connect()
+      # _combo_contract is provided by ContractClient via IBInterface MRO
+      combo, contracts = await self._combo_contract(legs, exchange)
+      self._request_market_data_type()
+      unique = list({contract.conId: contract for contract in contracts}.values())
+      if native_quote:
+        tickers, native = await asyncio.gather(
+          self._req_tickers_batched(unique),
+          self._combo_ticker(combo),
+        )
+      else:
+        tickers, native = await self._req_tickers_batched(unique), None
     except Exception as e:
-      logger.error("Error filtering options: {}", str(e))
+      logger.error("Error getting combo quote: {}", str(e))
       raise
+
+    by_con_id = {ticker.contract.conId: ticker for ticker in tickers}
+    weighted = [
+      (ratio if action.upper() == "BUY" else -ratio, by_con_id[contract.conId])
+      for contract, (_, action, ratio) in zip(contracts, legs, strict=True)
+    ]
+    bid, ask = _net_quote(weighted)
+    leg_quotes = self._process_tickers([ticker for _, ticker in weighted])
+    return ComboQuote(
+      timestamp=dt.datetime.now(dt.UTC).isoformat(),
+      legs=[
+        ComboLegQuote(
+          **quote.model_dump(exclude={"secType"}), action=action, ratio=ratio
+        )
+        for quote, (_, action, ratio) in zip(leg_quotes, legs, strict=True)
+      ],
+      bid=bid,
+      ask=ask,
+      mid=(bid + ask) / 2 if bid is not None and ask is not None else None,
+      greeks=_net_greeks(weighted),
+      native=ComboNativeQuote(
+        bid=_value(native.bid),
+        ask=_value(native.ask),
+        last=_value(native.last),
+      )
+      if native is not None
+      else None,
+    )
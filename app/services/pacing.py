@@ -0,0 +1,91 @@
+"""Pacing governor shared by all IB API requests."""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator
+
+from app.core.metrics import (
+  IB_REQUEST_ERRORS,
+  IB_REQUEST_SECONDS,
+  PACING_IN_FLIGHT,
+  PACING_WAIT_SECONDS,
+  PACING_WAITING,
+)
+from app.core.request_stats import record_ib_call
+from app.core.tracing import span
+
+
+class PacingGovernor:
+  """Token-bucket message limiter with a cap on concurrent requests.
+
+  IB Gateway disconnects clients that send more than ~50 messages per second,
+  so every outgoing request takes one token per message it sends. Tokens
+  refill continuously at `rate` per second up to `burst`. The wait for a
+  slot and the time the slot is held (the IB round trip) are recorded per
+  call type, traced as an "ib.<call>" span and added to the current
+  request's stats.
+  """
+
+  def __init__(self, rate: float, burst: int, max_concurrent: int) -> None:
+    """Initialize the governor.
+
+    Args:
+      rate: Messages per second allowed on average.
+      burst: Maximum number of messages that may be sent back-to-back.
+      max_concurrent: Maximum number of requests in flight at once.
+
+    """
+    self.rate = rate
+    self.burst = max(1, burst)
+    self._tokens = float(self.burst)
+    self._updated = time.monotonic()
+    self._lock = asyncio.Lock()
+    self._semaphore = asyncio.Semaphore(max_concurrent)
+
+  def _refill(self) -> None:
+    now = time.monotonic()
+    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+    self._updated = now
+
+  async def _take(self, weight: int) -> None:
+    """Wait until `weight` tokens have been consumed."""
+    async with self._lock:
+      remaining = weight
+      while remaining > 0:
+        self._refill()
+        chunk = min(remaining, self.burst)
+        if self._tokens < chunk:
+          await asyncio.sleep((chunk - self._tokens) / self.rate)
+          self._refill()
+        self._tokens -= chunk
+        remaining -= chunk
+
+  @contextlib.asynccontextmanager
+  async def acquire(self, weight: int = 1, call: str = "other") -> AsyncIterator[None]:
+    """Hold a request slot after paying for `weight` outgoing messages.
+
+    Args:
+      weight: Number of IB messages the request sends.
+      call: IB call type used to label the metrics (e.g. "qualify").
+
+    """
+    queued = time.perf_counter()
+    async with contextlib.AsyncExitStack() as stack:
+      with PACING_WAITING.track_inprogress():
+        await stack.enter_async_context(self._semaphore)
+        await self._take(weight)
+      waited = time.perf_counter() - queued
+      PACING_WAIT_SECONDS.labels(call).observe(waited)
+      attributes = {"ib.messages": weight, "ib.pacing_wait_s": waited}
+      started = time.perf_counter()
+      try:
+        with (
+          span(f"ib.{call}", **attributes),
+          PACING_IN_FLIGHT.track_inprogress(),
+          IB_REQUEST_SECONDS.labels(call).time(),
+          IB_REQUEST_ERRORS.labels(call).count_exceptions(),
+        ):
+          yield
+      finally:
+        record_ib_call(weight, waited, time.perf_counter() - started)
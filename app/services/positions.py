@@ -1,45 +1,271 @@
-"""Position operations."""
+"""Position and account operations."""
 
-import pandas as pd
-from ib_async import util
+from __future__ import annotations
 
+import asyncio
+import datetime as dt
+from typing import TYPE_CHECKING
+
+from ib_async.contract import Contract
+
+from .account import AccountMirror
 from .client import IBClient
+from .risk import (
+  DEFAULT_SPOT_SHOCKS,
+  DEFAULT_VOL_SHOCKS,
+  RiskLegs,
+  aggregate_risk,
+  has_risk_data,
+)
+from app.core.lazy import lazy_import
+from app.core.metrics import SUBSCRIPTIONS
 from app.core.setup_logging import logger
+from app.models.risk import PortfolioRisk, RiskExposure
+
+if TYPE_CHECKING:
+  from collections.abc import Awaitable, Callable
+
+  import numpy as np
+  from ib_async.objects import Position
+  from ib_async.ticker import Ticker
+
+  from app.models.account import AccountPnL, AccountSummaryValue, PortfolioPosition
+else:
+  np = lazy_import("numpy")
 
 
 class PositionClient(IBClient):
-  """Position operations.
+  """Position and account operations.
+
+  Positions, portfolio, PnL and account summary are served from an
+  AccountMirror that IB events keep current; the first call after connecting
+  seeds it and starts the PnL and account summary subscriptions.
 
   Available public methods:
     - get_positions: get account positions
+    - get_portfolio: get positions with market value and PnL
+    - get_pnl: get account-level PnL
+    - get_account_summary: get account summary values
+    - get_portfolio_risk: get portfolio greeks and scenario PnL
 
   """
 
+  def __init__(self) -> None:
+    """Initialize the account mirror and subscribe it to IB events."""
+    super().__init__()
+    self._account = AccountMirror()
+    self._account_sync_lock = asyncio.Lock()
+    # Streaming market data for held contracts, keyed by conId, so repeated
+    # risk requests read live greeks without new IB requests.
+    self._risk_tickers: dict[int, Ticker] = {}
+    self.ib.positionEvent += self._on_position
+    self.ib.updatePortfolioEvent += self._account.on_portfolio
+    self.ib.pnlEvent += self._account.on_pnl
+    self.ib.pnlSingleEvent += self._account.on_pnl_single
+    self.ib.accountSummaryEvent += self._account.on_account_summary
+    # IB subscriptions end with the connection; re-seed after reconnecting.
+    self.ib.disconnectedEvent += self._account.clear
+    self.ib.disconnectedEvent += self._risk_tickers.clear
+    SUBSCRIPTIONS.labels("portfolio_risk").set_function(lambda: len(self._risk_tickers))
+
+  def _on_position(self, position: Position) -> None:
+    """Update the mirror and keep per-position PnL subscriptions in step."""
+    account, con_id = key = (position.account, position.contract.conId)
+    opened = position.position != 0 and not self._account.has_position(key)
+    closed = position.position == 0 and self._account.has_position(key)
+    self._account.on_position(position)
+    if not self._account.synced:
+      return
+    if opened:
+      self.ib.reqPnLSingle(account, "", con_id)
+    elif closed:
+      self.ib.cancelPnLSingle(account, "", con_id)
+
+  async def _sync_account(self) -> None:
+    """Connect and, once per connection, seed the mirror from IB."""
+    await self._connect()
+    if self._account.synced:
+      return
+    async with self._account_sync_lock:
+      if self._account.synced:
+        return
+      # ib_async requests positions and account updates on connect.
+      for position in self.ib.positions():
+        self._account.on_position(position)
+      for item in self.ib.portfolio():
+        self._account.on_portfolio(item)
+      # Subscribes only while ib_async holds no summary, i.e. once per
+      # connection; later updates arrive as accountSummaryEvent.
+      async with self._pacing.acquire(call="reqAccountSummary"):
+        summary = await self.ib.accountSummaryAsync()
+      for value in summary:
+        self._account.on_account_summary(value)
+      for account in self.ib.managedAccounts():
+        async with self._pacing.acquire(call="reqPnL"):
+          self._account.on_pnl(self.ib.reqPnL(account))
+      for account, con_id in self._account.position_keys():
+        async with self._pacing.acquire(call="reqPnLSingle"):
+          self.ib.reqPnLSingle(account, "", con_id)
+      self._account.synced = True
+      logger.debug(
+        "Account mirror synced: {} positions",
+        len(self._account.position_keys()),
+      )
+
+  def readiness_checks(self) -> dict[str, bool]:
+    """Add whether the account subscriptions are seeded and streaming."""
+    return {
+      **super().readiness_checks(),
+      "subscriptions": self.ib.isConnected() and self._account.synced,
+    }
+
+  def _prepare_steps(self) -> dict[str, Callable[[], Awaitable[object]]]:
+    """Add seeding the account mirror and its PnL subscriptions."""
+    return {**super()._prepare_steps(), "subscriptions": self._sync_account}
+
   async def get_positions(self) -> list[dict]:
     """Get account positions."""
     try:
-      await self._connect()
-      positions = util.df(self.ib.positions())
-      if positions.empty:
-        return []
-
-      # Safely handle multiplier conversion with error checking
-      def safe_cost_calculation(row: pd.Series) -> float:
-        try:
-          multiplier = float(row["contract"].multiplier or 1)
-          return row["avgCost"] / multiplier
-        except (ValueError, TypeError, AttributeError):
-          logger.warning(f"Invalid multiplier {row['contract'].localSymbol}, using 1")
-          return row["avgCost"]
-
-      positions["contractId"] = positions["contract"].apply(lambda x: x.conId)
-      positions["avgCost"] = positions.apply(safe_cost_calculation, axis=1)
-      positions["contract"] = positions["contract"].apply(lambda x: x.localSymbol)
-
-      # Remove sensitive information
-      del positions["account"]
+      await self._sync_account()
     except Exception as e:
       logger.error("Error getting positions: {}", str(e))
       raise
     else:
-      return positions.to_dict(orient="records")
+      return self._account.positions()
+
+  async def get_portfolio(self) -> list[PortfolioPosition]:
+    """Get positions with market price, market value and PnL."""
+    await self._sync_account()
+    return self._account.portfolio()
+
+  async def get_pnl(self) -> list[AccountPnL]:
+    """Get account-level daily, unrealized and realized PnL."""
+    await self._sync_account()
+    return self._account.pnl()
+
+  async def get_account_summary(self) -> list[AccountSummaryValue]:
+    """Get account summary values (NetLiquidation, BuyingPower, …)."""
+    await self._sync_account()
+    return self._account.account_summary()
+
+  async def _held_tickers(self, contracts: dict[int, Contract]) -> dict[int, Ticker]:
+    """Return live tickers for held contracts, subscribing to new ones.
+
+    Subscriptions of contracts no longer held are cancelled. New
+    subscriptions are given up to risk_greeks_timeout seconds to deliver
+    greeks (options) or a price (everything else).
+    """
+    for con_id in set(self._risk_tickers) - set(contracts):
+      self.ib.cancelMktData(self._risk_tickers.pop(con_id).contract)
+    new = [con_id for con_id in contracts if con_id not in self._risk_tickers]
+    if not new:
+      return self._risk_tickers
+
+    # Position contracts carry no exchange; market data needs a qualified one.
+    unknown = [Contract(conId=c) for c in new if c not in self._con_id_cache]
+    for contract in await self._qualify_contracts_bulk(unknown):
+      self._con_id_cache[contract.conId] = contract
+    self._request_market_data_type()
+    started = []
+    for con_id in new:
+      if con_id not in self._con_id_cache:
+        continue
+      async with self._pacing.acquire(call="reqMktData"):
+        # A concurrent request may have subscribed while this one awaited;
+        # a second subscription would leak a market data line.
+        if con_id in self._risk_tickers:
+          continue
+        ticker = self.ib.reqMktData(self._con_id_cache[con_id])
+      self._risk_tickers[con_id] = ticker
+      started.append(ticker)
+
+    ready = asyncio.Event()
+
+    def check(_: object = None) -> None:
+      if all(map(has_risk_data, started)):
+        ready.set()
+
+    self.ib.pendingTickersEvent += check
+    try:
+      check()
+      await asyncio.wait_for(ready.wait(), self.config.risk_greeks_timeout)
+    except TimeoutError:
+      logger.warning(
+        "Risk data incomplete after {}s; missing legs are reported",
+        self.config.risk_greeks_timeout,
+      )
+    finally:
+      self.ib.pendingTickersEvent -= check
+    logger.debug("Streaming risk data for {} new contracts", len(started))
+    return self._risk_tickers
+
+  async def get_portfolio_risk(
+    self,
+    spot_shocks: list[float] | None = None,
+    vol_shocks: list[float] | None = None,
+  ) -> PortfolioRisk:
+    """Get delta, gamma, vega, theta and scenario PnL per underlying.
+
+    Positions come from the account mirror and greeks from streaming market
+    data subscriptions that stay open while a contract is held, so only
+    newly held contracts cost IB requests.
+
+    Args:
+      spot_shocks: Relative spot moves for the scenario grid rows.
+      vol_shocks: Absolute implied volatility moves for the grid columns.
+
+    Returns:
+      PortfolioRisk with per-underlying and total exposure.
+
+    """
+    spot_grid = np.asarray(spot_shocks or DEFAULT_SPOT_SHOCKS, dtype=float)
+    vol_grid = np.asarray(vol_shocks or DEFAULT_VOL_SHOCKS, dtype=float)
+    try:
+      await self._sync_account()
+      held = self._account.holdings()
+      tickers = await self._held_tickers(
+        {con_id: contract for con_id, (contract, _) in held.items()},
+      )
+    except Exception as e:
+      logger.error("Error getting portfolio risk: {}", str(e))
+      raise
+
+    legs = RiskLegs.from_tickers(
+      [
+        (size, tickers[con_id])
+        for con_id, (_, size) in held.items()
+        if con_id in tickers
+      ],
+    )
+    risk = aggregate_risk(legs, spot_grid, vol_grid)
+    underlyings = [
+      RiskExposure(
+        underlying=name,
+        legs=int(risk.legs[i]),
+        spot=None if np.isnan(risk.spot[i]) else float(risk.spot[i]),
+        delta=float(risk.delta[i]),
+        gamma=float(risk.gamma[i]),
+        vega=float(risk.vega[i]),
+        theta=float(risk.theta[i]),
+        dollarDelta=float(risk.dollar_delta[i]),
+        dollarGamma=float(risk.dollar_gamma[i]),
+        scenarioPnL=risk.scenario_pnl[i].tolist(),
+      )
+      for i, name in enumerate(risk.underlyings)
+    ]
+    total = RiskExposure(
+      legs=len(legs.con_id),
+      vega=float(risk.vega.sum()),
+      theta=float(risk.theta.sum()),
+      dollarDelta=float(risk.dollar_delta.sum()),
+      dollarGamma=float(risk.dollar_gamma.sum()),
+      scenarioPnL=risk.scenario_pnl.sum(axis=0).tolist(),
+    )
+    return PortfolioRisk(
+      timestamp=dt.datetime.now(dt.UTC).isoformat(),
+      spotShocks=spot_grid.tolist(),
+      volShocks=vol_grid.tolist(),
+      total=total,
+      underlyings=underlyings,
+      missing=legs.missing + [c for c in held if c not in tickers],
+    )
@@ -0,0 +1,162 @@
+"""Vectorized OHLCV resampling aligned to exchange sessions."""
+
+from __future__ import annotations
+
+import datetime as dt
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from app.core.lazy import lazy_import
+
+if TYPE_CHECKING:
+  import exchange_calendars as ecals
+  import pandas as pd
+  from ib_async.objects import BarData
+else:
+  ecals = lazy_import("exchange_calendars")
+  pd = lazy_import("pandas")
+
+_FREQ_PATTERN = re.compile(r"^(\d+)(min|h|d|w|M)$")
+
+BAR_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+@dataclass(frozen=True)
+class BarFreq:
+  """Parsed bar frequency such as 3min, 2h, 1d, 1w, 1M or session."""
+
+  count: int
+  unit: str  # "min", "h", "d", "w", "M" or "session"
+
+  @property
+  def intraday(self) -> bool:
+    """Return True for minute and hour frequencies."""
+    return self.unit in {"min", "h"}
+
+  @property
+  def minutes(self) -> int:
+    """Return the bar length in minutes (intraday frequencies only)."""
+    return self.count * 60 if self.unit == "h" else self.count
+
+
+def parse_freq(freq: str) -> BarFreq:
+  """Parse a frequency string like "3min", "2h", "1d", "1w", "1M" or "session".
+
+  Raises:
+    ValueError: If the string is not a valid frequency.
+
+  """
+  if freq == "session":
+    return BarFreq(1, "session")
+  match = _FREQ_PATTERN.match(freq)
+  if match is None or int(match.group(1)) < 1:
+    msg = (
+      f"Unsupported frequency '{freq}'. Use <N>min, <N>h, <N>d, <N>w, <N>M or session"
+    )
+    raise ValueError(msg)
+  return BarFreq(int(match.group(1)), match.group(2))
+
+
+def bars_to_frame(bars: list[BarData]) -> pd.DataFrame:
+  """Convert ib_async bars to a DataFrame with BAR_COLUMNS.
+
+  Volume is NaN where IB reports none (-1 or 0, e.g. for indices).
+  """
+  frame = pd.DataFrame(
+    {
+      "timestamp": [bar.date for bar in bars],
+      "open": [bar.open for bar in bars],
+      "high": [bar.high for bar in bars],
+      "low": [bar.low for bar in bars],
+      "close": [bar.close for bar in bars],
+      "volume": [bar.volume for bar in bars],
+    },
+    columns=BAR_COLUMNS,
+  )
+  frame["volume"] = frame["volume"].astype(float).where(frame["volume"] > 0)
+  return frame
+
+
+def _session_anchors(
+  local: pd.DatetimeIndex,
+  calendar: ecals.ExchangeCalendar,
+) -> pd.DatetimeIndex:
+  """Return, per bar, the session open of its local date (midnight if closed)."""
+  days = local.normalize()
+  anchors = {}
+  for day in days.unique():
+    date = day.date()
+    if calendar.is_session(date):
+      anchors[day] = calendar.session_open(date).tz_convert(local.tz)
+    else:
+      anchors[day] = day
+  return pd.DatetimeIndex(days.map(anchors))
+
+
+def _session_dates(timestamps: pd.Series) -> pd.DatetimeIndex:
+  """Return the local calendar date of each bar as a naive DatetimeIndex."""
+  return pd.DatetimeIndex(
+    [t.date() if isinstance(t, dt.datetime) else t for t in timestamps],
+  )
+
+
+def resample_frame(
+  frame: pd.DataFrame,
+  freq: BarFreq,
+  calendar: ecals.ExchangeCalendar,
+  anchor_to_session: bool = False,
+) -> pd.DataFrame:
+  """Aggregate finer OHLCV bars into coarser bars.
+
+  Intraday buckets are aligned to the local clock (matching IB's native bar
+  grid) or, with anchor_to_session, to each session's open so that custom
+  sizes such as 2h start at the opening bell. Day-level frequencies group by
+  session date: session/Nd combine N consecutive sessions, Nw and NM use
+  calendar weeks and months. Each output bar is stamped with the time of
+  its first input bar.
+
+  Args:
+    frame: Bars with BAR_COLUMNS ordered oldest-first. Intraday timestamps
+      must be timezone-aware.
+    freq: Target frequency; must be a multiple of the input bar size.
+    calendar: Exchange calendar used for session opens.
+    anchor_to_session: Align intraday buckets to session opens.
+
+  Returns:
+    Resampled bars with BAR_COLUMNS.
+
+  """
+  if frame.empty:
+    return frame
+  timestamps = frame["timestamp"]
+  if freq.intraday:
+    local = pd.DatetimeIndex(timestamps)
+    anchors = (
+      _session_anchors(local, calendar) if anchor_to_session else local.normalize()
+    )
+    rule = pd.Timedelta(minutes=freq.minutes)
+    keys = (anchors + ((local - anchors) // rule) * rule).asi8
+  else:
+    dates = _session_dates(timestamps)
+    if freq.unit in {"session", "d"}:
+      codes, _ = pd.factorize(dates, sort=True)
+      keys = codes // freq.count
+    else:
+      period = "W" if freq.unit == "w" else "M"
+      keys = dates.to_period(period).asi8 // freq.count
+
+  grouped = frame.groupby(keys, sort=True)
+  result = grouped.agg(
+    timestamp=("timestamp", "first"),
+    open=("open", "first"),
+    high=("high", "max"),
+    low=("low", "min"),
+    close=("close", "last"),
+  )
+  result["volume"] = grouped["volume"].sum(min_count=1)
+  if not freq.intraday:
+    result["timestamp"] = [
+      t.date() if isinstance(t, dt.datetime) else t for t in result["timestamp"]
+    ]
+  return result.reset_index(drop=True)[BAR_COLUMNS]
@@ -0,0 +1,176 @@
+"""Vectorized portfolio greeks and scenario PnL."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from app.core.lazy import lazy_import
+
+if TYPE_CHECKING:
+  import numpy as np
+  from ib_async.contract import Contract
+  from ib_async.ticker import Ticker
+else:
+  np = lazy_import("numpy")
+
+# Security types whose exposure comes from model greeks; everything else is
+# treated as linear (delta 1 per unit of multiplier).
+OPTION_SEC_TYPES = frozenset({"OPT", "FOP"})
+
+DEFAULT_SPOT_SHOCKS = (-0.1, -0.05, -0.02, 0.0, 0.02, 0.05, 0.1)
+DEFAULT_VOL_SHOCKS = (-0.05, 0.0, 0.05)
+
+
+def has_risk_data(ticker: Ticker) -> bool:
+  """Return True once a ticker carries what the risk computation needs."""
+  if ticker.contract.secType in OPTION_SEC_TYPES:
+    greeks = ticker.modelGreeks
+    return greeks is not None and greeks.delta is not None
+  return not math.isnan(ticker.marketPrice())
+
+
+def _multiplier(contract: Contract) -> float:
+  try:
+    return float(contract.multiplier or 1)
+  except ValueError:
+    return 1.0
+
+
+def _float(v: float | None) -> float:
+  return math.nan if v is None else float(v)
+
+
+@dataclass(frozen=True)
+class RiskLegs:
+  """Per-leg exposure as parallel arrays, one row per held contract.
+
+  Greeks are per contract unit as reported by IB; `size` is the position
+  times the contract multiplier, so size * greek is the leg's exposure.
+  """
+
+  con_id: np.ndarray
+  underlying: np.ndarray
+  size: np.ndarray
+  spot: np.ndarray
+  delta: np.ndarray
+  gamma: np.ndarray
+  vega: np.ndarray
+  theta: np.ndarray
+
+  @classmethod
+  def from_tickers(cls, holdings: list[tuple[float, Ticker]]) -> RiskLegs:
+    """Build legs from (position, live ticker) pairs.
+
+    Options without model greeks, and linear legs without a price, get NaN
+    greeks and are reported by `missing`.
+    """
+    n = len(holdings)
+    con_id = np.empty(n, dtype=np.int64)
+    underlying = np.empty(n, dtype=object)
+    size = np.empty(n)
+    values = np.full((5, n), np.nan)  # spot, delta, gamma, vega, theta
+    for i, (position, ticker) in enumerate(holdings):
+      contract = ticker.contract
+      con_id[i] = contract.conId
+      underlying[i] = contract.symbol
+      size[i] = position * _multiplier(contract)
+      if contract.secType in OPTION_SEC_TYPES:
+        greeks = ticker.modelGreeks
+        if greeks is not None:
+          values[:, i] = [
+            _float(greeks.undPrice),
+            _float(greeks.delta),
+            _float(greeks.gamma),
+            _float(greeks.vega),
+            _float(greeks.theta),
+          ]
+      elif not math.isnan(price := ticker.marketPrice()):
+        values[:, i] = [price, 1.0, 0.0, 0.0, 0.0]
+    spot, delta, gamma, vega, theta = values
+    return cls(con_id, underlying, size, spot, delta, gamma, vega, theta)
+
+  @property
+  def missing(self) -> list[int]:
+    """Return the contract IDs with no greeks (or, if linear, no price)."""
+    return self.con_id[np.isnan(self.delta)].tolist()
+
+
+@dataclass(frozen=True)
+class RiskAggregate:
+  """Exposure summed per underlying; row i of every array is underlyings[i].
+
+  Delta and gamma are in underlying units, vega in currency per vol point,
+  theta in currency per day. scenario_pnl has shape
+  (underlyings, spot shocks, vol shocks).
+  """
+
+  underlyings: list[str]
+  legs: np.ndarray
+  spot: np.ndarray
+  delta: np.ndarray
+  gamma: np.ndarray
+  vega: np.ndarray
+  theta: np.ndarray
+  dollar_delta: np.ndarray
+  dollar_gamma: np.ndarray
+  scenario_pnl: np.ndarray
+
+
+def aggregate_risk(
+  legs: RiskLegs,
+  spot_shocks: np.ndarray,
+  vol_shocks: np.ndarray,
+) -> RiskAggregate:
+  """Sum leg greeks per underlying and revalue them over a shock grid.
+
+  Scenario PnL uses the delta-gamma-vega expansion
+  delta * dS + gamma * dS**2 / 2 + vega * dVol, with dS a relative move of
+  the underlying's spot and dVol an absolute implied volatility change
+  (0.05 is five vol points). Legs with missing data contribute nothing.
+
+  Args:
+    legs: Per-leg exposure.
+    spot_shocks: Relative spot moves, e.g. [-0.1, 0, 0.1].
+    vol_shocks: Absolute implied volatility moves, e.g. [-0.05, 0, 0.05].
+
+  """
+  underlyings, group = np.unique(legs.underlying.astype(str), return_inverse=True)
+  count = len(underlyings)
+
+  def total(values: np.ndarray) -> np.ndarray:
+    return np.bincount(group, weights=values, minlength=count)
+
+  # One spot per underlying: the mean of the prices its legs report.
+  priced = ~np.isnan(legs.spot)
+  with np.errstate(invalid="ignore", divide="ignore"):
+    spot = total(np.where(priced, legs.spot, 0.0)) / total(priced.astype(float))
+  leg_spot = np.nan_to_num(spot[group])
+
+  delta = np.nan_to_num(legs.delta) * legs.size
+  gamma = np.nan_to_num(legs.gamma) * legs.size
+  vega = np.nan_to_num(legs.vega) * legs.size
+  theta = np.nan_to_num(legs.theta) * legs.size
+
+  move = leg_spot[:, None] * spot_shocks[None, :]
+  spot_pnl = delta[:, None] * move + 0.5 * gamma[:, None] * move**2
+  vol_pnl = vega[:, None] * (vol_shocks[None, :] * 100.0)
+  grouped_spot = np.zeros((count, len(spot_shocks)))
+  grouped_vol = np.zeros((count, len(vol_shocks)))
+  np.add.at(grouped_spot, group, spot_pnl)
+  np.add.at(grouped_vol, group, vol_pnl)
+
+  return RiskAggregate(
+    underlyings=underlyings.tolist(),
+    legs=np.bincount(group, minlength=count),
+    spot=spot,
+    delta=total(delta),
+    gamma=total(gamma),
+    vega=total(vega),
+    theta=total(theta),
+    dollar_delta=total(delta * leg_spot),
+    # Change in dollar delta for a 1% move of the underlying.
+    dollar_gamma=total(gamma * leg_spot**2 * 0.01),
+    scenario_pnl=grouped_spot[:, :, None] + grouped_vol[:, None, :],
+  )
@@ -1,11 +1,24 @@
 """Scanner operations."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from defusedxml import ElementTree
 from ib_async.objects import ScannerSubscription, TagValue
 
+from .cache import TTLCache
 from .client import IBClient
 from app.core.setup_logging import logger
-from app.models.scanner import ScannerRequest
+
+if TYPE_CHECKING:
+  from collections.abc import Awaitable, Callable
+
+  from app.models.scanner import ScannerRequest
+
+
+def _find_texts(xml: str, path: str) -> list[str]:
+  return [elem.text for elem in ElementTree.fromstring(xml).findall(path)]
 
 
 class ScannerClient(IBClient):
@@ -18,13 +31,54 @@ class ScannerClient(IBClient):
     - get_scanner_results: get scanner results
   """
 
+  def __init__(self) -> None:
+    """Initialize the scanner catalog cache."""
+    super().__init__()
+    # The scanner parameters XML (megabytes, changes rarely) under a single key.
+    self._scanner_catalog: TTLCache[str, str] = TTLCache(
+      ttl=self.config.scanner_catalog_ttl,
+      maxsize=1,
+      name="scanner_catalog",
+    )
+
+  def readiness_checks(self) -> dict[str, bool]:
+    """Add whether the scanner catalog is cached."""
+    return {
+      **super().readiness_checks(),
+      "scanner_catalog": "xml" in self._scanner_catalog,
+    }
+
+  def _prepare_steps(self) -> dict[str, Callable[[], Awaitable[object]]]:
+    """Add fetching the scanner catalog."""
+    return {**super()._prepare_steps(), "scanner_catalog": self._scanner_parameters}
+
+  async def _scanner_parameters(self) -> str:
+    """Return the scanner parameters XML, requested under the pacing governor."""
+    if (xml := self._scanner_catalog.get("xml")) is not None:
+      return xml
+    async with self._pacing.acquire(call="reqScannerParameters"):
+      xml = await self.ib.reqScannerParametersAsync()
+    self._scanner_catalog.set("xml", xml)
+    return xml
+
+  async def _scanner_codes(self, path: str) -> list[str]:
+    """Return the text of every element at path in the scanner parameters.
+
+    The XML runs to megabytes, so it is always parsed in a worker.
+    """
+    xml_parameters = await self._scanner_parameters()
+    return await self._executor.run(
+      _find_texts,
+      xml_parameters,
+      path,
+      process_safe=True,
+    )
+
   async def get_scanner_instrument_codes(self) -> list[str]:
     """Get scanner instrument codes."""
     try:
       await self._connect()
-      xml_parameters = await self.ib.reqScannerParametersAsync()
-      tree = ElementTree.fromstring(xml_parameters)
-      tags = [elem.text for elem in tree.findall(".//Instrument/type")]
+      tags = await self._scanner_codes(".//Instrument/type")
     except Exception as e:
       logger.error("Error getting scanner instrument codes: {}", str(e))
       raise
@@ -35,9 +89,7 @@ class ScannerClient(IBClient):
     """Get scanner location codes."""
     try:
       await self._connect()
-      xml_parameters = await self.ib.reqScannerParametersAsync()
-      tree = ElementTree.fromstring(xml_parameters)
-      tags = [elem.text for elem in tree.findall(".//Location/locationCode")]
+      tags = await self._scanner_codes(".//Location/locationCode")
     except Exception as e:
       logger.error("Error getting scanner location codes: {}", str(e))
       raise
@@ -48,9 +100,7 @@ class ScannerClient(IBClient):
     """Get scanner filter codes."""
     try:
       await self._connect()
-      xml_parameters = await self.ib.reqScannerParametersAsync()
-      tree = ElementTree.fromstring(xml_parameters)
-      tags = [elem.text for elem in tree.findall(".//AbstractField/code")]
+      tags = await self._scanner_codes(".//AbstractField/code")
     except Exception as e:
       logger.error("Error getting scanner filter codes: {}", str(e))
       raise
@@ -61,9 +111,7 @@ class ScannerClient(IBClient):
     """Get scanner scan codes."""
     try:
       await self._connect()
-      xml_parameters = await self.ib.reqScannerParametersAsync()
-      tree = ElementTree.fromstring(xml_parameters)
-      tags = [elem.text for elem in tree.findall(".//scanCode")]
+      tags = await self._scanner_codes(".//scanCode")
     except Exception as e:
       logger.error("Error getting scanner scan codes: {}", str(e))
       raise
@@ -94,7 +142,12 @@ class ScannerClient(IBClient):
         locationCode=scanner_request.location_code,
         scanCode=scanner_request.scan_code,
       )
-      scanner_data = await self.ib.reqScannerDataAsync(sub_object, [], cleaned_tags)
+      async with self._pacing.acquire(call="reqScannerData"):
+        scanner_data = await self.ib.reqScannerDataAsync(
+          sub_object,
+          [],
+          cleaned_tags,
+        )
 
       symbols = [row.contractDetails.contract.symbol for row in scanner_data]
     except Exception as e:
@@ -0,0 +1,192 @@
+"""Warmup of the configured symbols after each connect."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import datetime as dt
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .client import IBClient
+from .history import FREQ_TO_BAR_SIZE, REALTIME_FREQ
+from app.core.setup_logging import logger
+
+if TYPE_CHECKING:
+  from collections.abc import Awaitable, Callable
+
+  from ib_async.contract import Contract
+
+# Most recent warmup failures kept for the status endpoint.
+_MAX_ERRORS = 20
+
+
+@dataclass(slots=True)
+class WarmupStep:
+  """Progress of one kind of warmup work."""
+
+  total: int = 0
+  done: int = 0
+  failed: int = 0
+
+
+@dataclass(slots=True)
+class WarmupProgress:
+  """Progress of the warmup, reported on /gateway/status.
+
+  state is "disabled" (nothing configured), "pending" (waiting for a
+  connection), "running" or "done"; failed items do not keep it from
+  finishing.
+  """
+
+  state: str = "pending"
+  runs: int = 0
+  started_at: str | None = None
+  duration_s: float | None = None
+  contracts: WarmupStep = field(default_factory=WarmupStep)
+  chains: WarmupStep = field(default_factory=WarmupStep)
+  bar_streams: WarmupStep = field(default_factory=WarmupStep)
+  errors: deque[str] = field(default_factory=lambda: deque(maxlen=_MAX_ERRORS))
+
+  def as_dict(self) -> dict:
+    """Return the progress as a plain dict."""
+    progress = dataclasses.asdict(self)
+    progress["errors"] = list(self.errors)
+    return progress
+
+
+class WarmupClient(IBClient):
+  """Qualify, subscribe and load recent bars for the configured symbols.
+
+  The warmup runs as part of preparing the session, so /ready passes only
+  once it is done, and again after every reconnect because IB drops the
+  live subscriptions with the connection.
+
+  Available public methods:
+    - get_warmup_progress: report warmup progress
+  """
+
+  def __init__(self) -> None:
+    """Initialize the warmup progress."""
+    super().__init__()
+    symbols = self.config.get_warmup_symbols()
+    underlyings = self.config.get_warmup_chain_underlyings()
+    self._warmup = WarmupProgress(
+      state="pending" if symbols or underlyings else "disabled",
+    )
+    self.ib.disconnectedEvent += self._reset_warmup
+
+  def _reset_warmup(self) -> None:
+    """Warm up again on the next connect."""
+    if self._warmup.state != "disabled":
+      self._warmup.state = "pending"
+
+  def get_warmup_progress(self) -> dict:
+    """Return the warmup progress."""
+    return self._warmup.as_dict()
+
+  def readiness_checks(self) -> dict[str, bool]:
+    """Add whether the warmup has finished."""
+    return {
+      **super().readiness_checks(),
+      "warmup": self._warmup.state in {"done", "disabled"},
+    }
+
+  def _prepare_steps(self) -> dict[str, Callable[[], Awaitable[object]]]:
+    """Add the warmup; it runs when it has not run on this connection."""
+    return {**super()._prepare_steps(), "warmup": self._run_warmup}
+
+  async def _warmup_item[T](
+    self,
+    step: WarmupStep,
+    name: str,
+    work: Awaitable[T],
+  ) -> T | None:
+    """Await one warmup item, counting it in step; failures return None."""
+    try:
+      result = await work
+    except Exception as e:
+      step.failed += 1
+      self._warmup.errors.append(f"{name}: {e!s}")
+      logger.warning("Warmup of {} failed: {!s}", name, e)
+      return None
+    step.done += 1
+    return result
+
+  async def _run_warmup(self) -> None:
+    """Qualify every symbol, then load chains and bar streams concurrently.
+
+    The pacing governor spaces the IB requests, so everything is started at
+    once and finishes as fast as IB's limits allow.
+    """
+    symbols = self.config.get_warmup_symbols()
+    underlyings = self.config.get_warmup_chain_underlyings()
+    windows = []
+    for freq, lookback_days in self.config.get_warmup_bar_windows():
+      if freq != REALTIME_FREQ and freq not in FREQ_TO_BAR_SIZE:
+        logger.warning("Skipping warmup bar window with unsupported freq {}", freq)
+        continue
+      windows.append((freq, lookback_days))
+
+    progress = self._warmup = WarmupProgress(
+      state="running",
+      runs=self._warmup.runs + 1,
+      started_at=dt.datetime.now(dt.UTC).isoformat(),
+    )
+    t0 = time.perf_counter()
+    entries = list(dict.fromkeys([*symbols, *underlyings]))
+    progress.contracts.total = len(entries)
+    qualified: list[Contract | None] = await asyncio.gather(
+      *(
+        self._warmup_item(
+          progress.contracts,
+          f"{symbol}/{exchange}",
+          self._qualify_contract(symbol, sec_type, exchange, "USD"),
+        )
+        for symbol, sec_type, exchange in entries
+      ),
+    )
+    contracts = dict(zip(entries, qualified, strict=True))
+
+    work = []
+    for entry in underlyings:
+      if (contract := contracts[entry]) is not None:
+        progress.chains.total += 1
+        work.append(
+          self._warmup_item(
+            progress.chains,
+            f"{entry[0]} chain",
+            # _get_chain_definition is provided by ContractClient via IBInterface MRO
+            self._get_chain_definition(entry[0], entry[1], contract.conId),
+          ),
+        )
+    for entry in symbols:
+      if (contract := contracts[entry]) is None:
+        continue
+      for freq, lookback_days in windows:
+        progress.bar_streams.total += 1
+        work.append(
+          self._warmup_item(
+            progress.bar_streams,
+            f"{entry[0]} {freq} bars",
+            # _warm_bar_stream is provided by HistoryClient via IBInterface MRO
+            self._warm_bar_stream(contract, freq, lookback_days),
+          ),
+        )
+    await asyncio.gather(*work)
+
+    progress.duration_s = time.perf_counter() - t0
+    if progress.state != "running":
+      # Disconnected meanwhile; the subscriptions are gone, so warm up again
+      return
+    progress.state = "done"
+    logger.info(
+      "Warmup done in {:.1f}s: {} contracts, {} chains, {} bar streams ({} failed)",
+      progress.duration_s,
+      progress.contracts.done,
+      progress.chains.done,
+      progress.bar_streams.done,
+      progress.contracts.failed + progress.chains.failed + progress.bar_streams.failed,
+    )
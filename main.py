@@ -126,7 +126,8 @@ def main() -> None:
     host=config.application_host,
     port=config.application_port,
     log_config=None,
-    access_log=True,
+    # RequestStatsMiddleware logs each request with its latency breakdown
+    access_log=False,
   )
 
 
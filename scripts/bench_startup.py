@@ -0,0 +1,153 @@
+"""Startup-time benchmark: import cost and time until the server answers /health.
+
+Runs each measurement in a fresh interpreter, so module caches from earlier
+runs do not hide import costs. Prints one JSON object (median and max per
+metric, plus the slowest imports) so results can be tracked over time, and
+exits non-zero if the median time to healthy exceeds --budget.
+
+  uv run python scripts/bench_startup.py --runs 5 --budget 3
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The server needs no IB Gateway to start in external mode
+ENV = {
+  **os.environ,
+  "PYTHONPATH": str(ROOT),
+  "IBKR_GATEWAY_MODE": "external",
+  "IBKR_AUTH_TOKEN": "bench",
+  "IBKR_LOG_LEVEL": "WARNING",
+}
+
+IMPORT_SNIPPET = (
+  "import time; t = time.perf_counter(); import app.main; "
+  "print(time.perf_counter() - t)"
+)
+
+
+def measure_import() -> float:
+  """Return the seconds `import app.main` takes in a fresh interpreter."""
+  out = subprocess.run(
+    [sys.executable, "-c", IMPORT_SNIPPET],
+    env=ENV,
+    cwd=ROOT,
+    capture_output=True,
+    text=True,
+    check=True,
+  )
+  return float(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(top: int) -> list[dict]:
+  """Return the top-level packages with the largest cumulative import time."""
+  out = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", "import app.main"],
+    env=ENV,
+    cwd=ROOT,
+    capture_output=True,
+    text=True,
+    check=True,
+  )
+  packages: dict[str, int] = {}
+  for line in out.stderr.splitlines():
+    if not line.startswith("import time:") or "|" not in line:
+      continue
+    _, cumulative, name = line.split("|")
+    if not cumulative.strip().isdigit() or "." in name.strip():
+      continue
+    package = name.strip()
+    packages[package] = max(packages.get(package, 0), int(cumulative))
+  ranked = sorted(packages.items(), key=lambda kv: kv[1], reverse=True)
+  return [{"module": m, "seconds": us / 1e6} for m, us in ranked[:top]]
+
+
+def _free_port() -> int:
+  with socket.socket() as s:
+    s.bind(("127.0.0.1", 0))
+    return s.getsockname()[1]
+
+
+def measure_healthy(timeout: float) -> float:
+  """Return the seconds from process start until GET /health answers 200."""
+  port = _free_port()
+  url = f"http://127.0.0.1:{port}/health"
+  t0 = time.perf_counter()
+  proc = subprocess.Popen(
+    [sys.executable, "main.py", "--application-port", str(port)],
+    env=ENV,
+    cwd=ROOT,
+    stdout=subprocess.DEVNULL,
+    stderr=subprocess.DEVNULL,
+  )
+  try:
+    while time.perf_counter() - t0 < timeout:
+      if proc.poll() is not None:
+        msg = f"server exited with code {proc.returncode}"
+        raise RuntimeError(msg)
+      try:
+        # url is always http://127.0.0.1:<port>/health, built above
+        with urllib.request.urlopen(url, timeout=1) as response:  # noqa: S310
+          if response.status == 200:
+            return time.perf_counter() - t0
+      except (urllib.error.URLError, ConnectionError):
+        time.sleep(0.02)
+    msg = f"server not healthy after {timeout}s"
+    raise TimeoutError(msg)
+  finally:
+    proc.terminate()
+    proc.wait(timeout=10)
+
+
+def _summary(values: list[float]) -> dict:
+  return {"median_s": statistics.median(values), "max_s": max(values)}
+
+
+def main() -> int:
+  """Run the benchmark and print the results as JSON."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--runs", type=int, default=5, help="Runs per metric")
+  parser.add_argument("--top", type=int, default=10, help="Slowest imports listed")
+  parser.add_argument(
+    "--budget",
+    type=float,
+    default=None,
+    help="Fail if the median seconds to healthy exceed this",
+  )
+  parser.add_argument("--timeout", type=float, default=60.0, help="Seconds per run")
+  args = parser.parse_args()
+
+  imports = [measure_import() for _ in range(args.runs)]
+  healthy = [measure_healthy(args.timeout) for _ in range(args.runs)]
+  result = {
+    "python": sys.version.split()[0],
+    "runs": args.runs,
+    "import_app": _summary(imports),
+    "time_to_healthy": _summary(healthy),
+    "slowest_imports": slowest_imports(args.top),
+  }
+  print(json.dumps(result, indent=2))  # noqa: T201
+
+  if args.budget is not None and result["time_to_healthy"]["median_s"] > args.budget:
+    print(  # noqa: T201
+      f"Startup budget exceeded: {result['time_to_healthy']['median_s']:.2f}s "
+      f"> {args.budget:.2f}s",
+      file=sys.stderr,
+    )
+    return 1
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())